@@ -0,0 +1,23 @@
+"""Package to benchmark the simulation and training hot paths."""
+
+from evolutionary_snake.benchmarking.runner import (
+    Benchmark,
+    BenchmarkResult,
+    Comparison,
+    compare_results,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+from evolutionary_snake.benchmarking.suite import get_benchmarks
+
+__all__ = [
+    "Benchmark",
+    "BenchmarkResult",
+    "Comparison",
+    "compare_results",
+    "get_benchmarks",
+    "load_results",
+    "run_benchmark",
+    "save_results",
+]
@@ -0,0 +1,154 @@
+"""Time benchmarks and compare their results to a stored baseline."""
+
+import collections.abc
+import json
+import pathlib
+import platform
+import statistics
+import timeit
+import typing
+
+import numpy as np
+
+ParamsType: typing.TypeAlias = dict[str, int | str]  # noqa: UP040
+FORMAT_VERSION = 1
+
+
+class Benchmark(typing.NamedTuple):
+    """A benchmark of a single function for a single set of parameters.
+
+    The setup builds the state the benchmark works on and returns the function that
+    is timed, so building the state is never part of the timing.
+    """
+
+    name: str
+    params: ParamsType
+    setup: collections.abc.Callable[[], collections.abc.Callable[[], object]]
+
+    @property
+    def key(self) -> str:
+        """Return the name of the benchmark together with its parameters."""
+        return _key(self.name, self.params)
+
+
+class BenchmarkResult(typing.NamedTuple):
+    """The time per call of a benchmark, in seconds."""
+
+    name: str
+    params: ParamsType
+    number: int
+    times: list[float]
+
+    @property
+    def key(self) -> str:
+        """Return the name of the benchmark together with its parameters."""
+        return _key(self.name, self.params)
+
+    @property
+    def best(self) -> float:
+        """Return the fastest time per call of all repeats."""
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        """Return the median time per call of all repeats."""
+        return statistics.median(self.times)
+
+
+class Comparison(typing.NamedTuple):
+    """The time per call of a benchmark compared to its baseline."""
+
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Return the current time relative to the baseline time."""
+        return self.current / self.baseline
+
+    def regressed(self, tolerance: float) -> bool:
+        """Return True if the benchmark became slower than the tolerance allows."""
+        return self.ratio > 1.0 + tolerance
+
+
+def run_benchmark(
+    benchmark: Benchmark, repeats: int = 5, min_time: float = 0.1
+) -> BenchmarkResult:
+    """Time a benchmark and return its time per call for every repeat.
+
+    The number of calls per repeat is doubled until a repeat takes at least
+    min_time seconds, so fast functions are not dominated by the timer resolution.
+    """
+    timer = timeit.Timer(benchmark.setup())
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    times = [time / number for time in timer.repeat(repeat=repeats, number=number)]
+    return BenchmarkResult(
+        name=benchmark.name, params=benchmark.params, number=number, times=times
+    )
+
+
+def save_results(results: list[BenchmarkResult], path: pathlib.Path) -> None:
+    """Save benchmark results as JSON, together with the platform they ran on."""
+    content = {
+        "format_version": FORMAT_VERSION,
+        "platform": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "numpy": np.__version__,
+        },
+        "results": [
+            {
+                "name": result.name,
+                "params": result.params,
+                "number": result.number,
+                "times": result.times,
+                "best": result.best,
+                "median": result.median,
+            }
+            for result in results
+        ],
+    }
+    path.write_text(json.dumps(content, indent=2) + "\n", encoding="utf-8")
+
+
+def load_results(path: pathlib.Path) -> list[BenchmarkResult]:
+    """Load benchmark results saved by save_results."""
+    content = json.loads(path.read_text(encoding="utf-8"))
+    return [
+        BenchmarkResult(
+            name=result["name"],
+            params=result["params"],
+            number=result["number"],
+            times=result["times"],
+        )
+        for result in content["results"]
+    ]
+
+
+def compare_results(
+    results: list[BenchmarkResult], baseline: list[BenchmarkResult]
+) -> list[Comparison]:
+    """Compare the best times of the results to those of the baseline.
+
+    Only benchmarks that are in both the results and the baseline are compared.
+    """
+    baseline_times = {result.key: result.best for result in baseline}
+    return [
+        Comparison(
+            key=result.key, baseline=baseline_times[result.key], current=result.best
+        )
+        for result in results
+        if result.key in baseline_times
+    ]
+
+
+def _key(name: str, params: ParamsType) -> str:
+    """Return a name together with its parameters, like name[a=1,b=2]."""
+    if not params:
+        return name
+    return f"{name}[{','.join(f'{key}={value}' for key, value in params.items())}]"
@@ -0,0 +1,306 @@
+"""Benchmarks of the simulation and training hot paths."""
+
+import collections.abc
+import functools
+import itertools
+import pathlib
+import random
+import tempfile
+import typing
+
+import neat
+
+from evolutionary_snake import game_modes, game_objects, settings, snake_training
+from evolutionary_snake.benchmarking.runner import Benchmark
+from evolutionary_snake.game_objects.boundaries import boundary_factory
+from evolutionary_snake.machine_learning import (
+    compiled_network,
+    feature_names,
+    features,
+)
+from evolutionary_snake.utils import enums, utility_functions
+
+SEED = 0
+MUTATIONS = 20
+
+
+class BenchmarkGrid(typing.NamedTuple):
+    """The parameters every benchmark is run for."""
+
+    game_sizes: tuple[int, ...]
+    snake_lengths: tuple[int, ...]
+    population_sizes: tuple[int, ...]
+
+
+FULL_GRID = BenchmarkGrid(
+    game_sizes=(3, 6, 12), snake_lengths=(3, 30, 120), population_sizes=(10, 50)
+)
+QUICK_GRID = BenchmarkGrid(game_sizes=(3,), snake_lengths=(3,), population_sizes=(4,))
+
+
+class _Game(typing.NamedTuple):
+    """The objects of a game that the simulation benchmarks work on."""
+
+    snake: game_objects.Snake
+    apple: game_objects.Apple
+    rng: random.Random
+    directions: collections.abc.Iterator[enums.Direction]
+
+
+def get_benchmarks(
+    *, quick: bool = False, path_neat_config: pathlib.Path | None = None
+) -> list[Benchmark]:
+    """Return the benchmarks of the simulation and training hot paths.
+
+    The game size scales the board at the default step size: a game size of 3 is a
+    board of 20 by 20 cells. The quick grid runs every benchmark once, with the
+    smallest parameters only. Without a path, the default neat config is used.
+    """
+    grid = QUICK_GRID if quick else FULL_GRID
+    path_neat_config = path_neat_config or settings.AiGameSettings().path_neat_config
+    simulation_setups = {
+        "snake_update": _setup_snake_update,
+        "collision_checks": _setup_collision_checks,
+        "apple_spawn": _setup_apple_spawn,
+        "input_vector": _setup_input_vector,
+    }
+    benchmarks = [
+        Benchmark(
+            name=name,
+            params={"game_size": game_size, "snake_length": snake_length},
+            setup=functools.partial(setup, game_size, snake_length),
+        )
+        for game_size, snake_length in itertools.product(
+            grid.game_sizes, grid.snake_lengths
+        )
+        for name, setup in simulation_setups.items()
+    ]
+    benchmarks += [
+        Benchmark(
+            name="features",
+            params={
+                "game_size": game_size,
+                "snake_length": snake_length,
+                "feature": str(feature),
+            },
+            setup=functools.partial(_setup_features, game_size, snake_length, feature),
+        )
+        for game_size, snake_length in itertools.product(
+            grid.game_sizes, grid.snake_lengths
+        )
+        for feature in enums.Feature
+    ]
+    benchmarks += [
+        Benchmark(
+            name="network_activate",
+            params={"network": network},
+            setup=functools.partial(_setup_network_activate, path_neat_config, network),
+        )
+        for network in ("neat", "compiled")
+    ]
+    benchmarks += [
+        Benchmark(
+            name="ai_episode",
+            params={"game_size": game_size},
+            setup=functools.partial(_setup_ai_episode, path_neat_config, game_size),
+        )
+        for game_size in grid.game_sizes
+    ]
+    benchmarks += [
+        Benchmark(
+            name="training_generation",
+            params={
+                "population_size": population_size,
+                "training_mode": str(training_mode),
+            },
+            setup=functools.partial(
+                _setup_training_generation,
+                path_neat_config,
+                population_size,
+                training_mode,
+            ),
+        )
+        for population_size in grid.population_sizes
+        for training_mode in (
+            enums.TrainingMode.SEQUENTIAL,
+            enums.TrainingMode.VECTORIZED,
+        )
+    ]
+    return benchmarks
+
+
+def _create_game_settings(game_size: int) -> settings.GameSettings:
+    """Create the settings of a board scaled by the game size."""
+    return settings.GameSettings(
+        game_size=game_size,
+        display_width=100 * game_size,
+        display_height=100 * game_size,
+        boundary_type=enums.BoundaryType.PERIODIC_BOUNDARY,
+        headless=True,
+        seed=SEED,
+    )
+
+
+def _tour(n_columns: int, n_rows: int) -> list[enums.Direction]:
+    """Return the directions of a tour along all cells of a periodic board.
+
+    The tour runs right along a row and left along the next one, so a snake that
+    follows it never runs into itself when the number of rows is even.
+    """
+    row_right = [enums.Direction.RIGHT] * (n_columns - 1) + [enums.Direction.DOWN]
+    row_left = [enums.Direction.LEFT] * (n_columns - 1) + [enums.Direction.DOWN]
+    return (row_right + row_left) * (n_rows // 2)
+
+
+def _create_game(game_size: int, snake_length: int) -> _Game:
+    """Create a snake of the given length stretched out on a board with an apple."""
+    game_settings = _create_game_settings(game_size)
+    rng = random.Random(SEED)  # noqa: S311  # nosec
+    snake = game_objects.Snake(
+        length=snake_length,
+        width=game_settings.display_width,
+        height=game_settings.display_height,
+        step_size=game_settings.step_size,
+        boundary=boundary_factory.boundary_factory(game_settings),
+        rng=rng,
+    )
+    snake.direction = enums.Direction.RIGHT
+    directions = itertools.cycle(
+        _tour(
+            n_columns=game_settings.display_width // game_settings.step_size,
+            n_rows=game_settings.display_height // game_settings.step_size,
+        )
+    )
+    for _ in range(snake_length):
+        snake.update(next(directions))
+    apple = game_objects.Apple(free_cells=snake.free_cells, rng=rng)
+    return _Game(snake=snake, apple=apple, rng=rng, directions=directions)
+
+
+def _setup_snake_update(
+    game_size: int, snake_length: int
+) -> collections.abc.Callable[[], object]:
+    """Move the snake a single step along its tour."""
+    game = _create_game(game_size, snake_length)
+
+    def _update() -> None:
+        game.snake.update(next(game.directions))
+
+    return _update
+
+
+def _setup_collision_checks(
+    game_size: int, snake_length: int
+) -> collections.abc.Callable[[], object]:
+    """Check the collisions and the clear sides of the snake."""
+    game = _create_game(game_size, snake_length)
+
+    def _check() -> tuple[bool, ...]:
+        snake = game.snake
+        return (
+            snake.collided_with_itself(),
+            snake.collided_with_boundary(),
+            snake.right_side_clear(),
+            snake.left_side_clear(),
+            snake.top_side_clear(),
+            snake.bottom_side_clear(),
+        )
+
+    return _check
+
+
+def _setup_apple_spawn(
+    game_size: int, snake_length: int
+) -> collections.abc.Callable[[], object]:
+    """Spawn an apple on a free cell of the board."""
+    game = _create_game(game_size, snake_length)
+    return functools.partial(
+        game_objects.Apple, free_cells=game.snake.free_cells, rng=game.rng
+    )
+
+
+def _setup_input_vector(
+    game_size: int, snake_length: int
+) -> collections.abc.Callable[[], object]:
+    """Compute the input vector of the default features with their pipeline."""
+    game = _create_game(game_size, snake_length)
+    pipeline = features.FeaturePipeline(feature_names.DEFAULT_FEATURES)
+    return functools.partial(pipeline.compute, snake=game.snake, apple=game.apple)
+
+
+def _setup_features(
+    game_size: int, snake_length: int, feature: enums.Feature
+) -> collections.abc.Callable[[], object]:
+    """Compute a single feature of the snake and the apple with its pipeline."""
+    game = _create_game(game_size, snake_length)
+    pipeline = features.FeaturePipeline([feature])
+    return functools.partial(pipeline.compute, snake=game.snake, apple=game.apple)
+
+
+def _create_genome(neat_config: neat.Config) -> neat.DefaultGenome:
+    """Create a genome that has grown some nodes and connections by mutation."""
+    random.seed(SEED)
+    genome = neat_config.genome_type(1)
+    genome.configure_new(neat_config.genome_config)
+    for _ in range(MUTATIONS):
+        genome.mutate(neat_config.genome_config)
+    return genome
+
+
+def _setup_network_activate(
+    path_neat_config: pathlib.Path, network: str
+) -> collections.abc.Callable[[], object]:
+    """Activate the neat network, or the compiled network used in training."""
+    neat_config = utility_functions.get_neat_config(path_neat_config)
+    genome = _create_genome(neat_config)
+    network_type = (
+        neat.nn.FeedForwardNetwork
+        if network == "neat"
+        else compiled_network.CompiledNetwork
+    )
+    neural_net = network_type.create(genome, neat_config)
+    inputs = [index % 2 == 0 for index in range(neat_config.genome_config.num_inputs)]
+    return functools.partial(neural_net.activate, inputs)
+
+
+def _setup_ai_episode(
+    path_neat_config: pathlib.Path, game_size: int
+) -> collections.abc.Callable[[], object]:
+    """Play a full headless episode of the AI game mode."""
+    neat_config = utility_functions.get_neat_config(path_neat_config)
+    game_settings = settings.AiGameSettings(
+        **_create_game_settings(game_size).model_dump(),
+        neural_net=compiled_network.CompiledNetwork.create(
+            _create_genome(neat_config), neat_config
+        ),
+    )
+
+    def _play() -> float:
+        game = game_modes.AiGameMode(game_settings=game_settings)
+        game.run()
+        return game.loss_tracker.loss
+
+    return _play
+
+
+def _setup_training_generation(
+    path_neat_config: pathlib.Path,
+    population_size: int,
+    training_mode: enums.TrainingMode,
+) -> collections.abc.Callable[[], object]:
+    """Evaluate all genomes of a generation."""
+    neat_config = utility_functions.get_neat_config(path_neat_config)
+    neat_config.pop_size = population_size
+    random.seed(SEED)
+    genomes = list(neat.Population(neat_config).population.items())
+    training_settings = settings.TrainingSettings(
+        seed=SEED,
+        path_neat_config=path_neat_config,
+        checkpoint_prefix=pathlib.Path(tempfile.gettempdir()) / "checkpoint-",
+    )
+    return functools.partial(
+        snake_training.TrainingFunctionsDict[training_mode],
+        genomes,
+        neat_config,
+        training_settings,
+    )
@@ -1,10 +1,19 @@
 """The command line interface for evolutionary_snake."""
 
+import logging
 import pathlib
+import sys
 
 import click
 
-from evolutionary_snake import snake, snake_training
+from evolutionary_snake import (
+    benchmarking,
+    distributed,
+    settings,
+    snake,
+    snake_training,
+)
+from evolutionary_snake.machine_learning import genome_index
 from evolutionary_snake.utils import enums
 
 
@@ -14,13 +23,45 @@ from evolutionary_snake.utils import enums
     default=enums.GameMode.HUMAN_PLAYER,
     type=click.Choice(enums.GameMode, case_sensitive=False),
 )
-@click.option("--path-checkpoint", default=None, type=click.Path(exists=True))
-def start(game_mode: enums.GameMode, path_checkpoint: pathlib.Path | None) -> None:
+@click.option(
+    "--path-checkpoint",
+    default=None,
+    type=click.Path(exists=True, path_type=pathlib.Path),
+    help="A checkpoint, a genome index or a directory with training runs.",
+)
+@click.option(
+    "--rank",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Rank of the genome to play from a genome index or directory.",
+)
+@click.option(
+    "--list-genomes",
+    default=None,
+    type=click.IntRange(min=1),
+    help="List this many best genomes of a genome index or directory and exit.",
+)
+def start(
+    game_mode: enums.GameMode,
+    path_checkpoint: pathlib.Path | None,
+    rank: int,
+    list_genomes: int | None,
+) -> None:
     """Start the evolutionary_snake game_modes."""
-    if game_mode == enums.GameMode.AI_PLAYER and not path_checkpoint:
+    if (game_mode == enums.GameMode.AI_PLAYER or list_genomes) and not path_checkpoint:
         msg = "Path to a checkpoint not provided."
         raise click.BadOptionUsage(message=msg, option_name="path_checkpoint")
-    snake.run_snake(game_mode=game_mode, path_checkpoint=path_checkpoint)
+    if list_genomes and path_checkpoint:
+        for rank_genome, entry in enumerate(
+            genome_index.top_genomes(path_checkpoint, k=list_genomes), start=1
+        ):
+            click.echo(
+                f"{rank_genome:>4}  fitness {entry.fitness:>10.2f}  "
+                f"generation {entry.generation:>4}  genome {entry.genome_key:>6}  "
+                f"{entry.path_index.parent}"
+            )
+        return
+    snake.run_snake(game_mode=game_mode, path_checkpoint=path_checkpoint, rank=rank)
 
 
 @click.command()
@@ -29,9 +70,175 @@ def start(game_mode: enums.GameMode, path_checkpoint: pathlib.Path | None) -> No
     default=enums.TrainingMode.SEQUENTIAL,
     type=click.Choice(enums.TrainingMode, case_sensitive=False),
 )
-def start_training(training_mode: enums.TrainingMode) -> None:
+@click.option(
+    "--broker-host",
+    default="127.0.0.1",
+    help="Host the broker of a distributed training listens on.",
+)
+@click.option(
+    "--broker-port",
+    default=5555,
+    type=click.IntRange(min=0, max=65535),
+    help="Port the broker of a distributed training listens on.",
+)
+@click.option(
+    "--local-workers",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Workers of a distributed training to start on this machine.",
+)
+def start_training(
+    training_mode: enums.TrainingMode,
+    broker_host: str,
+    broker_port: int,
+    local_workers: int,
+) -> None:
     """Start the evolutionary_snake training mode."""
+    training_settings = settings.TrainingSettings(
+        broker_host=broker_host, broker_port=broker_port, local_workers=local_workers
+    )
     try:
-        snake_training.run_snake_training(training_mode=training_mode)
+        snake_training.run_snake_training(
+            training_mode=training_mode, training_settings=training_settings
+        )
     except KeyboardInterrupt:
         click.secho("Training cancelled by user", fg="red")
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Host of the training broker.")
+@click.option("--port", default=5555, type=int, help="Port of the training broker.")
+def start_worker(host: str, port: int) -> None:
+    """Start a worker that evaluates genomes for a distributed training."""
+    try:
+        n_tasks = distributed.run_worker(
+            host=host,
+            port=port,
+            create_evaluator=snake_training.create_task_evaluator,
+        )
+    except KeyboardInterrupt:
+        click.secho("Worker cancelled by user", fg="red")
+        return
+    click.echo(f"Worker evaluated {n_tasks} genomes")
+
+
+@click.command()
+@click.argument("path_replays", type=click.Path(exists=True, path_type=pathlib.Path))
+@click.option("--index", default=0, type=click.IntRange(min=0), help="Replay index.")
+@click.option(
+    "--start",
+    "first_frame",
+    default=0,
+    type=click.IntRange(min=0),
+    help="First frame.",
+)
+@click.option(
+    "--stop", default=None, type=click.IntRange(min=0), help="Frame to stop at."
+)
+@click.option("--headless", is_flag=True, help="Re-simulate without a window.")
+@click.option(
+    "--export",
+    "path_frames",
+    default=None,
+    type=click.Path(path_type=pathlib.Path),
+    help="Directory of PNG frames, or .gif file, to export the frames to.",
+)
+def start_replay(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    path_replays: pathlib.Path,
+    index: int,
+    first_frame: int,
+    stop: int | None,
+    *,
+    headless: bool,
+    path_frames: pathlib.Path | None,
+) -> None:
+    """Re-simulate a recorded game from a replay file or directory."""
+    # the replay game mode stops at the last recorded frame
+    frames = range(first_frame, sys.maxsize if stop is None else stop)
+    game = snake.run_replay(
+        path_replays,
+        index=index,
+        frames=frames,
+        headless=headless,
+        path_frames=path_frames,
+    )
+    click.echo(
+        f"{game.replay.name}: {game.step} of {game.replay.steps} steps, "
+        f"score {game.score}"
+    )
+
+
+@click.command()
+@click.option("--quick", is_flag=True, help="Run every benchmark for one setting.")
+@click.option(
+    "--filter",
+    "filters",
+    multiple=True,
+    help="Only run benchmarks whose name and parameters contain this text.",
+)
+@click.option("--repeats", default=5, type=click.IntRange(min=1))
+@click.option(
+    "--min-time",
+    default=0.1,
+    type=click.FloatRange(min=0.0),
+    help="Minimum time of a single repeat in seconds.",
+)
+@click.option(
+    "--output",
+    default=pathlib.Path("benchmark-results.json"),
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="File to save the results to.",
+)
+@click.option(
+    "--baseline",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+    help="Results of an earlier run to compare with.",
+)
+@click.option(
+    "--tolerance",
+    default=0.1,
+    type=click.FloatRange(min=0.0),
+    help="Fraction a benchmark may be slower than its baseline.",
+)
+def start_benchmark(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    *,
+    quick: bool,
+    filters: tuple[str, ...],
+    repeats: int,
+    min_time: float,
+    output: pathlib.Path,
+    baseline: pathlib.Path | None,
+    tolerance: float,
+) -> None:
+    """Benchmark the simulation and training hot paths."""
+    logging.getLogger("evolutionary_snake").setLevel(logging.WARNING)
+    results = []
+    for benchmark in benchmarking.get_benchmarks(quick=quick):
+        if filters and not any(text in benchmark.key for text in filters):
+            continue
+        result = benchmarking.run_benchmark(
+            benchmark, repeats=repeats, min_time=min_time
+        )
+        click.echo(
+            f"{result.key:<70}  best {result.best * 1e6:>12.2f} us  "
+            f"median {result.median * 1e6:>12.2f} us"
+        )
+        results.append(result)
+    benchmarking.save_results(results, output)
+    click.echo(f"Results saved to {output}")
+    if baseline is None:
+        return
+    regressions = 0
+    for comparison in benchmarking.compare_results(
+        results, benchmarking.load_results(baseline)
+    ):
+        regressed = comparison.regressed(tolerance)
+        regressions += regressed
+        click.secho(
+            f"{comparison.key:<70}  {comparison.ratio:>6.2f}x baseline",
+            fg="red" if regressed else "green",
+        )
+    if regressions:
+        click.secho(f"{regressions} benchmarks regressed", fg="red")
+        raise SystemExit(1)
@@ -0,0 +1,6 @@
+"""Package to evaluate tasks on workers that connect to a broker over TCP."""
+
+from evolutionary_snake.distributed.broker import Broker
+from evolutionary_snake.distributed.worker import run_worker
+
+__all__ = ["Broker", "run_worker"]
@@ -0,0 +1,302 @@
+"""Broker that hands out tasks to workers connected over TCP."""
+
+import collections
+import collections.abc
+import dataclasses
+import functools
+import itertools
+import logging
+import socketserver
+import threading
+import time
+import types
+import typing
+
+from evolutionary_snake.distributed import protocol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class _Worker:
+    """A worker connected to the broker."""
+
+    worker_id: int
+    last_seen: float
+    tasks: set[int] = dataclasses.field(default_factory=set)
+    jobs: set[int] = dataclasses.field(default_factory=set)
+
+
+class _Job:  # pylint: disable=too-few-public-methods
+    """The tasks of a single call to Broker.imap_unordered."""
+
+    def __init__(
+        self,
+        job_id: int,
+        payloads: list[typing.Any],
+        context: dict[str, typing.Any],
+    ) -> None:
+        """Initialize the job with all tasks queued."""
+        self.job_id = job_id
+        self.payloads = payloads
+        self.context = context
+        self.queue = collections.deque(range(len(payloads)))
+        self.assigned: dict[int, dict[int, float]] = {}
+        self.results: dict[int, typing.Any] = {}
+        self.errors: dict[int, str] = {}
+
+    def has_news(self, n_yielded: int) -> bool:
+        """Return True if there are results beyond the yielded ones or errors."""
+        return len(self.results) > n_yielded or bool(self.errors)
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    """Serve a single worker connection."""
+
+    server: "_Server"
+
+    def handle(self) -> None:
+        """Answer the messages of the worker until it disconnects."""
+        broker = self.server.broker
+        worker = broker.register_worker()
+        try:
+            while (message := protocol.receive(self.rfile)) is not None:
+                if message["type"] == protocol.REQUEST:
+                    messages = broker.wait_for_task(worker)
+                    for message_out in messages:
+                        protocol.send(self.wfile, message_out)
+                    if messages[-1]["type"] == protocol.SHUTDOWN:
+                        break
+                else:
+                    broker.receive(worker, message)
+        finally:
+            broker.unregister_worker(worker)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    """TCP server that serves every worker on its own thread."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], broker: "Broker") -> None:
+        """Initialize the server of the broker."""
+        self.broker = broker
+        super().__init__(address, _WorkerHandler)
+
+
+# the broker shares the state of its jobs and workers with its server thread
+class Broker:  # pylint: disable=too-many-instance-attributes
+    """Hand out tasks to workers connected over TCP and collect their results.
+
+    Idle workers request a task and get the next queued one. Once the queue is
+    empty, an idle worker steals a task that another worker is still running, the
+    first result that comes in is used. While running a task, a worker sends
+    heartbeats; when a worker disconnects or misses its heartbeats for longer than
+    heartbeat_timeout seconds, its tasks are queued again.
+
+    A job sends a context to every worker once, followed by the payloads of its
+    tasks, which are all JSON serializable.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        heartbeat_timeout: float = 30.0,
+        *,
+        steal_tasks: bool = True,
+    ) -> None:
+        """Initialize the broker and start listening for workers."""
+        self.heartbeat_timeout = heartbeat_timeout
+        self.steal_tasks = steal_tasks
+        self._condition = threading.Condition()
+        self._workers: dict[int, _Worker] = {}
+        self._worker_ids = itertools.count()
+        self._job_ids = itertools.count()
+        self._job: _Job | None = None
+        self._closed = False
+        self._server = _Server((host, port), broker=self)
+        self.host: str = host
+        self.port: int = self._server.socket.getsockname()[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="broker", daemon=True
+        )
+        self._thread.start()
+        msg = f"Broker listening on {self.host}:{self.port}"
+        logger.info(msg)
+
+    def imap_unordered(
+        self,
+        payloads: collections.abc.Sequence[typing.Any],
+        context: dict[str, typing.Any],
+    ) -> collections.abc.Iterator[tuple[int, typing.Any]]:
+        """Evaluate the payloads on the workers, yielding results as they come in.
+
+        Every result is yielded together with the index of its payload.
+        """
+        with self._condition:
+            job = _Job(next(self._job_ids), list(payloads), context)
+            self._job = job
+            for worker in self._workers.values():
+                worker.tasks.clear()
+            self._condition.notify_all()
+        n_yielded = 0
+        try:
+            while n_yielded < len(job.payloads):
+                with self._condition:
+                    self._condition.wait_for(
+                        functools.partial(job.has_news, n_yielded),
+                        timeout=self.heartbeat_timeout / 2,
+                    )
+                    self._requeue_lost_tasks(job)
+                    if job.errors:
+                        index = min(job.errors)
+                        msg = f"Task {index} failed on a worker:\n{job.errors[index]}"
+                        raise RuntimeError(msg)
+                    results = list(job.results.items())[n_yielded:]
+                for result in results:
+                    n_yielded += 1
+                    yield result
+        finally:
+            with self._condition:
+                self._job = None
+
+    def register_worker(self) -> _Worker:
+        """Register a newly connected worker."""
+        with self._condition:
+            worker = _Worker(next(self._worker_ids), last_seen=time.monotonic())
+            self._workers[worker.worker_id] = worker
+        msg = f"Worker {worker.worker_id} connected"
+        logger.info(msg)
+        return worker
+
+    def unregister_worker(self, worker: _Worker) -> None:
+        """Unregister a disconnected worker and queue its tasks again."""
+        with self._condition:
+            self._workers.pop(worker.worker_id, None)
+            self._release_tasks(worker)
+        msg = f"Worker {worker.worker_id} disconnected"
+        logger.info(msg)
+
+    def wait_for_task(self, worker: _Worker) -> list[protocol.Message]:
+        """Wait for a task for the worker and return the messages to send it.
+
+        The messages are the context of the job if the worker has not seen it yet,
+        followed by the task, or a single shutdown message once the broker closes.
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    return [{"type": protocol.SHUTDOWN}]
+                job = self._job
+                if job is not None:
+                    index = self._next_task(job, worker)
+                    if index is not None:
+                        return self._assign_task(job, index, worker)
+                self._condition.wait()
+
+    def receive(self, worker: _Worker, message: protocol.Message) -> None:
+        """Process a heartbeat, result or error sent by a worker."""
+        with self._condition:
+            worker.last_seen = time.monotonic()
+            job = self._job
+            if (
+                message["type"] == protocol.HEARTBEAT
+                or job is None
+                or message["job_id"] != job.job_id
+            ):
+                return
+            index = message["task_id"]
+            worker.tasks.discard(index)
+            # the first result of a task that ran on several workers is used
+            if message["type"] == protocol.RESULT:
+                job.results.setdefault(index, message["result"])
+            else:
+                job.errors[index] = message["error"]
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Ask idle workers to shut down and stop listening."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> typing.Self:
+        """Return the broker itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Close the broker."""
+        del exc_type, exc_value, traceback
+        self.close()
+
+    def _assign_task(
+        self, job: _Job, index: int, worker: _Worker
+    ) -> list[protocol.Message]:
+        """Assign a task to a worker and return the messages to send it."""
+        now = time.monotonic()
+        job.assigned.setdefault(index, {})[worker.worker_id] = now
+        worker.tasks.add(index)
+        worker.last_seen = now
+        messages: list[protocol.Message] = []
+        if job.job_id not in worker.jobs:
+            worker.jobs = {job.job_id}
+            messages.append(
+                {"type": protocol.CONTEXT, "job_id": job.job_id, "context": job.context}
+            )
+        messages.append(
+            {
+                "type": protocol.TASK,
+                "job_id": job.job_id,
+                "task_id": index,
+                "payload": job.payloads[index],
+            }
+        )
+        return messages
+
+    def _next_task(self, job: _Job, worker: _Worker) -> int | None:
+        """Return the index of the next task for a worker, if there is one."""
+        if job.queue:
+            return job.queue.popleft()
+        if not self.steal_tasks:
+            return None
+        # steal the task that has been running the longest on another worker only
+        running = [
+            (min(workers.values()), index)
+            for index, workers in job.assigned.items()
+            if index not in job.results
+            and len(workers) == 1
+            and worker.worker_id not in workers
+        ]
+        return min(running)[1] if running else None
+
+    def _requeue_lost_tasks(self, job: _Job) -> None:
+        """Queue the tasks of workers that missed their heartbeats again."""
+        now = time.monotonic()
+        for worker in list(self._workers.values()):
+            if worker.tasks and now - worker.last_seen > self.heartbeat_timeout:
+                msg = f"Worker {worker.worker_id} missed its heartbeats"
+                logger.warning(msg)
+                self._release_tasks(worker, job)
+
+    def _release_tasks(self, worker: _Worker, job: _Job | None = None) -> None:
+        """Withdraw the tasks of a worker, queueing those no other worker runs."""
+        job = job or self._job
+        if job is not None:
+            for index in sorted(worker.tasks, reverse=True):
+                workers = job.assigned.get(index, {})
+                workers.pop(worker.worker_id, None)
+                if not workers and index not in job.results:
+                    job.assigned.pop(index, None)
+                    job.queue.appendleft(index)
+        worker.tasks.clear()
+        self._condition.notify_all()
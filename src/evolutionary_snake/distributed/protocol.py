@@ -0,0 +1,36 @@
+"""Messages exchanged between the broker and its workers.
+
+Every message is a JSON object on a single line with a type that is one of the
+message types below.
+"""
+
+import io
+import json
+import typing
+
+Message: typing.TypeAlias = dict[str, typing.Any]  # noqa: UP040
+
+# worker to broker
+REQUEST = "request"
+HEARTBEAT = "heartbeat"
+RESULT = "result"
+ERROR = "error"
+# broker to worker
+CONTEXT = "context"
+TASK = "task"
+SHUTDOWN = "shutdown"
+
+
+def send(file: io.BufferedIOBase, message: Message) -> None:
+    """Write a message to a file of a socket."""
+    file.write(json.dumps(message).encode() + b"\n")
+    file.flush()
+
+
+def receive(file: io.BufferedIOBase) -> Message | None:
+    """Read a message from a file of a socket, None once the connection closed."""
+    line = file.readline()
+    if not line:
+        return None
+    message: Message = json.loads(line)
+    return message
@@ -0,0 +1,125 @@
+"""Worker that evaluates the tasks of a broker."""
+
+import collections.abc
+import io
+import logging
+import socket
+import threading
+import traceback
+import types
+import typing
+
+from evolutionary_snake.distributed import protocol
+
+Evaluator: typing.TypeAlias = collections.abc.Callable[[typing.Any], typing.Any]  # noqa: UP040
+EvaluatorFactory: typing.TypeAlias = collections.abc.Callable[  # noqa: UP040
+    [dict[str, typing.Any]], Evaluator
+]
+logger = logging.getLogger(__name__)
+
+
+class _Heartbeat:
+    """Thread that sends heartbeats while the worker is busy with a task."""
+
+    def __init__(
+        self, send: collections.abc.Callable[[protocol.Message], None], interval: float
+    ) -> None:
+        """Initialize the heartbeat thread."""
+        self.send = send
+        self.interval = interval
+        self.busy = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="heartbeat", daemon=True)
+
+    def _run(self) -> None:
+        """Send a heartbeat every interval while the worker is busy."""
+        while not self._stopped.wait(self.interval):
+            if self.busy.is_set():
+                self.send({"type": protocol.HEARTBEAT})
+
+    def __enter__(self) -> typing.Self:
+        """Start sending heartbeats."""
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback_: types.TracebackType | None,
+    ) -> None:
+        """Stop sending heartbeats."""
+        del exc_type, exc_value, traceback_
+        self._stopped.set()
+        self._thread.join()
+
+
+def run_worker(
+    host: str,
+    port: int,
+    create_evaluator: EvaluatorFactory,
+    heartbeat_interval: float = 1.0,
+) -> int:
+    """Evaluate tasks of the broker at host:port until it shuts down.
+
+    For the context of every job, create_evaluator creates the function that
+    evaluates the payloads of its tasks. Results are sent back one by one, errors
+    are sent back with their traceback. While evaluating a task, a heartbeat is sent
+    every heartbeat_interval seconds. Returns the number of evaluated tasks.
+    """
+    with (
+        socket.create_connection((host, port)) as connection,
+        connection.makefile("rb") as reader,
+        connection.makefile("wb") as writer,
+    ):
+        lock = threading.Lock()
+
+        def _send(message: protocol.Message) -> None:
+            with lock:
+                protocol.send(writer, message)
+
+        with _Heartbeat(_send, heartbeat_interval) as heartbeat:
+            n_tasks = _evaluate_tasks(reader, _send, create_evaluator, heartbeat.busy)
+    msg = f"Worker evaluated {n_tasks} tasks"
+    logger.info(msg)
+    return n_tasks
+
+
+def _evaluate_tasks(
+    reader: io.BufferedIOBase,
+    send: collections.abc.Callable[[protocol.Message], None],
+    create_evaluator: EvaluatorFactory,
+    busy: threading.Event,
+) -> int:
+    """Request and evaluate tasks until the broker shuts down, return their number."""
+    evaluators: dict[int, Evaluator] = {}
+    n_tasks = 0
+    while True:
+        send({"type": protocol.REQUEST})
+        message = protocol.receive(reader)
+        if message is not None and message["type"] == protocol.CONTEXT:
+            evaluators = {message["job_id"]: create_evaluator(message["context"])}
+            message = protocol.receive(reader)
+        if message is None or message["type"] == protocol.SHUTDOWN:
+            return n_tasks
+        busy.set()
+        try:
+            reply = _evaluate_task(evaluators, message)
+        finally:
+            busy.clear()
+        send(reply)
+        n_tasks += 1
+
+
+def _evaluate_task(
+    evaluators: dict[int, Evaluator], message: protocol.Message
+) -> protocol.Message:
+    """Evaluate the payload of a task and return the reply with its result or error."""
+    reply = {"job_id": message["job_id"], "task_id": message["task_id"]}
+    try:
+        reply["result"] = evaluators[message["job_id"]](message["payload"])
+        reply["type"] = protocol.RESULT
+    except Exception:  # noqa: BLE001  # pylint: disable=broad-exception-caught
+        reply["error"] = traceback.format_exc()
+        reply["type"] = protocol.ERROR
+    return reply
@@ -1,5 +1,31 @@
 """Game canvas modules."""
 
-from evolutionary_snake.game_canvas.canvas import Canvas
+from evolutionary_snake.game_canvas.canvas import Canvas, GameCanvas, GameRenderer
+from evolutionary_snake.game_canvas.image_export import (
+    GifWriter,
+    PngSequenceWriter,
+    create_frame_writer,
+    encode_png,
+)
+from evolutionary_snake.game_canvas.mosaic_viewer import (
+    GameSnapshot,
+    MosaicViewer,
+    TileCanvas,
+    run_mosaic_viewer,
+)
+from evolutionary_snake.game_canvas.offscreen_canvas import OffscreenCanvas
 
-__all__ = ["Canvas"]
+__all__ = [
+    "Canvas",
+    "GameCanvas",
+    "GameRenderer",
+    "GameSnapshot",
+    "GifWriter",
+    "MosaicViewer",
+    "OffscreenCanvas",
+    "PngSequenceWriter",
+    "TileCanvas",
+    "create_frame_writer",
+    "encode_png",
+    "run_mosaic_viewer",
+]
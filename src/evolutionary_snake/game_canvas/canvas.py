@@ -1,17 +1,121 @@
 """The game canvas."""
 
+import abc
 import os
+import typing
 
 import pygame
 
 from evolutionary_snake import game_objects, settings
 
+BACKGROUND_RGB = (255, 255, 255)
+SNAKE_RGB = (0, 0, 0)
+APPLE_RGB = (150, 0, 0)
 
-class Canvas:
-    """The game canvas."""
+FrameT = typing.TypeVar("FrameT")
+
+
+class GameRenderer(typing.Protocol):
+    """Interface of the canvases a game mode renders on."""
+
+    def draw(
+        self,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+        score: int = 0,
+    ) -> object:
+        """Draw the canvas and its objects."""
+
+    def close(self) -> None:
+        """Finish rendering once the game has ended."""
+
+
+class GameCanvas(abc.ABC, typing.Generic[FrameT]):  # noqa: UP046
+    """Base of the canvases that paint the board themselves.
+
+    Every frame only the cells that changed are repainted: the new head, the freed
+    tail, the moved apple and the score, if it changed. A backend only paints a
+    cell or the score and presents the frame.
+    """
+
+    def __init__(self, game_settings: settings.GameSettings) -> None:
+        """Initialize the cells drawn on the canvas."""
+        self.settings = game_settings
+        self.dirty_cells = 0
+        self._snake_cells: set[tuple[int, int]] = set()
+        self._apple_cell: tuple[int, int] | None = None
+        self._score: int | None = None
+
+    def draw_snake(self, snake: game_objects.Snake) -> None:
+        """Erase the cells the snake left and paint the cells it entered."""
+        snake_cells = set(snake.coordinates)
+        for cell in self._snake_cells - snake_cells:
+            self._repaint_cell(cell, BACKGROUND_RGB)
+        for cell in snake_cells - self._snake_cells:
+            self._repaint_cell(cell, SNAKE_RGB)
+        self._snake_cells = snake_cells
+
+    def draw_apple(self, apple: game_objects.Apple) -> None:
+        """Move the apple, erasing it from its previous cell."""
+        apple_cell = (apple.x, apple.y)
+        if apple_cell == self._apple_cell:
+            return
+        if self._apple_cell is not None and self._apple_cell not in self._snake_cells:
+            self._repaint_cell(self._apple_cell, BACKGROUND_RGB)
+        self._repaint_cell(apple_cell, APPLE_RGB)
+        self._apple_cell = apple_cell
+
+    def draw_score(self, score: int) -> None:
+        """Draw the score below the board, if it changed."""
+        if score == self._score:
+            return
+        self._score = score
+        self._paint_score(score)
+
+    def draw(
+        self,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+        score: int = 0,
+    ) -> FrameT:
+        """Draw the changes of the objects, then present and return the frame."""
+        self.dirty_cells = 0
+        self.draw_snake(snake)
+        self.draw_apple(apple)
+        self.draw_score(score)
+        return self._present()
+
+    def close(self) -> None:
+        """Do nothing, there is nothing to finish by default."""
+
+    def _repaint_cell(self, cell: tuple[int, int], rgb: tuple[int, int, int]) -> None:
+        """Paint a cell and count it as repainted in this frame."""
+        self._paint_cell(cell, rgb)
+        self.dirty_cells += 1
+
+    @abc.abstractmethod
+    def _paint_cell(self, cell: tuple[int, int], rgb: tuple[int, int, int]) -> None:
+        """Paint a cell of the board."""
+
+    @abc.abstractmethod
+    def _paint_score(self, score: int) -> None:
+        """Paint the score below the board."""
+
+    @abc.abstractmethod
+    def _present(self) -> FrameT:
+        """Present the painted frame and return it."""
+
+
+class Canvas(GameCanvas[pygame.Surface]):
+    """The game canvas.
+
+    The surfaces of the objects and the score font are created once, and only the
+    rectangles of the display that were repainted are updated.
+    """
 
     def __init__(self, game_settings: settings.GameSettings) -> None:
         """Initialize the game canvas."""
+        super().__init__(game_settings)
         os.environ["SDL_VIDEO_WINDOW_POS"] = (
             f"{game_settings.display_x},{game_settings.display_y}"
         )
@@ -24,52 +128,48 @@ class Canvas:
             ),
             pygame.HWSURFACE,
         )
-        self.settings = game_settings
-        self.canvas.fill((255, 255, 255))
-
-    def draw_snake(self, snake: game_objects.Snake) -> None:
-        """Draw the snake."""
-        image_snake = MySurface(
-            width=snake.step_size, height=snake.step_size, rgb=(0, 0, 0)
-        ).create()
-        self.canvas.fill((255, 255, 255))
-        for i in range(snake.length):
-            self.canvas.blit(image_snake, (snake.x[i], snake.y[i]))
-
-    def draw_apple(self, apple: game_objects.Apple) -> None:
-        """Draw the apple."""
-        image_apple = MySurface(
-            width=self.settings.step_size,
-            height=self.settings.step_size,
-            rgb=(150, 0, 0),
-        ).create()
-        self.canvas.blit(image_apple, (apple.x, apple.y))
-
-    def draw_score(self, score: int) -> None:
-        """Draw the score."""
-        score_font = MyFont(
-            x=4 * self.settings.display_width // 5,
-            y=self.settings.display_height - 2,
-            rgb=(0, 0, 0),
+        self.canvas.fill(BACKGROUND_RGB)
+        self.images = {
+            rgb: MySurface(
+                width=game_settings.step_size,
+                height=game_settings.step_size,
+                rgb=rgb,
+            ).create()
+            for rgb in (BACKGROUND_RGB, SNAKE_RGB, APPLE_RGB)
+        }
+        self.score_font = MyFont(
+            x=4 * game_settings.display_width // 5,
+            y=game_settings.display_height,
+            rgb=SNAKE_RGB,
             font_size=8,
         )
-        score_font.draw(
+        self.font = self.score_font.create()
+        self.dirty_rects: list[pygame.Rect] = [self.canvas.get_rect()]
+
+    def _paint_cell(self, cell: tuple[int, int], rgb: tuple[int, int, int]) -> None:
+        """Blit the surface of a color onto a cell."""
+        self.dirty_rects.append(self.canvas.blit(self.images[rgb], cell))
+
+    def _paint_score(self, score: int) -> None:
+        """Render the score with the cached font."""
+        score_rect = pygame.Rect(
+            self.score_font.x,
+            self.score_font.y,
+            self.settings.display_width - self.score_font.x,
+            self.settings.step_size,
+        )
+        self.canvas.fill(BACKGROUND_RGB, score_rect)
+        self.score_font.draw(
             surface=self.canvas,
-            my_font=score_font.create(),
+            my_font=self.font,
             text=f"{str(score).zfill(5)}",
         )
+        self.dirty_rects.append(score_rect)
 
-    def draw(
-        self,
-        snake: game_objects.Snake,
-        apple: game_objects.Apple,
-        score: int = 0,
-    ) -> pygame.Surface:
-        """Draw the canvas and its objects."""
-        self.draw_snake(snake)
-        self.draw_apple(apple)
-        self.draw_score(score)
-        pygame.display.flip()
+    def _present(self) -> pygame.Surface:
+        """Update the repainted rectangles of the display."""
+        pygame.display.update(self.dirty_rects)
+        self.dirty_rects = []
         return self.canvas
 
 
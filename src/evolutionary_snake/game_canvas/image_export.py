@@ -0,0 +1,218 @@
+"""Writers of rendered frames to PNG image sequences and animated GIFs."""
+
+import abc
+import pathlib
+import struct
+import types
+import typing
+import zlib
+
+import numpy as np
+import numpy.typing as npt
+
+FrameType: typing.TypeAlias = npt.NDArray[np.uint8]  # noqa: UP040
+FRAME_FILENAME = "frame_{index:05d}.png"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+GIF_MIN_CODE_SIZE = 2
+GIF_MAX_CODE = 4096
+GIF_MAX_CODE_SIZE = 12
+GIF_MAX_BLOCK_SIZE = 255
+
+
+def encode_png(frame: FrameType) -> bytes:
+    """Encode an RGB frame of shape (height, width, 3) as a PNG image."""
+    height, width, _ = frame.shape
+    scanlines = np.zeros((height, 1 + 3 * width), dtype=np.uint8)
+    scanlines[:, 1:] = frame.reshape(height, 3 * width)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        PNG_SIGNATURE
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(scanlines.tobytes()))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Return a PNG chunk with its length and checksum."""
+    return (
+        struct.pack(">I", len(data))
+        + chunk_type
+        + data
+        + struct.pack(">I", zlib.crc32(chunk_type + data))
+    )
+
+
+class FrameWriter(abc.ABC):
+    """Base writer of frames, used as a context manager."""
+
+    @abc.abstractmethod
+    def write(self, frame: FrameType) -> None:
+        """Write a frame."""
+
+    def close(self) -> None:  # noqa: B027
+        """Finish writing the frames, which most writers have already written."""
+
+    def __enter__(self) -> typing.Self:
+        """Return the writer."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Finish writing the frames."""
+        del exc_type, exc_value, traceback
+        self.close()
+
+
+class PngSequenceWriter(FrameWriter):
+    """Writer of frames to numbered PNG images in a directory.
+
+    The images are numbered like frame_00000.png, so video encoders can read them
+    as an image sequence, e.g. ffmpeg -i frame_%05d.png.
+    """
+
+    def __init__(self, path_frames: pathlib.Path) -> None:
+        """Initialize the writer, creating the directory of the frames."""
+        self.path_frames = path_frames
+        self.path_frames.mkdir(parents=True, exist_ok=True)
+        self.n_frames = 0
+
+    def write(self, frame: FrameType) -> None:
+        """Write a frame to the next numbered PNG image."""
+        path_frame = self.path_frames / FRAME_FILENAME.format(index=self.n_frames)
+        path_frame.write_bytes(encode_png(frame))
+        self.n_frames += 1
+
+
+class GifWriter(FrameWriter):
+    """Writer of frames to an animated GIF that loops forever.
+
+    GIF images hold indices into a palette, so every frame may only use the colors
+    of the palette; the palette holds at most four colors.
+    """
+
+    def __init__(
+        self,
+        path_gif: pathlib.Path,
+        palette: list[tuple[int, int, int]],
+        frame_rate_fps: float,
+    ) -> None:
+        """Initialize the writer, without opening the GIF before the first frame."""
+        self.path_gif = path_gif
+        self.palette = palette + [(0, 0, 0)] * (2**GIF_MIN_CODE_SIZE - len(palette))
+        self.delay = round(100 / frame_rate_fps)
+        self.n_frames = 0
+        self._file: typing.BinaryIO | None = None
+
+    def write(self, frame: FrameType) -> None:
+        """Append a frame to the GIF."""
+        height, width, _ = frame.shape
+        if self._file is None:
+            self.path_gif.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path_gif.open("wb")
+            self._file.write(self._header(width, height))
+        indices = np.zeros((height, width), dtype=np.uint8)
+        for index, rgb in enumerate(self.palette):
+            indices[(frame == rgb).all(axis=-1)] = index
+        graphic_control = struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 0, self.delay, 0, 0)
+        descriptor = struct.pack("<BHHHHB", 0x2C, 0, 0, width, height, 0)
+        self._file.write(
+            graphic_control
+            + descriptor
+            + bytes([GIF_MIN_CODE_SIZE])
+            + _gif_blocks(_lzw_encode(indices.tobytes(), GIF_MIN_CODE_SIZE))
+        )
+        self.n_frames += 1
+
+    def close(self) -> None:
+        """Write the trailer of the GIF and close it."""
+        if self._file is not None:
+            self._file.write(b"\x3b")
+            self._file.close()
+            self._file = None
+
+    def _header(self, width: int, height: int) -> bytes:
+        """Return the header, palette and looping extension of the GIF."""
+        packed = 0x80 | ((GIF_MIN_CODE_SIZE - 1) << 4) | (GIF_MIN_CODE_SIZE - 1)
+        return (
+            b"GIF89a"
+            + struct.pack("<HHBBB", width, height, packed, 0, 0)
+            + b"".join(bytes(rgb) for rgb in self.palette)
+            + b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00"
+        )
+
+
+def _gif_blocks(data: bytes) -> bytes:
+    """Split data into GIF sub-blocks, terminated by an empty block."""
+    blocks = [
+        bytes([len(block)]) + block
+        for block in (
+            data[start : start + GIF_MAX_BLOCK_SIZE]
+            for start in range(0, len(data), GIF_MAX_BLOCK_SIZE)
+        )
+    ]
+    return b"".join(blocks) + b"\x00"
+
+
+def _lzw_encode(indices: bytes, min_code_size: int) -> bytes:
+    """Compress palette indices with the variable code size LZW of GIF.
+
+    The code table is cleared once it holds the maximum of 4096 codes.
+    """
+    clear_code = 1 << min_code_size
+    end_code = clear_code + 1
+    output = bytearray()
+    bit_buffer = 0
+    n_bits = 0
+    code_size = min_code_size + 1
+    next_code = end_code + 1
+    codes: dict[tuple[int, int], int] = {}
+
+    def _emit(code: int) -> None:
+        """Write a code, widening the codes once the next code does not fit."""
+        nonlocal bit_buffer, n_bits, code_size
+        bit_buffer |= code << n_bits
+        n_bits += code_size
+        while n_bits >= 8:  # noqa: PLR2004
+            output.append(bit_buffer & 0xFF)
+            bit_buffer >>= 8
+            n_bits -= 8
+        if next_code == 1 << code_size and code_size < GIF_MAX_CODE_SIZE:
+            code_size += 1
+
+    _emit(clear_code)
+    prefix = indices[0]
+    for index in indices[1:]:
+        code = codes.get((prefix, index))
+        if code is not None:
+            prefix = code
+            continue
+        _emit(prefix)
+        if next_code < GIF_MAX_CODE:
+            codes[prefix, index] = next_code
+            next_code += 1
+        else:
+            _emit(clear_code)
+            codes.clear()
+            code_size = min_code_size + 1
+            next_code = end_code + 1
+        prefix = index
+    _emit(prefix)
+    _emit(end_code)
+    output.extend(bit_buffer.to_bytes((n_bits + 7) // 8, "little"))
+    return bytes(output)
+
+
+def create_frame_writer(
+    path_frames: pathlib.Path,
+    palette: list[tuple[int, int, int]],
+    frame_rate_fps: float,
+) -> FrameWriter:
+    """Return a GIF writer for a path ending in .gif, else a PNG sequence writer."""
+    if path_frames.suffix.lower() == ".gif":
+        return GifWriter(path_frames, palette=palette, frame_rate_fps=frame_rate_fps)
+    return PngSequenceWriter(path_frames)
@@ -0,0 +1,239 @@
+"""A single window that shows the games of many workers as a mosaic of tiles."""
+
+import contextlib
+import math
+import os
+import queue
+import time
+import typing
+
+import pygame
+
+from evolutionary_snake import game_objects, settings
+from evolutionary_snake.game_canvas.canvas import APPLE_RGB, BACKGROUND_RGB, SNAKE_RGB
+
+FINISHED_RGB = (200, 200, 200)
+BORDER_RGB = (100, 100, 100)
+
+
+class GameSnapshot(typing.NamedTuple):
+    """The state of a game that is shown on a tile of the mosaic.
+
+    The snake and the apple are given as the cells of the board they are on, so a
+    snapshot is small enough to be sent every frame.
+    """
+
+    tile: int
+    snake: tuple[tuple[int, int], ...]
+    apple: tuple[int, int]
+    score: int
+    finished: bool = False
+
+
+class TileCanvas:
+    """Canvas that sends snapshots of a game to the mosaic viewer.
+
+    Snapshots are sent at most at the refresh rate of the viewer and are dropped
+    when the queue is full, so the game never waits for the viewer. Only the last
+    snapshot of a game waits for room on the queue.
+    """
+
+    def __init__(
+        self,
+        snapshot_queue: queue.Queue[GameSnapshot | None],
+        tile: int,
+        game_settings: settings.GameSettings,
+        refresh_fps: float,
+    ) -> None:
+        """Initialize the canvas of a tile."""
+        self.snapshot_queue = snapshot_queue
+        self.tile = tile
+        self.settings = game_settings
+        self.min_interval = 1 / refresh_fps
+        self._last_time = -math.inf
+        self._latest: tuple[game_objects.Snake, game_objects.Apple, int] | None = None
+
+    def draw(
+        self,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+        score: int = 0,
+    ) -> None:
+        """Send a snapshot of the game, unless one was sent too recently."""
+        self._latest = (snake, apple, score)
+        now = time.monotonic()
+        if now - self._last_time < self.min_interval:
+            return
+        self._last_time = now
+        with contextlib.suppress(queue.Full):
+            self.snapshot_queue.put_nowait(self.snapshot(snake, apple, score))
+
+    def close(self) -> None:
+        """Send the final snapshot of the game."""
+        if self._latest is not None:
+            self.snapshot_queue.put(self.snapshot(*self._latest, finished=True))
+
+    def snapshot(
+        self,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+        score: int,
+        *,
+        finished: bool = False,
+    ) -> GameSnapshot:
+        """Return the snapshot of a game, leaving out cells outside of the board."""
+        step_size = self.settings.step_size
+        n_columns = self.settings.display_width // step_size
+        n_rows = self.settings.display_height // step_size
+        cells = ((x // step_size, y // step_size) for x, y in snake.coordinates)
+        return GameSnapshot(
+            tile=self.tile,
+            snake=tuple(
+                (column, row)
+                for column, row in cells
+                if 0 <= column < n_columns and 0 <= row < n_rows
+            ),
+            apple=(apple.x // step_size, apple.y // step_size),
+            score=score,
+            finished=finished,
+        )
+
+
+class _TileLayout(typing.NamedTuple):
+    """The sizes of the tiles of the mosaic and of the cells on a tile."""
+
+    cell_size: int
+    tile_width: int
+    tile_height: int
+    tiles_per_row: int
+
+    def tile_rect(self, tile: int) -> pygame.Rect:
+        """Return the rectangle of a tile, including its border."""
+        return pygame.Rect(
+            (tile % self.tiles_per_row) * self.tile_width,
+            (tile // self.tiles_per_row) * self.tile_height,
+            self.tile_width,
+            self.tile_height,
+        )
+
+
+class MosaicViewer:
+    """Window that renders the latest snapshot of every game as a tile.
+
+    The snapshots are read from a queue and the tiles that changed are rendered at
+    a fixed refresh rate, however fast the games are played. The window is laid out
+    as a square grid of tiles, the tiles of finished games are greyed out.
+    """
+
+    def __init__(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        n_tiles: int,
+        game_settings: settings.GameSettings,
+        *,
+        refresh_fps: float = 10,
+        tile_size: int = 100,
+        display_x: int = 30,
+        display_y: int = 30,
+    ) -> None:
+        """Initialize the mosaic viewer and open its window."""
+        self.refresh_fps = refresh_fps
+        n_columns = game_settings.display_width // game_settings.step_size
+        n_rows = game_settings.display_height // game_settings.step_size
+        cell_size = max(1, tile_size // max(n_columns, n_rows))
+        self.layout = _TileLayout(
+            cell_size=cell_size,
+            tile_width=cell_size * n_columns + 1,
+            tile_height=cell_size * n_rows + 1,
+            tiles_per_row=math.ceil(math.sqrt(n_tiles)),
+        )
+        self.snapshots: dict[int, GameSnapshot] = {}
+        self._changed_tiles: set[int] = set()
+        os.environ["SDL_VIDEO_WINDOW_POS"] = f"{display_x},{display_y}"
+        if not pygame.get_init():
+            pygame.init()
+        self.canvas = pygame.display.set_mode(
+            (
+                self.layout.tiles_per_row * self.layout.tile_width,
+                math.ceil(n_tiles / self.layout.tiles_per_row)
+                * self.layout.tile_height,
+            )
+        )
+        self.canvas.fill(BORDER_RGB)
+        pygame.display.flip()
+
+    def update(self, snapshot: GameSnapshot) -> None:
+        """Keep the snapshot as the latest state of its tile."""
+        self.snapshots[snapshot.tile] = snapshot
+        self._changed_tiles.add(snapshot.tile)
+
+    def render(self) -> list[pygame.Rect]:
+        """Render the tiles that changed and return the rectangles updated."""
+        pygame.event.pump()
+        rects = [self._draw_tile(self.snapshots[tile]) for tile in self._changed_tiles]
+        self._changed_tiles.clear()
+        pygame.display.update(rects)
+        return rects
+
+    def run(self, snapshot_queue: queue.Queue[GameSnapshot | None]) -> None:
+        """Read snapshots and render them until None is read from the queue."""
+        interval = 1 / self.refresh_fps
+        while self._read_snapshots(snapshot_queue, time.monotonic() + interval):
+            self.render()
+        self.render()
+
+    def _read_snapshots(
+        self, snapshot_queue: queue.Queue[GameSnapshot | None], deadline: float
+    ) -> bool:
+        """Read snapshots until the deadline, return False once None is read.
+
+        At least one snapshot is read when the queue is not empty, so a flood of
+        snapshots never holds up rendering and rendering never holds up reading.
+        """
+        while True:
+            try:
+                snapshot = snapshot_queue.get(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except queue.Empty:
+                return True
+            if snapshot is None:
+                return False
+            self.update(snapshot)
+            if time.monotonic() >= deadline:
+                return True
+
+    def _draw_tile(self, snapshot: GameSnapshot) -> pygame.Rect:
+        """Draw the snake and the apple of a snapshot on its tile."""
+        tile_rect = self.layout.tile_rect(snapshot.tile)
+        self.canvas.fill(BORDER_RGB, tile_rect)
+        self.canvas.fill(
+            FINISHED_RGB if snapshot.finished else BACKGROUND_RGB,
+            (tile_rect.x + 1, tile_rect.y + 1, tile_rect.w - 1, tile_rect.h - 1),
+        )
+        for (column, row), rgb in [(snapshot.apple, APPLE_RGB)] + [
+            (cell, SNAKE_RGB) for cell in snapshot.snake
+        ]:
+            self.canvas.fill(
+                rgb,
+                (
+                    tile_rect.x + 1 + column * self.layout.cell_size,
+                    tile_rect.y + 1 + row * self.layout.cell_size,
+                    self.layout.cell_size,
+                    self.layout.cell_size,
+                ),
+            )
+        return tile_rect
+
+
+def run_mosaic_viewer(
+    snapshot_queue: queue.Queue[GameSnapshot | None],
+    n_tiles: int,
+    game_settings: settings.GameSettings,
+    refresh_fps: float,
+) -> None:
+    """Show the snapshots of a queue in a mosaic viewer, used as a process target."""
+    viewer = MosaicViewer(n_tiles, game_settings, refresh_fps=refresh_fps)
+    try:
+        viewer.run(snapshot_queue)
+    finally:
+        pygame.quit()
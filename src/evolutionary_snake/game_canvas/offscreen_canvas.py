@@ -0,0 +1,96 @@
+"""The offscreen game canvas, drawing into a NumPy frame buffer."""
+
+import numpy as np
+
+from evolutionary_snake import settings
+from evolutionary_snake.game_canvas import canvas, image_export
+from evolutionary_snake.game_canvas.canvas import APPLE_RGB, BACKGROUND_RGB, SNAKE_RGB
+
+SCORE_DIGITS = 5
+DIGIT_GLYPHS = {
+    "0": ("111", "101", "101", "101", "111"),
+    "1": ("010", "110", "010", "010", "111"),
+    "2": ("111", "001", "111", "100", "111"),
+    "3": ("111", "001", "111", "001", "111"),
+    "4": ("101", "101", "111", "001", "001"),
+    "5": ("111", "100", "111", "001", "111"),
+    "6": ("111", "100", "111", "101", "111"),
+    "7": ("111", "001", "010", "010", "010"),
+    "8": ("111", "101", "111", "101", "111"),
+    "9": ("111", "101", "111", "001", "111"),
+}
+
+
+class OffscreenCanvas(  # pylint: disable=too-few-public-methods
+    canvas.GameCanvas[image_export.FrameType]
+):
+    """Game canvas that renders into a frame buffer without a window.
+
+    The canvas needs neither pygame nor a display, so it renders on headless
+    servers. With a path to frames, every drawn frame is written to a PNG image
+    sequence, or to an animated GIF for a path ending in .gif.
+    """
+
+    def __init__(self, game_settings: settings.GameSettings) -> None:
+        """Initialize the offscreen canvas with a blank frame."""
+        super().__init__(game_settings)
+        self.frame = np.full(
+            (
+                game_settings.display_height + game_settings.step_size,
+                game_settings.display_width,
+                3,
+            ),
+            BACKGROUND_RGB,
+            dtype=np.uint8,
+        )
+        self.writer = (
+            image_export.create_frame_writer(
+                game_settings.path_frames,
+                palette=[BACKGROUND_RGB, SNAKE_RGB, APPLE_RGB],
+                frame_rate_fps=game_settings.frame_rate_fps,
+            )
+            if game_settings.path_frames is not None
+            else None
+        )
+
+    def close(self) -> None:
+        """Finish writing the frames."""
+        if self.writer is not None:
+            self.writer.close()
+
+    def _paint_cell(self, cell: tuple[int, int], rgb: tuple[int, int, int]) -> None:
+        """Paint a cell of the board, ignoring cells outside of it."""
+        x, y = cell
+        step_size = self.settings.step_size
+        if not (
+            0 <= x < self.settings.display_width
+            and 0 <= y < self.settings.display_height
+        ):
+            return
+        self.frame[y : y + step_size, x : x + step_size] = rgb
+
+    def _paint_score(self, score: int) -> None:
+        """Paint the score as digits in the strip below the board."""
+        top = self.settings.display_height
+        strip = self.frame[top : top + self.settings.step_size]
+        strip[:] = BACKGROUND_RGB
+        glyph_height, glyph_width = len(DIGIT_GLYPHS["0"]), len(DIGIT_GLYPHS["0"][0])
+        scale = max(1, self.settings.step_size // (glyph_height + 1))
+        x = 4 * self.settings.display_width // 5
+        for digit in str(score).zfill(SCORE_DIGITS)[-SCORE_DIGITS:]:
+            glyph = (
+                np.array(
+                    [[pixel == "1" for pixel in row] for row in DIGIT_GLYPHS[digit]]
+                )
+                .repeat(scale, axis=0)
+                .repeat(scale, axis=1)
+            )
+            glyph = glyph[:, : max(0, strip.shape[1] - x)]
+            strip[: glyph.shape[0], x : x + glyph.shape[1]][glyph] = SNAKE_RGB
+            x += (glyph_width + 1) * scale
+
+    def _present(self) -> image_export.FrameType:
+        """Write the frame, if frames are exported."""
+        if self.writer is not None:
+            self.writer.write(self.frame)
+        return self.frame
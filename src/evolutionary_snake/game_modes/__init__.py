@@ -2,5 +2,6 @@
 
 from evolutionary_snake.game_modes.ai_game_mode import AiGameMode
 from evolutionary_snake.game_modes.human_game_mode import HumanGameMode
+from evolutionary_snake.game_modes.replay_game_mode import ReplayGameMode
 
-__all__ = ["AiGameMode", "HumanGameMode"]
+__all__ = ["AiGameMode", "HumanGameMode", "ReplayGameMode"]
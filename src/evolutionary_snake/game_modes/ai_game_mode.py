@@ -7,14 +7,16 @@ import numpy as np
 
 from evolutionary_snake import settings
 from evolutionary_snake.game_modes import base_game_mode
-from evolutionary_snake.machine_learning import input_vector, loss_tracking
+from evolutionary_snake.machine_learning import features, loss_tracking
 from evolutionary_snake.utils import enums
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
 
-class AiGameMode(base_game_mode.BaseGameMode):
+class AiGameMode(  # pylint: disable=too-many-instance-attributes
+    base_game_mode.BaseGameMode
+):
     """The AI game mode class."""
 
     def __init__(
@@ -22,22 +24,40 @@ class AiGameMode(base_game_mode.BaseGameMode):
         game_settings: settings.AiGameSettings,
     ) -> None:
         """Initialize the AI game mode."""
+        if game_settings.neural_net is None:
+            msg = "The AI game mode requires a neural network."
+            raise ValueError(msg)
         super().__init__(game_settings=game_settings)
         self.game_settings: settings.AiGameSettings = game_settings
         self.name = game_settings.name
         self.neural_net = game_settings.neural_net
         self.steps_without_apple = 0
+        self.seen_states: set[
+            tuple[tuple[tuple[int, int], ...], enums.Direction, int, int]
+        ] = set()
+        self.looped = False
         self.apple_distance = self.distance_to_apple()
-        self.input_vector = input_vector.compute_input_vector(
-            snake=self.snake, apple=self.apple
-        )
+        self.feature_pipeline = features.FeaturePipeline(game_settings.features)
+        self.inputs = self.feature_pipeline.compute(snake=self.snake, apple=self.apple)
         self.loss_tracker = loss_tracking.LossTracker()
 
     def process_score(self) -> None:
-        """Process the score upon cleaning up."""
+        """Process the score upon cleaning up.
+
+        With a reachable area score, the snake is rewarded for the mean room it had
+        to move its whole body into, so snakes that trap themselves score less.
+        """
         if self.collided():
             self.loss_tracker.loss -= self.game_settings.collision_penalty
+        if self.looped:
+            self.loss_tracker.loss -= self.game_settings.loop_penalty
         self.loss_tracker.loss += self.loss_tracker.steps_total
+        if self.game_settings.reachable_area_score and self.loss_tracker.steps_total:
+            self.loss_tracker.loss += (
+                self.game_settings.reachable_area_score
+                * self.loss_tracker.room_total
+                / self.loss_tracker.steps_total
+            )
         exploration_minimum = min(self.loss_tracker.direction_counts.values())
         if exploration_minimum > 0:
             msg = (
@@ -58,7 +78,22 @@ class AiGameMode(base_game_mode.BaseGameMode):
         logger.info(msg)
 
     def game_ending_conditions_other(self) -> bool:
-        """Extend the game ending conditions."""
+        """Extend the game ending conditions.
+
+        A game that got stuck in a loop ends at once. It would have looped until the
+        step limit, so the steps it had left are counted as saved, none without a
+        step limit.
+        """
+        if self.looped:
+            self.loss_tracker.steps_saved = max(
+                self.game_settings.step_limit - self.steps_without_apple, 0
+            )
+            msg = (
+                f"{self.name} got stuck in a loop, saving "
+                f"{self.loss_tracker.steps_saved} steps"
+            )
+            logger.info(msg)
+            return True
         if self.steps_without_apple >= self.game_settings.step_limit >= 0:
             msg = f"{self.name} played too long without eating apple"
             logger.info(msg)
@@ -82,29 +117,68 @@ class AiGameMode(base_game_mode.BaseGameMode):
             self.steps_without_apple = 0
         else:
             self.steps_without_apple += 1
+        if self.game_settings.reachable_area_score:
+            self.loss_tracker.room_total += self.room_for_body()
+        if self.game_settings.detect_loops:
+            self.looped = self.detect_loop()
 
-        self.input_vector = input_vector.compute_input_vector(
-            snake=self.snake, apple=self.apple
-        )
+        with self.profiler.phase(enums.ProfilePhase.INPUT_VECTOR):
+            self.feature_pipeline.compute(snake=self.snake, apple=self.apple)
         self.loss_tracker.steps_total += 1
 
+    def detect_loop(self) -> bool:
+        """Return True if the game is back in a state it was in since the last apple.
+
+        The state is the body of the snake from head to tail, its direction and the
+        apple. The body is kept in order, so bodies on the same cells whose segments
+        run in another order are different states. The network plays a state the
+        same way every time, so a game that returns to a state repeats the steps in
+        between until it ends.
+        """
+        if self.steps_without_apple == 0:
+            self.seen_states.clear()
+        state = (
+            tuple(self.snake.coordinates),
+            self.snake.direction,
+            self.apple.x,
+            self.apple.y,
+        )
+        if state in self.seen_states:
+            return True
+        self.seen_states.add(state)
+        return False
+
+    def room_for_body(self) -> float:
+        """Return the fraction of the body that fits in the area the head can reach.
+
+        The flood fill stops once the whole body fits, so it is cheap for a snake
+        that is not trapped.
+        """
+        length = self.snake.length
+        return min(self.snake.reachable_area(threshold=length), length) / length
+
     def distance_to_apple(self) -> float:
         """Measure the distance to the apple."""
+        head_x, head_y = self.snake.head
         dx_to_right_edge = min(
-            self.snake.width - self.snake.x[0], self.snake.width - self.apple.x
+            self.snake.width - head_x, self.snake.width - self.apple.x
         )
-        dx_outer = dx_to_right_edge + min(self.snake.x[0], self.apple.x)
+        dx_outer = dx_to_right_edge + min(head_x, self.apple.x)
         dy_to_bottom_edge = min(
-            self.snake.height - self.snake.y[0], self.snake.height - self.apple.y
+            self.snake.height - head_y, self.snake.height - self.apple.y
         )
-        dy_outer = dy_to_bottom_edge + min(self.snake.y[0], self.apple.y)
+        dy_outer = dy_to_bottom_edge + min(head_y, self.apple.y)
 
-        dx_shortest = min(abs(self.apple.x - self.snake.x[0]), dx_outer)
-        dy_shortest = min(abs(self.apple.y - self.snake.y[0]), dy_outer)
+        dx_shortest = min(abs(self.apple.x - head_x), dx_outer)
+        dy_shortest = min(abs(self.apple.y - head_y), dy_outer)
 
         return math.sqrt(dx_shortest**2 + dy_shortest**2)
 
     def get_direction(self) -> enums.Direction:
-        """Return the direction the snake should go."""
-        prediction = self.neural_net.activate(self.input_vector.values)
+        """Return the direction the snake should go.
+
+        The network reads the buffer of the feature pipeline, which is overwritten
+        with the features of the game on every step.
+        """
+        prediction = self.neural_net.activate(self.inputs)
         return enums.Direction(int(np.argmax(prediction)))
@@ -2,75 +2,114 @@
 
 import abc
 import os
+import random
+import secrets
 import time
 
 import pygame
 
-from evolutionary_snake import game_objects, settings
-from evolutionary_snake.game_canvas import canvas
+from evolutionary_snake import game_objects, settings, simulation
+from evolutionary_snake.game_canvas import canvas, offscreen_canvas
 from evolutionary_snake.game_objects.boundaries import boundary_factory
+from evolutionary_snake.machine_learning import profiling
 from evolutionary_snake.utils import enums
 
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 
 
-class BaseGameMode(abc.ABC):
+class BaseGameMode(abc.ABC):  # pylint: disable=too-many-instance-attributes
     """Base game mode."""
 
     def __init__(self, game_settings: settings.GameSettings) -> None:
-        """Initialize the base game mode."""
+        """Initialize the base game mode.
+
+        A game without a seed draws one, so its replay can reproduce it. A game
+        with a path to frames renders offscreen, also when it is headless.
+        """
         self.game_settings = game_settings
+        self.seed = (
+            game_settings.seed
+            if game_settings.seed is not None
+            else secrets.randbits(32)
+        )
+        self.rng = random.Random(self.seed)  # noqa: S311  # nosec
         self.boundary = boundary_factory.boundary_factory(self.game_settings)
         self.running = True
         self.score = 0
+        self.profiler = (
+            profiling.GameProfiler()
+            if game_settings.profile
+            else profiling.NullProfiler()
+        )
+        self.directions = (
+            bytearray() if game_settings.path_replays is not None else None
+        )
         self.snake = game_objects.Snake(
             length=game_settings.snake_length_init,
             width=game_settings.display_width,
             height=game_settings.display_height,
             step_size=game_settings.step_size,
             boundary=self.boundary,
+            rng=self.rng,
         )
         self.apple = self.generate_apple()
-        self.canvas = (
-            canvas.Canvas(game_settings=game_settings)
-            if not game_settings.run_in_background
-            else None
-        )
+        self.canvas: canvas.GameRenderer | None = None
+        if game_settings.path_frames is not None:
+            self.canvas = offscreen_canvas.OffscreenCanvas(game_settings=game_settings)
+        elif not (game_settings.run_in_background or game_settings.headless):
+            self.canvas = canvas.Canvas(game_settings=game_settings)
 
     def run(self) -> None:
-        """Run the snake game."""
-        pygame.init()
+        """Run the snake game.
+
+        In headless mode pygame is never initialized: no events are pumped, no keys
+        are polled and the loop does not sleep between frames. When profiling is
+        on, the phases of every step are timed by the profiler of the game. With a
+        path to replays, the directions of every step are recorded and the replay
+        of the game is appended to it once the game ends.
+        """
+        if not self.game_settings.headless:
+            pygame.init()
         while self.running:
-            if not self.game_continues():
+            with self.profiler.phase(enums.ProfilePhase.GAME_STATE):
+                game_continues = self.game_continues()
+            if not game_continues:
                 self.running = False
                 break
             self.loop()
-            self.render()
-            time.sleep(1 / self.game_settings.frame_rate_fps)
+            with self.profiler.phase(enums.ProfilePhase.RENDER):
+                self.render()
+            if not self.game_settings.headless:
+                with self.profiler.phase(enums.ProfilePhase.SLEEP):
+                    time.sleep(1 / self.game_settings.frame_rate_fps)
+            self.profiler.count_step()
         self.cleanup()
 
     def game_continues(self) -> bool:
         """Return True if the game should continue."""
         return not (
-            self.game_ending_key_press()
+            (not self.game_settings.headless and self.game_ending_key_press())
             or self.collided()
             or self.game_ending_conditions_other()
         )
 
     def loop(self) -> None:
         """The main loop of the game mode."""
-        pygame.event.pump()
-        direction = self.get_direction()
-        self.snake.update(direction=direction)
-        self._loop(direction=direction)
+        if not self.game_settings.headless:
+            with self.profiler.phase(enums.ProfilePhase.EVENTS):
+                pygame.event.pump()
+        with self.profiler.phase(enums.ProfilePhase.DIRECTION):
+            direction = self.get_direction()
+        if self.directions is not None:
+            self.directions.append(direction.value)
+        with self.profiler.phase(enums.ProfilePhase.SNAKE_UPDATE):
+            self.snake.update(direction=direction)
+        with self.profiler.phase(enums.ProfilePhase.GAME_LOGIC):
+            self._loop(direction=direction)
 
     def generate_apple(self) -> game_objects.Apple:
         """Generate an apple for the game mode."""
-        return game_objects.Apple(
-            snake_coordinates=self.snake.coordinates,
-            settings=self.game_settings,
-            boundary=self.boundary,
-        )
+        return game_objects.Apple(free_cells=self.snake.free_cells, rng=self.rng)
 
     @abc.abstractmethod
     def get_direction(self) -> enums.Direction:
@@ -91,7 +130,7 @@ class BaseGameMode(abc.ABC):
 
     def eaten_apple(self) -> bool:
         """Return True if the snake eaten the apple."""
-        return self.apple.x == self.snake.x[0] and self.apple.y == self.snake.y[0]
+        return (self.apple.x, self.apple.y) == self.snake.head
 
     def update_eating_apple(self) -> None:
         """Update game state when eaten an apple."""
@@ -112,7 +151,28 @@ class BaseGameMode(abc.ABC):
         """Clean up after quiting the game mode."""
         self.process_score()
         self.render()
-        pygame.quit()
+        if self.game_settings.path_replays is not None:
+            simulation.append_replay(
+                self.game_settings.path_replays, self.create_replay()
+            )
+        if self.canvas is not None:
+            self.canvas.close()
+        if not self.game_settings.headless:
+            pygame.quit()
+
+    def create_replay(self) -> simulation.Replay:
+        """Return the replay of the directions recorded so far."""
+        return simulation.Replay(
+            name=getattr(self.game_settings, "name", type(self).__name__),
+            game_settings=self.game_settings.model_dump(
+                mode="json",
+                include=set(settings.GameSettings.model_fields),
+                exclude={"path_replays", "path_frames", "profile"},
+            )
+            | {"seed": self.seed},
+            directions=bytes(self.directions or b""),
+            score=self.score,
+        )
 
     @abc.abstractmethod
     def process_score(self) -> None:
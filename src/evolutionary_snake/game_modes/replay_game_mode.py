@@ -0,0 +1,77 @@
+"""Module for defining the replay game mode."""
+
+import logging
+import pathlib
+
+from evolutionary_snake import settings, simulation
+from evolutionary_snake.game_modes import base_game_mode
+from evolutionary_snake.utils import enums
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayGameMode(base_game_mode.BaseGameMode):
+    """Game mode that re-simulates a recorded game step by step.
+
+    The snake follows the recorded directions on a board seeded like the recorded
+    game, so every step is reproduced without the network that played it. Headless
+    replays run at full speed. When rendered, only the frames of the frame range
+    are shown: the steps before it are re-simulated without rendering and the
+    replay stops at its end.
+    """
+
+    def __init__(
+        self,
+        replay: simulation.Replay,
+        *,
+        headless: bool = True,
+        frames: range | None = None,
+        path_frames: pathlib.Path | None = None,
+    ) -> None:
+        """Initialize the replay game mode.
+
+        With a path to frames, the frames of the frame range are exported offscreen.
+        """
+        super().__init__(
+            game_settings=settings.GameSettings(
+                **replay.game_settings
+                | {
+                    "headless": headless,
+                    "run_in_background": False,
+                    "path_frames": path_frames,
+                }
+            )
+        )
+        self.replay = replay
+        self.step = 0
+        frames = range(replay.steps) if frames is None else frames
+        self.stop = min(frames.stop, replay.steps)
+        self.fast_forward(frames.start)
+
+    def fast_forward(self, step: int) -> None:
+        """Re-simulate the steps up to the given step without rendering."""
+        while self.step < step and self.game_continues():
+            self.loop()
+
+    def get_direction(self) -> enums.Direction:
+        """Return the recorded direction of the current step."""
+        return enums.Direction(self.replay.directions[self.step])
+
+    def _loop(self, direction: enums.Direction) -> None:
+        """Eat the apple like the recorded game and move on to the next step."""
+        del direction
+        if self.eaten_apple():
+            self.update_eating_apple()
+        self.step += 1
+
+    def game_ending_conditions_other(self) -> bool:
+        """End the replay at the end of the frame range."""
+        return self.step >= self.stop
+
+    def process_score(self) -> None:
+        """Log the score of the replay."""
+        msg = (
+            f"Replay of {self.replay.name} stopped after {self.step} of "
+            f"{self.replay.steps} steps with score {self.score}"
+        )
+        logger.info(msg)
@@ -1,9 +1,11 @@
 """Game objects module."""
 
 from evolutionary_snake.game_objects.apple import Apple
+from evolutionary_snake.game_objects.free_cells import FreeCells
 from evolutionary_snake.game_objects.snake import Snake
 
 __all__ = [
     "Apple",
+    "FreeCells",
     "Snake",
 ]
@@ -2,9 +2,7 @@
 
 import random
 
-from evolutionary_snake.game_objects import boundaries
-from evolutionary_snake.game_objects.boundaries import base_boundary
-from evolutionary_snake.settings import game_settings
+from evolutionary_snake.game_objects.free_cells import FreeCells
 
 
 class Apple:  # pylint: disable=too-few-public-methods
@@ -12,30 +10,19 @@ class Apple:  # pylint: disable=too-few-public-methods
 
     def __init__(
         self,
-        snake_coordinates: list[tuple[int, int]],
-        settings: game_settings.GameSettings,
-        boundary: base_boundary.BaseBoundary,
+        free_cells: FreeCells,
+        *,
+        rng: random.Random | None = None,
     ) -> None:
         """Initialize the apple game object."""
-        self.snake_coordinates = snake_coordinates
-        self.coordinates_grid = settings.coordinates_grid
-        self.boundary = boundary
+        self.rng = rng if rng is not None else random.Random()  # noqa: S311  # nosec
+        self.free_cells = free_cells
         self.x, self.y = self._generate_coordinates()
 
     def _generate_coordinates(self) -> tuple[int, int]:
         """Generate the coordinates of the apple position.
 
-        Return a x, y coordinate randomly chosen from a list of possible coordinates
-        Removes the x,y coordinates that overlap with the snake and boundary if present
+        Return a x, y coordinate randomly chosen from the free cells of the board. The
+        free cells exclude the snake and lie inside the boundary.
         """
-        # apple cannot be generated on top of snake
-        coordinates = [
-            c for c in self.coordinates_grid if c not in self.snake_coordinates
-        ]
-
-        # apple cannot be generated on top of boundary
-        if isinstance(self.boundary, boundaries.HardBoundary):
-            coordinates = [c for c in coordinates if c not in self.boundary.coordinates]
-
-        random.shuffle(coordinates)
-        return coordinates[0]
+        return self.free_cells.sample(self.rng)
@@ -11,3 +11,4 @@ class BaseBoundary:  # pylint: disable=too-few-public-methods
         self.y_max = settings.display_height
         self.x_max = settings.display_width
         self.step_size = settings.step_size
+        self.geometry = settings.geometry
@@ -0,0 +1,51 @@
+"""Index of the free cells of the board."""
+
+import collections.abc
+import random
+
+
+class FreeCells:
+    """Index of the cells of the board that are not occupied by the snake.
+
+    The cells are kept in a list together with a map from each cell to its position
+    in that list. A cell is removed by swapping the last cell into its position, so
+    adding, removing and sampling a cell all take constant time.
+    """
+
+    def __init__(self, cells: collections.abc.Iterable[tuple[int, int]]) -> None:
+        """Initialize the index with the given free cells."""
+        self._cells: list[tuple[int, int]] = []
+        self._positions: dict[tuple[int, int], int] = {}
+        for cell in cells:
+            self.add(cell)
+
+    def __len__(self) -> int:
+        """Return the number of free cells."""
+        return len(self._cells)
+
+    def __contains__(self, cell: object) -> bool:
+        """Return True if the cell is free."""
+        return cell in self._positions
+
+    def add(self, cell: tuple[int, int]) -> None:
+        """Mark a cell as free."""
+        if cell not in self._positions:
+            self._positions[cell] = len(self._cells)
+            self._cells.append(cell)
+
+    def remove(self, cell: tuple[int, int]) -> None:
+        """Mark a cell as occupied."""
+        position = self._positions.pop(cell, None)
+        if position is None:
+            return
+        last_cell = self._cells.pop()
+        if position < len(self._cells):
+            self._cells[position] = last_cell
+            self._positions[last_cell] = position
+
+    def sample(self, rng: random.Random) -> tuple[int, int]:
+        """Return a randomly chosen free cell."""
+        if not self._cells:
+            msg = "There is no free cell left on the board."
+            raise ValueError(msg)
+        return self._cells[rng.randrange(len(self._cells))]
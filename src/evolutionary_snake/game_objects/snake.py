@@ -1,9 +1,14 @@
 """The snake game object."""
 
+import collections.abc
+import functools
 import random
+import typing
 
 from evolutionary_snake.game_objects import boundaries
 from evolutionary_snake.game_objects.boundaries import base_boundary
+from evolutionary_snake.game_objects.free_cells import FreeCells
+from evolutionary_snake.settings import grid_geometry
 from evolutionary_snake.utils import enums
 
 DIRECTIONS: list[enums.Direction] = list(enums.Direction)
@@ -15,150 +20,403 @@ DIRECTION_OPPOSITES: dict[enums.Direction, enums.Direction] = {
 }
 
 
+class FloodMasks(typing.NamedTuple):
+    """Bitboards of a board used to flood fill it, with a bit for every cell.
+
+    The bit of a cell is row * n_columns + column.
+    """
+
+    board: int
+    first_column: int
+    last_column: int
+    first_row: int
+    last_row: int
+
+
+@functools.cache
+def get_flood_masks(n_columns: int, n_rows: int) -> FloodMasks:
+    """Return the flood fill masks of a board, computed once for every board size."""
+    first_column = sum(1 << (row * n_columns) for row in range(n_rows))
+    first_row = (1 << n_columns) - 1
+    return FloodMasks(
+        board=(1 << (n_columns * n_rows)) - 1,
+        first_column=first_column,
+        last_column=first_column << (n_columns - 1),
+        first_row=first_row,
+        last_row=first_row << (n_columns * (n_rows - 1)),
+    )
+
+
+class BodyAxis(collections.abc.Sequence[int]):
+    """View on one axis of the snake body, indexed from the head to the tail."""
+
+    def __init__(self, snake: "Snake", axis: int) -> None:
+        """Initialize the view on the x (axis 0) or y (axis 1) coordinates."""
+        self.snake = snake
+        self.axis = axis
+
+    def __len__(self) -> int:
+        """Return the capacity of the snake body."""
+        return self.snake.capacity
+
+    @typing.overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        """Return the coordinate of a segment, or a list of them for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.snake.segment(index)[self.axis]
+
+    def __setitem__(self, index: int, value: int) -> None:
+        """Move a segment along this axis."""
+        segment = list(self.snake.segment(index))
+        segment[self.axis] = value
+        self.snake.move_segment(index, *segment)
+
+
 class Snake:  # pylint: disable=too-many-instance-attributes
     """Snake game object."""
 
-    def __init__(  # pylint: disable=too-many-positional-arguments
+    def __init__(  # noqa: PLR0913  # pylint: disable=too-many-positional-arguments
         self,
         length: int,
         width: int,
         height: int,
         step_size: int,
         boundary: base_boundary.BaseBoundary,
+        *,
+        rng: random.Random | None = None,
     ) -> None:
         """Initialize the snake game object."""
+        self.rng = rng if rng is not None else random.Random()  # noqa: S311  # nosec
         self.length = length
         self.width = width
         self.height = height
         self.step_size = step_size
         self.boundary = boundary
-        self.x, self.y = [self.width // 2], [self.width // 2]
-        self.direction: enums.Direction = DIRECTIONS[random.randint(0, 3)]  # noqa: S311  # nosec
+        self.geometry = grid_geometry.get_grid_geometry(width, height, step_size)
+        self.n_columns, self.n_rows = width // step_size, height // step_size
+        self.capacity = width // step_size * height // step_size
+        self.head_index = 0
+        self._body_x: list[int] = []
+        self._body_y: list[int] = []
+        self.x, self.y = BodyAxis(self, axis=0), BodyAxis(self, axis=1)
+        self.direction: enums.Direction = DIRECTIONS[self.rng.randint(0, 3)]
+        self._occupancy: dict[tuple[int, int], int] = {}
+        self.free_cells = FreeCells([])
+        self.flood_masks = get_flood_masks(self.n_columns, self.n_rows)
+        self.board = 0
+        self._board_version = 0
+        self._reachable_cache: tuple[tuple[int, int, int], int, bool] | None = None
+        self.rows: list[int] = []
+        self.columns: list[int] = []
+        self.diagonals: list[int] = []
+        self.antidiagonals: list[int] = []
         self.initialize_snake()
 
     def initialize_snake(self) -> None:
-        """Initialize the snake."""
-        raster_size = self.width // self.step_size * self.height // self.step_size
-        self.x.extend([-1 * self.step_size] * (raster_size - 1))
-        self.y.extend([self.y[0]] * (raster_size - 1))
+        """Initialize the snake.
+
+        The body is a ring buffer holding a segment for every cell of the board, the
+        head lives at head_index and the segments follow it. Segments beyond the
+        length of the snake are parked outside the board. The occupied cells are
+        also kept as bitboards of the whole board and of its rows, columns and
+        diagonals.
+        """
+        self._sentinel_x, self._sentinel_y = -1 * self.step_size, self.width // 2
+        self._body_x = [self.width // 2] + [self._sentinel_x] * (self.capacity - 1)
+        self._body_y = [self._sentinel_y] * self.capacity
+        self.head_index = 0
+        self._occupancy.clear()
+        self.free_cells = FreeCells(self.geometry.cells)
+        self.board = 0
+        self._reachable_cache = None
+        self.rows = [0] * self.n_rows
+        self.columns = [0] * self.n_columns
+        self.diagonals = [0] * (self.n_columns + self.n_rows - 1)
+        self.antidiagonals = [0] * (self.n_columns + self.n_rows - 1)
+        for x, y in self.coordinates:
+            self._occupy(x, y)
+
+    @property
+    def head(self) -> tuple[int, int]:
+        """Return the coordinates of the head of the snake."""
+        return self._body_x[self.head_index], self._body_y[self.head_index]
+
+    def segment(self, index: int) -> tuple[int, int]:
+        """Return the coordinates of a segment, counted from the head."""
+        position = self._buffer_position(index)
+        return self._body_x[position], self._body_y[position]
+
+    def move_segment(self, index: int, x: int, y: int) -> None:
+        """Move a segment, counted from the head, to the cell at x, y."""
+        position = self._buffer_position(index)
+        if (position - self.head_index) % self.capacity < self.length:
+            self._release(self._body_x[position], self._body_y[position])
+            self._occupy(x, y)
+        self._body_x[position], self._body_y[position] = x, y
+
+    def _buffer_position(self, index: int) -> int:
+        """Return the position in the ring buffer of a segment."""
+        if index < 0:
+            index += self.capacity
+        if not 0 <= index < self.capacity:
+            msg = f"Segment index {index} is out of range."
+            raise IndexError(msg)
+        return (self.head_index + index) % self.capacity
+
+    def occupies(self, x: int, y: int) -> bool:
+        """Return True if a segment of the snake occupies the cell at x, y."""
+        return (x, y) in self._occupancy
+
+    def _occupy(self, x: int, y: int) -> None:
+        """Register a segment of the snake on a cell of the board."""
+        if self.geometry.on_board(x, y):
+            count = self._occupancy.get((x, y), 0)
+            if count == 0:
+                self.free_cells.remove((x, y))
+                self._toggle_bitboards(x, y)
+            self._occupancy[x, y] = count + 1
+
+    def _release(self, x: int, y: int) -> None:
+        """Unregister a segment of the snake from a cell of the board."""
+        count = self._occupancy.get((x, y), 0)
+        if count > 1:
+            self._occupancy[x, y] = count - 1
+        elif count == 1:
+            del self._occupancy[x, y]
+            self.free_cells.add((x, y))
+            self._toggle_bitboards(x, y)
+
+    def _toggle_bitboards(self, x: int, y: int) -> None:
+        """Flip the bits of the cell at x, y on the bitboards of the board.
+
+        The bit of a cell is its column on rows and diagonals, its row on columns.
+        """
+        column, row = x // self.step_size, y // self.step_size
+        cell = row * self.n_columns + column
+        self.board ^= 1 << cell
+        self._board_version += 1
+        self.rows[row] ^= 1 << column
+        self.columns[column] ^= 1 << row
+        self.diagonals[column - row + self.n_rows - 1] ^= 1 << column
+        self.antidiagonals[column + row] ^= 1 << column
+
+    def reachable_area(self, threshold: int | None = None) -> int:
+        """Return the number of free cells the head can reach, 0 if it left the board.
+
+        The free cells are flood filled from the head on the bitboard of the board,
+        which grows the filled area by a cell in all directions at once. With a
+        threshold, the fill stops once it has reached that many cells, so the area
+        returned is then only known to be at least the threshold. The last area is
+        cached for the state of the body, so asking again on the same step is free.
+        """
+        head_x, head_y = self.head
+        if not self.geometry.on_board(head_x, head_y):
+            return 0
+        key = (self._board_version, head_x, head_y)
+        if self._reachable_cache is not None:
+            cached_key, area, exact = self._reachable_cache
+            if cached_key == key and (
+                exact or (threshold is not None and area >= threshold)
+            ):
+                return area
+        free = self.flood_masks.board & ~self.board
+        periodic = isinstance(self.boundary, boundaries.PeriodicBoundary)
+        reached = 1 << (
+            head_y // self.step_size * self.n_columns + head_x // self.step_size
+        )
+        area, exact = 0, True
+        while True:
+            frontier = self._grow(reached, periodic=periodic) & free & ~reached
+            if not frontier:
+                break
+            reached |= frontier
+            area += frontier.bit_count()
+            if threshold is not None and area >= threshold:
+                exact = False
+                break
+        self._reachable_cache = (key, area, exact)
+        return area
+
+    def _grow(self, reached: int, *, periodic: bool) -> int:
+        """Return the cells next to the reached cells, wrapping on periodic boards."""
+        masks = self.flood_masks
+        grown = (
+            ((reached & ~masks.last_column) << 1)
+            | ((reached & ~masks.first_column) >> 1)
+            | (reached << self.n_columns)
+            | (reached >> self.n_columns)
+        )
+        if periodic:
+            wrap_column = self.n_columns - 1
+            wrap_row = self.n_columns * (self.n_rows - 1)
+            grown |= (
+                ((reached & masks.last_column) >> wrap_column)
+                | ((reached & masks.first_column) << wrap_column)
+                | ((reached & masks.last_row) >> wrap_row)
+                | ((reached & masks.first_row) << wrap_row)
+            )
+        return grown
+
+    def body_distance(self, d_column: int, d_row: int) -> int:
+        """Return the steps from the head to the body in a direction, 0 if none.
+
+        The direction is a step of -1, 0 or 1 cells along both axes. The nearest
+        segment is the lowest set bit ahead of the head on the bitboard of its line,
+        or the highest set bit behind it, so the search does not loop over cells.
+        """
+        head_x, head_y = self.head
+        if not self.geometry.on_board(head_x, head_y):
+            return 0
+        column, row = head_x // self.step_size, head_y // self.step_size
+        if d_row == 0:
+            line, position, step = self.rows[row], column, d_column
+        elif d_column == 0:
+            line, position, step = self.columns[column], row, d_row
+        elif d_column == d_row:
+            line = self.diagonals[column - row + self.n_rows - 1]
+            position, step = column, d_column
+        else:
+            line, position, step = self.antidiagonals[column + row], column, d_column
+        if step > 0:
+            ahead = line >> (position + 1)
+            return (ahead & -ahead).bit_length()
+        behind = line & ((1 << position) - 1)
+        return position - behind.bit_length() + 1 if behind else 0
 
     @property
     def coordinates(self) -> list[tuple[int, int]]:
         """Return list of snake coordinates."""
+        start, stop = self.head_index, self.head_index + self.length
+        if stop <= self.capacity:
+            return list(
+                zip(self._body_x[start:stop], self._body_y[start:stop], strict=True)
+            )
+        stop -= self.capacity
         return list(
             zip(
-                self.x[: self.length],
-                self.y[: self.length],
-                strict=False,
+                self._body_x[start:] + self._body_x[:stop],
+                self._body_y[start:] + self._body_y[:stop],
+                strict=True,
             )
         )
 
     def collided_with_boundary(self) -> bool:
         """Check if the snake collides with the boundary."""
         if isinstance(self.boundary, boundaries.HardBoundary):
-            return (self.x[0], self.y[0]) in self.boundary.coordinates
+            return not self.geometry.on_board(*self.head)
         return False
 
     def collided_with_itself(self) -> bool:
         """Return True if the snake collides with itself."""
-        return any(
-            self.x[0] == x and self.y[0] == y
-            for x, y in zip(self.x[1:], self.y[1:], strict=False)
-        )
+        return self._occupancy.get(self.head, 0) > 1
 
     def periodic_boundary_conditions(self) -> None:
         """The snake appears at the opposite screen side upon hitting the edge."""
-        if self.x[0] > self.width - self.step_size:
-            self.x[0] = 0
-        if self.x[0] < 0:
-            self.x[0] = self.width - self.step_size
-        if self.y[0] > self.height - self.step_size:
-            self.y[0] = 0
-        if self.y[0] < 0:
-            self.y[0] = self.height - self.step_size
+        self.move_segment(0, *self._wrap(*self.head))
+
+    def _wrap(self, x: int, y: int) -> tuple[int, int]:
+        """Return the cell at x, y after applying the periodic boundary conditions."""
+        if x > self.width - self.step_size:
+            x = 0
+        if x < 0:
+            x = self.width - self.step_size
+        if y > self.height - self.step_size:
+            y = 0
+        if y < 0:
+            y = self.height - self.step_size
+        return x, y
 
     def update(self, direction: enums.Direction) -> None:
-        """Update the body of the snake."""
+        """Update the body of the snake.
+
+        A move releases the tail and writes the new head in front of the old one, so
+        its cost does not depend on the length of the snake.
+        """
         if direction == DIRECTION_OPPOSITES[self.direction]:
             direction = self.direction
 
-        for i in range(self.length - 1, 0, -1):
-            self.x[i] = self.x[i - 1]
-            self.y[i] = self.y[i - 1]
+        # the freed tail slot is parked outside the board, where it is not registered
+        tail = (self.head_index + self.length - 1) % self.capacity
+        self._release(self._body_x[tail], self._body_y[tail])
+        head_x, head_y = self.head
+        self._body_x[tail], self._body_y[tail] = self._sentinel_x, self._sentinel_y
 
         # update the movement of the head of the snake
         if direction == enums.Direction.RIGHT:
-            self.x[0] = self.x[0] + self.step_size
+            head_x += self.step_size
         if direction == enums.Direction.LEFT:
-            self.x[0] = self.x[0] - self.step_size
+            head_x -= self.step_size
         if direction == enums.Direction.UP:
-            self.y[0] = self.y[0] - self.step_size
+            head_y -= self.step_size
         if direction == enums.Direction.DOWN:
-            self.y[0] = self.y[0] + self.step_size
+            head_y += self.step_size
 
         if isinstance(self.boundary, boundaries.PeriodicBoundary):
-            self.periodic_boundary_conditions()
+            head_x, head_y = self._wrap(head_x, head_y)
 
+        self.head_index = (self.head_index - 1) % self.capacity
+        self._body_x[self.head_index], self._body_y[self.head_index] = head_x, head_y
+        self._occupy(head_x, head_y)
         self.direction = direction
 
     def right_side_clear(self) -> bool:
         """Return True if the right side of the snake is clear."""
+        head_x, head_y = self.head
         if isinstance(self.boundary, boundaries.HardBoundary):
-            return self.x[0] != self.width
+            return head_x != self.width
         return not (
             self._periodic_obstruction_horizontal(
                 edge=self.width - self.step_size, x_obstruction=0
             )
-            or any(
-                a == (self.x[0] + self.step_size, self.y[0]) for a in self.coordinates
-            )
+            or self.occupies(head_x + self.step_size, head_y)
         )
 
     def left_side_clear(self) -> bool:
         """Return True if the left side of the snake is clear."""
+        head_x, head_y = self.head
         if isinstance(self.boundary, boundaries.HardBoundary):
-            return self.x[0] != 0
+            return head_x != 0
         return not (
             self._periodic_obstruction_horizontal(edge=0, x_obstruction=self.width)
-            or any(
-                a == (self.x[0] - self.step_size, self.y[0]) for a in self.coordinates
-            )
+            or self.occupies(head_x - self.step_size, head_y)
         )
 
     def bottom_side_clear(self) -> bool:
         """Return True if the top side of the snake is clear."""
+        head_x, head_y = self.head
         if isinstance(self.boundary, boundaries.HardBoundary):
-            return self.y[0] != self.height
+            return head_y != self.height
         return not (
             self._periodic_obstruction_vertical(
                 edge=0, y_obstruction=self.height - self.step_size
             )
-            or any(
-                a == (self.x[0], self.y[0] + self.step_size) for a in self.coordinates
-            )
+            or self.occupies(head_x, head_y + self.step_size)
         )
 
     def top_side_clear(self) -> bool:
         """Return True if the top side of the snake is clear."""
+        head_x, head_y = self.head
         if isinstance(self.boundary, boundaries.HardBoundary):
-            return self.y[0] != 0
+            return head_y != 0
         return not (
             self._periodic_obstruction_vertical(
                 edge=self.height - self.step_size, y_obstruction=0
             )
-            or any(
-                a == (self.x[0], self.y[0] - self.step_size) for a in self.coordinates
-            )
+            or self.occupies(head_x, head_y - self.step_size)
         )
 
     def _periodic_obstruction_horizontal(self, edge: int, x_obstruction: int) -> bool:
         """Check if any obstruction on horizontal axis due to periodic conditions."""
-        return self.x[0] == edge and any(
-            x == x_obstruction and y == self.y[0] for x, y in self.coordinates[1:]
-        )
+        head_x, head_y = self.head
+        return head_x == edge and self.occupies(x_obstruction, head_y)
 
     def _periodic_obstruction_vertical(self, edge: int, y_obstruction: int) -> bool:
         """Check if any obstruction on the vertical axis due to periodic conditions."""
-        return self.y[0] == edge and any(
-            x == self.x[0] and y == y_obstruction for x, y in self.coordinates[1:]
-        )
+        head_x, head_y = self.head
+        return head_y == edge and self.occupies(head_x, y_obstruction)
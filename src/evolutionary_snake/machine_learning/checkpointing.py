@@ -0,0 +1,370 @@
+"""Compact, incremental checkpoints of a NEAT population."""
+
+import collections.abc
+import concurrent.futures
+import itertools
+import json
+import logging
+import pathlib
+import random
+import types
+import typing
+import zipfile
+
+import neat
+import numpy as np
+import numpy.typing as npt
+
+ArraysType: typing.TypeAlias = dict[str, npt.NDArray[typing.Any]]  # noqa: UP040
+GenomesDictType: typing.TypeAlias = dict[int, neat.DefaultGenome]  # noqa: UP040
+
+FORMAT_VERSION = 1
+logger = logging.getLogger(__name__)
+
+
+class _PreviousCheckpoint(typing.NamedTuple):
+    """The path of the previous checkpoint and the keys of the genomes it has."""
+
+    path: pathlib.Path
+    keys: frozenset[int]
+
+
+class Checkpointer(neat.reporting.BaseReporter):  # type: ignore[misc]
+    """Reporter that saves the population at the end of every generation.
+
+    A checkpoint is a compressed NumPy archive that stores the genes of the genomes
+    column by column, with the species and the state of the random number generator
+    as JSON. Only every full_snapshot_interval-th checkpoint stores all genomes, the
+    checkpoints in between only store the genomes that are new since the previous
+    checkpoint and refer to it for the others.
+
+    The columns are collected on the training thread, compressing and writing them
+    to disk happens on a background thread while the next generation is evaluated.
+    Close the checkpointer, or use it as a context manager, to wait for the last
+    checkpoint to be written.
+    """
+
+    def __init__(
+        self, filename_prefix: pathlib.Path, full_snapshot_interval: int = 10
+    ) -> None:
+        """Initialize the checkpointer."""
+        self.filename_prefix = pathlib.Path(filename_prefix)
+        self.full_snapshot_interval = full_snapshot_interval
+        self.current_generation = 0
+        self.n_checkpoints = 0
+        self._previous: _PreviousCheckpoint | None = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpointer"
+        )
+        self._pending: concurrent.futures.Future[None] | None = None
+
+    def start_generation(self, generation: int) -> None:
+        """Keep track of the current generation."""
+        self.current_generation = generation
+
+    def end_generation(
+        self,
+        config: neat.Config,
+        population: GenomesDictType,
+        species_set: neat.DefaultSpeciesSet,
+    ) -> None:
+        """Save a checkpoint of the population of the next generation."""
+        del config
+        self.save_checkpoint(population, species_set, self.current_generation)
+
+    def save_checkpoint(
+        self,
+        population: GenomesDictType,
+        species_set: neat.DefaultSpeciesSet,
+        generation: int,
+    ) -> pathlib.Path:
+        """Save a checkpoint and return its path, the file is written in the back."""
+        previous = (
+            None
+            if self.n_checkpoints % self.full_snapshot_interval == 0
+            else self._previous
+        )
+        genomes = [
+            genome
+            for key, genome in population.items()
+            if previous is None or key not in previous.keys
+        ]
+        arrays = _genome_columns(genomes)
+        arrays["genome_key"] = np.fromiter(population, dtype=np.int64)
+        arrays["genome_fitness"] = np.array(
+            [
+                np.nan if genome.fitness is None else genome.fitness
+                for genome in population.values()
+            ],
+            dtype=np.float64,
+        )
+        metadata = {
+            "format_version": FORMAT_VERSION,
+            "generation": generation,
+            "previous": None if previous is None else previous.path.name,
+            "species": [
+                {
+                    "key": species.key,
+                    "created": species.created,
+                    "last_improved": species.last_improved,
+                    "representative": species.representative.key,
+                    "members": list(species.members),
+                    "fitness": species.fitness,
+                    "adjusted_fitness": species.adjusted_fitness,
+                    "fitness_history": species.fitness_history,
+                }
+                for species in species_set.species.values()
+            ],
+            "random_state": random.getstate(),
+        }
+        arrays["metadata"] = np.array(json.dumps(metadata))
+
+        path = pathlib.Path(f"{self.filename_prefix.as_posix()}{generation}")
+        msg = f"Saving checkpoint to {path}"
+        logger.info(msg)
+        self.wait()
+        self._pending = self._executor.submit(_write_checkpoint, path, arrays)
+        self._previous = _PreviousCheckpoint(path=path, keys=frozenset(population))
+        self.n_checkpoints += 1
+        return path
+
+    def wait(self) -> None:
+        """Wait until the last checkpoint is written, raising its error if any."""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def close(self) -> None:
+        """Wait for the last checkpoint and stop the background thread."""
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown()
+
+    def __getstate__(self) -> dict[str, typing.Any]:
+        """Leave out the background thread, neat pickles reporters with species."""
+        state = self.__dict__.copy()
+        del state["_executor"], state["_pending"]
+        return state
+
+    def __setstate__(self, state: dict[str, typing.Any]) -> None:
+        """Restore the checkpointer with a new background thread."""
+        self.__dict__.update(state)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpointer"
+        )
+        self._pending = None
+
+    def __enter__(self) -> typing.Self:
+        """Return the checkpointer itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Close the checkpointer."""
+        del exc_type, exc_value, traceback
+        self.close()
+
+
+def load_genomes(path_checkpoint: pathlib.Path) -> GenomesDictType:
+    """Load the genomes of a checkpoint, including their fitness.
+
+    Checkpoints written by neat.Checkpointer can be loaded as well.
+    """
+    path_checkpoint = pathlib.Path(path_checkpoint)
+    if not zipfile.is_zipfile(path_checkpoint):
+        population: GenomesDictType = neat.Checkpointer.restore_checkpoint(
+            path_checkpoint
+        ).population
+        return population
+    metadata, arrays = _read_checkpoint(path_checkpoint)
+    return _load_genomes(path_checkpoint, metadata, arrays)
+
+
+def restore_checkpoint(
+    path_checkpoint: pathlib.Path, neat_config: neat.Config
+) -> neat.Population:
+    """Restore a population from a checkpoint to resume training.
+
+    Like neat.Checkpointer.restore_checkpoint, this also restores the state of the
+    random number generator. Checkpoints written by neat.Checkpointer can be
+    restored as well.
+    """
+    path_checkpoint = pathlib.Path(path_checkpoint)
+    if not zipfile.is_zipfile(path_checkpoint):
+        return neat.Checkpointer.restore_checkpoint(path_checkpoint)
+    metadata, arrays = _read_checkpoint(path_checkpoint)
+    genomes = _load_genomes(path_checkpoint, metadata, arrays)
+
+    species_set = neat_config.species_set_type(
+        neat_config.species_set_config, neat.reporting.ReporterSet()
+    )
+    population = neat.Population(
+        neat_config, (genomes, species_set, metadata["generation"])
+    )
+    species_set.reporters = population.reporters
+    for species_item in metadata["species"]:
+        species = neat.species.Species(species_item["key"], species_item["created"])
+        species.last_improved = species_item["last_improved"]
+        species.representative = genomes[species_item["representative"]]
+        species.members = {key: genomes[key] for key in species_item["members"]}
+        species.fitness = species_item["fitness"]
+        species.adjusted_fitness = species_item["adjusted_fitness"]
+        species.fitness_history = species_item["fitness_history"]
+        species_set.species[species.key] = species
+        species_set.genome_to_species.update(
+            dict.fromkeys(species.members, species.key)
+        )
+    species_set.indexer = itertools.count(max(species_set.species, default=0) + 1)
+
+    # new genomes should not reuse the keys of the restored genomes
+    population.reproduction.genome_indexer = itertools.count(max(genomes) + 1)
+    version, state, gauss_next = metadata["random_state"]
+    random.setstate((version, tuple(state), gauss_next))
+    return population
+
+
+def _genome_columns(
+    genomes: collections.abc.Iterable[neat.DefaultGenome],
+) -> ArraysType:
+    """Return the genes of the genomes as columns of NumPy arrays.
+
+    Activation and aggregation functions are stored as an index into the list of
+    their names.
+    """
+    genes_key: list[int] = []
+    node_columns: list[tuple[int, int, float, float, int, int]] = []
+    connection_columns: list[tuple[int, int, int, float, bool]] = []
+    activations: dict[str, int] = {}
+    aggregations: dict[str, int] = {}
+    for genome in genomes:
+        genes_key.append(genome.key)
+        node_columns.extend(
+            (
+                genome.key,
+                node.key,
+                node.bias,
+                node.response,
+                activations.setdefault(node.activation, len(activations)),
+                aggregations.setdefault(node.aggregation, len(aggregations)),
+            )
+            for node in genome.nodes.values()
+        )
+        connection_columns.extend(
+            (genome.key, *connection.key, connection.weight, connection.enabled)
+            for connection in genome.connections.values()
+        )
+    nodes = list(zip(*node_columns, strict=True)) or [()] * 6
+    connections = list(zip(*connection_columns, strict=True)) or [()] * 5
+    return {
+        "genes_key": np.array(genes_key, dtype=np.int64),
+        "node_genome": np.array(nodes[0], dtype=np.int64),
+        "node_key": np.array(nodes[1], dtype=np.int64),
+        "node_bias": np.array(nodes[2], dtype=np.float64),
+        "node_response": np.array(nodes[3], dtype=np.float64),
+        "node_activation": np.array(nodes[4], dtype=np.int16),
+        "node_aggregation": np.array(nodes[5], dtype=np.int16),
+        "activation_names": np.array(list(activations), dtype=np.str_),
+        "aggregation_names": np.array(list(aggregations), dtype=np.str_),
+        "connection_genome": np.array(connections[0], dtype=np.int64),
+        "connection_input": np.array(connections[1], dtype=np.int64),
+        "connection_output": np.array(connections[2], dtype=np.int64),
+        "connection_weight": np.array(connections[3], dtype=np.float64),
+        "connection_enabled": np.array(connections[4], dtype=np.bool_),
+    }
+
+
+def _genomes_from_columns(arrays: ArraysType, keys: set[int]) -> GenomesDictType:
+    """Create the genomes with the given keys from the columns of a checkpoint."""
+    genomes = {
+        key: neat.DefaultGenome(key)
+        for key in arrays["genes_key"].tolist()
+        if key in keys
+    }
+    _add_nodes(genomes, arrays)
+    _add_connections(genomes, arrays)
+    return genomes
+
+
+def _add_nodes(genomes: GenomesDictType, arrays: ArraysType) -> None:
+    """Add the nodes in the columns of a checkpoint to the genomes they belong to."""
+    activation_names = arrays["activation_names"].tolist()
+    aggregation_names = arrays["aggregation_names"].tolist()
+    for genome_key, key, bias, response, activation, aggregation in zip(
+        arrays["node_genome"].tolist(),
+        arrays["node_key"].tolist(),
+        arrays["node_bias"].tolist(),
+        arrays["node_response"].tolist(),
+        arrays["node_activation"].tolist(),
+        arrays["node_aggregation"].tolist(),
+        strict=True,
+    ):
+        if genome_key in genomes:
+            node = neat.genes.DefaultNodeGene(key)
+            node.bias, node.response = bias, response
+            node.activation = activation_names[activation]
+            node.aggregation = aggregation_names[aggregation]
+            genomes[genome_key].nodes[key] = node
+
+
+def _add_connections(genomes: GenomesDictType, arrays: ArraysType) -> None:
+    """Add the connections in the columns of a checkpoint to their genomes."""
+    for genome_key, input_key, output_key, weight, enabled in zip(
+        arrays["connection_genome"].tolist(),
+        arrays["connection_input"].tolist(),
+        arrays["connection_output"].tolist(),
+        arrays["connection_weight"].tolist(),
+        arrays["connection_enabled"].tolist(),
+        strict=True,
+    ):
+        if genome_key in genomes:
+            connection = neat.genes.DefaultConnectionGene((input_key, output_key))
+            connection.weight, connection.enabled = weight, enabled
+            genomes[genome_key].connections[input_key, output_key] = connection
+
+
+def _load_genomes(
+    path_checkpoint: pathlib.Path, metadata: dict[str, typing.Any], arrays: ArraysType
+) -> GenomesDictType:
+    """Load the genomes of a checkpoint, following the checkpoints it refers to."""
+    keys = arrays["genome_key"].tolist()
+    fitnesses = arrays["genome_fitness"].tolist()
+    genomes: GenomesDictType = {}
+    missing = set(keys)
+    path = path_checkpoint
+    while True:
+        genomes.update(_genomes_from_columns(arrays, missing))
+        missing.difference_update(genomes)
+        if not missing:
+            break
+        if metadata["previous"] is None:
+            msg = f"Checkpoint {path_checkpoint} misses genomes {sorted(missing)}."
+            raise ValueError(msg)
+        path = path.parent / metadata["previous"]
+        metadata, arrays = _read_checkpoint(path)
+
+    for key, fitness in zip(keys, fitnesses, strict=True):
+        genomes[key].fitness = None if np.isnan(fitness) else fitness
+    return {key: genomes[key] for key in keys}
+
+
+def _read_checkpoint(
+    path_checkpoint: pathlib.Path,
+) -> tuple[dict[str, typing.Any], ArraysType]:
+    """Read the metadata and the arrays of a checkpoint."""
+    with np.load(path_checkpoint, allow_pickle=False) as checkpoint:
+        arrays = {name: checkpoint[name] for name in checkpoint.files}
+    metadata: dict[str, typing.Any] = json.loads(str(arrays.pop("metadata")))
+    return metadata, arrays
+
+
+def _write_checkpoint(path_checkpoint: pathlib.Path, arrays: ArraysType) -> None:
+    """Write a checkpoint, a partially written file never replaces a checkpoint."""
+    path_temporary = path_checkpoint.with_name(f"{path_checkpoint.name}.tmp")
+    with path_temporary.open("wb") as file:
+        np.savez_compressed(file, **arrays)  # type: ignore[arg-type]
+    path_temporary.replace(path_checkpoint)
@@ -0,0 +1,280 @@
+"""Feed-forward network of a NEAT genome compiled to flat arrays."""
+
+import collections.abc
+import dataclasses
+import functools
+import typing
+
+import neat
+import numpy as np
+import numpy.typing as npt
+
+FloatArray: typing.TypeAlias = npt.NDArray[np.float64]  # noqa: UP040
+IntArray: typing.TypeAlias = npt.NDArray[np.int64]  # noqa: UP040
+
+# Vectorized versions of the built-in activation functions of neat-python.
+ACTIVATION_FUNCTIONS: dict[str, collections.abc.Callable[[FloatArray], FloatArray]] = {
+    "sigmoid": lambda z: 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0))),
+    "tanh": lambda z: np.tanh(np.clip(2.5 * z, -60.0, 60.0)),
+    "sin": lambda z: np.sin(np.clip(5.0 * z, -60.0, 60.0)),
+    "gauss": lambda z: np.exp(-5.0 * np.clip(z, -3.4, 3.4) ** 2),
+    "relu": lambda z: np.where(z > 0.0, z, 0.0),
+    "softplus": lambda z: 0.2 * np.log(1.0 + np.exp(np.clip(5.0 * z, -60.0, 60.0))),
+    "identity": lambda z: z,
+    "clamped": lambda z: np.clip(z, -1.0, 1.0),
+    "exp": lambda z: np.exp(np.clip(z, -60.0, 60.0)),
+    "abs": np.abs,
+    "hat": lambda z: np.maximum(0.0, 1.0 - np.abs(z)),
+    "square": lambda z: z**2,
+    "cube": lambda z: z**3,
+}
+SUPPORTED_AGGREGATIONS = frozenset({"sum"})
+
+
+class CompiledNode(typing.NamedTuple):
+    """A node that sums its weighted sources before applying its activation."""
+
+    node_index: int
+    activation: str
+    bias: float
+    response: float
+    sources: tuple[int, ...]
+    weights: tuple[float, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class CompiledLayer:
+    """A layer of nodes that only depend on the nodes numbered before them.
+
+    The layer computes the values of the nodes start up to stop, the weights hold
+    one row per node of the layer and one column per node before the layer. The
+    activations map the name of an activation function to the positions of the
+    nodes in the layer that use it.
+    """
+
+    start: int
+    stop: int
+    weights: FloatArray
+    bias: FloatArray
+    response: FloatArray
+    activations: tuple[tuple[str, IntArray], ...]
+
+
+class CompiledNetwork:
+    """Feed-forward network of a NEAT genome compiled to flat arrays.
+
+    Nodes are numbered with the inputs first, followed by the evaluated nodes in
+    topological order, so every layer reads the nodes before it and writes one
+    contiguous block of node values.
+
+    A single input vector is evaluated node by node from the flat sources and
+    weights of the nodes, which sums in the same order as neat.nn.FeedForwardNetwork
+    and gives exactly its result, but is not faster. A batch of input vectors is
+    evaluated layer by layer with NumPy, which gives the same result up to floating
+    point rounding. For a single input vector, the NumPy calls cost more than the
+    few nodes they evaluate.
+    """
+
+    def __init__(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        *,
+        n_inputs: int,
+        n_nodes: int,
+        output_indices: list[int],
+        nodes: collections.abc.Sequence[CompiledNode],
+        layers: collections.abc.Sequence[CompiledLayer],
+        activation_defs: dict[str, collections.abc.Callable[[float], float]],
+    ) -> None:
+        """Initialize the compiled network."""
+        self.n_inputs = n_inputs
+        self.n_nodes = n_nodes
+        self.output_indices = output_indices
+        self.nodes = tuple(nodes)
+        self.layers = tuple(layers)
+        self.activation_defs = activation_defs
+
+    @classmethod
+    def create(
+        cls, genome: neat.DefaultGenome, config: neat.Config
+    ) -> "CompiledNetwork":
+        """Compile a genome into a network, like neat.nn.FeedForwardNetwork.create."""
+        genome_config = config.genome_config
+        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+        node_layers = neat.graphs.feed_forward_layers(
+            genome_config.input_keys, genome_config.output_keys, connections
+        )
+
+        # nodes that are never evaluated, like unconnected outputs, read the last
+        # node value, which always stays zero
+        node_indices = {key: i for i, key in enumerate(genome_config.input_keys)}
+        for node_layer in node_layers:
+            for key in sorted(node_layer):
+                node_indices[key] = len(node_indices)
+        n_nodes = len(node_indices) + 1
+
+        nodes: list[CompiledNode] = []
+        layers: list[CompiledLayer] = []
+        start = len(genome_config.input_keys)
+        for node_layer in node_layers:
+            layer_nodes = _compile_nodes(
+                genome, sorted(node_layer), connections, node_indices
+            )
+            nodes.extend(layer_nodes)
+            layers.append(_create_layer(start=start, layer_nodes=layer_nodes))
+            start += len(layer_nodes)
+        activation_defs = {
+            node.activation: genome_config.activation_defs.get(node.activation)
+            for node in nodes
+        }
+
+        return cls(
+            n_inputs=len(genome_config.input_keys),
+            n_nodes=n_nodes,
+            output_indices=[
+                node_indices.get(key, n_nodes - 1) for key in genome_config.output_keys
+            ],
+            nodes=nodes,
+            layers=layers,
+            activation_defs=activation_defs,
+        )
+
+    def activate(self, inputs: collections.abc.Sequence[float]) -> list[float]:
+        """Return the outputs of the network for a single input vector."""
+        if len(inputs) != self.n_inputs:
+            msg = f"Expected {self.n_inputs} inputs, got {len(inputs)}"
+            raise RuntimeError(msg)
+        values = [0.0] * self.n_nodes
+        values[: self.n_inputs] = inputs
+        for (
+            node_index,
+            activation,
+            bias,
+            response,
+            sources,
+            weights,
+        ) in self._scalar_nodes:
+            values[node_index] = activation(
+                bias
+                + response
+                * sum(
+                    values[source] * weight
+                    for source, weight in zip(sources, weights, strict=True)
+                )
+            )
+        return [values[index] for index in self.output_indices]
+
+    def activate_many(self, inputs: npt.ArrayLike) -> FloatArray:
+        """Return the outputs of the network for a batch of input vectors.
+
+        The inputs hold one input vector per row, the outputs one row per input.
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if inputs.ndim != 2 or inputs.shape[1] != self.n_inputs:  # noqa: PLR2004
+            msg = f"Expected inputs of shape (N, {self.n_inputs}), got {inputs.shape}"
+            raise RuntimeError(msg)
+        values = np.zeros((inputs.shape[0], self.n_nodes), dtype=np.float64)
+        values[:, : self.n_inputs] = inputs
+        for layer in self.layers:
+            z = layer.bias + layer.response * (
+                values[:, : layer.start] @ layer.weights.T
+            )
+            if len(layer.activations) == 1:
+                name, _ = layer.activations[0]
+                values[:, layer.start : layer.stop] = ACTIVATION_FUNCTIONS[name](z)
+                continue
+            for name, positions in layer.activations:
+                values[:, layer.start + positions] = ACTIVATION_FUNCTIONS[name](
+                    z[:, positions]
+                )
+        return values[:, self.output_indices]
+
+    @functools.cached_property
+    def _scalar_nodes(
+        self,
+    ) -> tuple[
+        tuple[
+            int,
+            collections.abc.Callable[[float], float],
+            float,
+            float,
+            tuple[int, ...],
+            tuple[float, ...],
+        ],
+        ...,
+    ]:
+        """Return the nodes with their activation function, for a single input."""
+        return tuple(
+            (
+                node.node_index,
+                self.activation_defs[node.activation],
+                node.bias,
+                node.response,
+                node.sources,
+                node.weights,
+            )
+            for node in self.nodes
+        )
+
+    def __getstate__(self) -> dict[str, typing.Any]:
+        """Leave out the nodes with their activation, they are collected again."""
+        state = self.__dict__.copy()
+        state.pop("_scalar_nodes", None)
+        return state
+
+
+def _compile_nodes(
+    genome: neat.DefaultGenome,
+    keys: list[int],
+    connections: list[tuple[int, int]],
+    node_indices: dict[int, int],
+) -> list[CompiledNode]:
+    """Compile the nodes of the given keys with the weights of their connections."""
+    links: dict[int, list[tuple[int, float]]] = {key: [] for key in keys}
+    for input_key, output_key in connections:
+        if output_key in links:
+            links[output_key].append(
+                (
+                    node_indices[input_key],
+                    genome.connections[input_key, output_key].weight,
+                )
+            )
+    layer_nodes = []
+    for key in keys:
+        node_gene = genome.nodes[key]
+        if node_gene.aggregation not in SUPPORTED_AGGREGATIONS:
+            msg = f"Aggregation {node_gene.aggregation} is not supported."
+            raise NotImplementedError(msg)
+        if node_gene.activation not in ACTIVATION_FUNCTIONS:
+            msg = f"Activation {node_gene.activation} is not supported."
+            raise NotImplementedError(msg)
+        layer_nodes.append(
+            CompiledNode(
+                node_index=node_indices[key],
+                activation=node_gene.activation,
+                bias=node_gene.bias,
+                response=node_gene.response,
+                sources=tuple(source for source, _ in links[key]),
+                weights=tuple(weight for _, weight in links[key]),
+            )
+        )
+    return layer_nodes
+
+
+def _create_layer(start: int, layer_nodes: list[CompiledNode]) -> CompiledLayer:
+    """Create a layer of nodes whose values start at the given node index."""
+    weights = np.zeros((len(layer_nodes), start), dtype=np.float64)
+    activations: dict[str, list[int]] = {}
+    for position, node in enumerate(layer_nodes):
+        weights[position, list(node.sources)] = node.weights
+        activations.setdefault(node.activation, []).append(position)
+    return CompiledLayer(
+        start=start,
+        stop=start + len(layer_nodes),
+        weights=weights,
+        bias=np.array([node.bias for node in layer_nodes], dtype=np.float64),
+        response=np.array([node.response for node in layer_nodes], dtype=np.float64),
+        activations=tuple(
+            (name, np.array(positions, dtype=np.int64))
+            for name, positions in activations.items()
+        ),
+    )
@@ -0,0 +1,56 @@
+"""Names of the network inputs that every feature writes."""
+
+import collections.abc
+
+from evolutionary_snake.utils import enums
+
+DEFAULT_FEATURES = (enums.Feature.APPLE_DIRECTION, enums.Feature.CLEAR_SIDES)
+RAY_DIRECTIONS: dict[str, tuple[int, int]] = {
+    "right": (1, 0),
+    "left": (-1, 0),
+    "up": (0, -1),
+    "down": (0, 1),
+    "up_right": (1, -1),
+    "up_left": (-1, -1),
+    "down_right": (1, 1),
+    "down_left": (-1, 1),
+}
+RAY_TARGETS = ("wall", "body", "apple")
+FEATURE_NAMES: dict[enums.Feature, tuple[str, ...]] = {
+    enums.Feature.APPLE_DIRECTION: (
+        "Apple_left",
+        "Apple_right",
+        "Apple_up",
+        "Apple_down",
+    ),
+    enums.Feature.CLEAR_SIDES: (
+        "Right_clear",
+        "Left_clear",
+        "Bottom_clear",
+        "Up_clear",
+    ),
+    enums.Feature.RAY_DISTANCES: tuple(
+        f"Ray_{direction}_{target}"
+        for direction in RAY_DIRECTIONS
+        for target in RAY_TARGETS
+    ),
+    enums.Feature.REACHABLE_AREA: ("Reachable_area",),
+    enums.Feature.TAIL_DIRECTION: (
+        "Tail_right",
+        "Tail_left",
+        "Tail_up",
+        "Tail_down",
+    ),
+}
+
+
+def input_names(features: collections.abc.Iterable[enums.Feature]) -> list[str]:
+    """Return the names of the network inputs of the features, in input order."""
+    return [name for feature in features for name in FEATURE_NAMES[feature]]
+
+
+def input_node_names(
+    features: collections.abc.Iterable[enums.Feature],
+) -> dict[int, str]:
+    """Return the names of the input nodes, keyed like the neat input node keys."""
+    return {-index: name for index, name in enumerate(input_names(features), 1)}
@@ -0,0 +1,241 @@
+"""Pluggable extraction of the features the network of the AI game mode senses.
+
+Every feature writes its values into a slice of a buffer that is allocated once per
+game, so sensing a step allocates nothing. The names of the values of every feature
+are defined in feature_names, which the settings use to name the input nodes.
+"""
+
+import abc
+import collections.abc
+
+from evolutionary_snake import game_objects
+from evolutionary_snake.machine_learning import feature_names
+from evolutionary_snake.utils import enums
+
+
+class FeatureExtractor(abc.ABC):
+    """Base extractor of a feature, writing its values into a buffer."""
+
+    feature: enums.Feature
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Return the names of the values of the feature."""
+        return feature_names.FEATURE_NAMES[self.feature]
+
+    @abc.abstractmethod
+    def write(
+        self,
+        buffer: list[float],
+        offset: int,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+    ) -> None:
+        """Write the values of the feature into the buffer, starting at the offset."""
+
+
+class AppleDirection(FeatureExtractor):
+    """Whether the apple lies to the left, right, top or bottom of the head."""
+
+    feature = enums.Feature.APPLE_DIRECTION
+
+    def write(
+        self,
+        buffer: list[float],
+        offset: int,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+    ) -> None:
+        """Write the direction of the apple as seen from the head."""
+        head_x, head_y = snake.head
+        buffer[offset] = apple.x < head_x
+        buffer[offset + 1] = apple.x > head_x
+        buffer[offset + 2] = apple.y > head_y
+        buffer[offset + 3] = apple.y < head_y
+
+
+class ClearSides(FeatureExtractor):
+    """Whether the cells to the right, left, bottom and top of the head are clear."""
+
+    feature = enums.Feature.CLEAR_SIDES
+
+    def write(
+        self,
+        buffer: list[float],
+        offset: int,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+    ) -> None:
+        """Write whether the sides of the head are clear."""
+        del apple
+        buffer[offset] = snake.right_side_clear()
+        buffer[offset + 1] = snake.left_side_clear()
+        buffer[offset + 2] = snake.bottom_side_clear()
+        buffer[offset + 3] = snake.top_side_clear()
+
+
+class RayDistances(FeatureExtractor):
+    """Distances from the head to the wall, the body and the apple in 8 directions.
+
+    A distance of k cells is sensed as 1 / k, so near objects give strong inputs and
+    objects that are not on a ray give 0. Rays stop at the edge of the board, also on
+    periodic boards. The body is found on the line bitboards of the snake, so a ray
+    costs the same however long it is.
+    """
+
+    feature = enums.Feature.RAY_DISTANCES
+
+    def write(
+        self,
+        buffer: list[float],
+        offset: int,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+    ) -> None:
+        """Write the wall, body and apple distances of every ray."""
+        head_x, head_y = snake.head
+        if not snake.geometry.on_board(head_x, head_y):
+            buffer[offset : offset + len(self.names)] = [0.0] * len(self.names)
+            return
+        column, row = head_x // snake.step_size, head_y // snake.step_size
+        apple_column = apple.x // snake.step_size - column
+        apple_row = apple.y // snake.step_size - row
+        for d_column, d_row in feature_names.RAY_DIRECTIONS.values():
+            wall = min(
+                _cells_to_edge(column, d_column, snake.n_columns),
+                _cells_to_edge(row, d_row, snake.n_rows),
+            )
+            body = snake.body_distance(d_column, d_row)
+            buffer[offset] = 1 / wall
+            buffer[offset + 1] = 1 / body if body else 0.0
+            buffer[offset + 2] = _apple_distance(
+                apple_column, apple_row, d_column, d_row
+            )
+            offset += len(feature_names.RAY_TARGETS)
+
+
+def _apple_distance(
+    apple_column: int, apple_row: int, d_column: int, d_row: int
+) -> float:
+    """Return the sensed distance to an apple relative to the head, 0 off the ray."""
+    apple_steps = apple_column * d_column or apple_row * d_row
+    if (
+        apple_steps > 0
+        and apple_column == apple_steps * d_column
+        and apple_row == apple_steps * d_row
+    ):
+        return 1 / apple_steps
+    return 0.0
+
+
+def _cells_to_edge(position: int, step: int, size: int) -> int:
+    """Return the number of steps from a position until it leaves the board."""
+    if step > 0:
+        return size - position
+    if step < 0:
+        return position + 1
+    return size + 1
+
+
+class ReachableArea(FeatureExtractor):
+    """Fraction of the board the head can still reach without crossing the body."""
+
+    feature = enums.Feature.REACHABLE_AREA
+
+    def write(
+        self,
+        buffer: list[float],
+        offset: int,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+    ) -> None:
+        """Write the number of free cells reachable from the head, per cell."""
+        del apple
+        buffer[offset] = snake.reachable_area() / snake.capacity
+
+
+class TailDirection(FeatureExtractor):
+    """The direction the tail moves in, as one of four one-hot values.
+
+    All values are 0 while the tail is not on the board yet.
+    """
+
+    feature = enums.Feature.TAIL_DIRECTION
+
+    def write(
+        self,
+        buffer: list[float],
+        offset: int,
+        snake: game_objects.Snake,
+        apple: game_objects.Apple,
+    ) -> None:
+        """Write the direction from the tail to the segment in front of it."""
+        del apple
+        for index in range(offset, offset + len(self.names)):
+            buffer[index] = 0.0
+        if snake.length < 2:  # noqa: PLR2004
+            return
+        tail_x, tail_y = snake.segment(snake.length - 1)
+        front_x, front_y = snake.segment(snake.length - 2)
+        if not (
+            snake.geometry.on_board(tail_x, tail_y)
+            and snake.geometry.on_board(front_x, front_y)
+        ):
+            return
+        # modular differences also find the direction of a tail wrapping the board
+        d_x = (front_x - tail_x) % snake.width
+        d_y = (front_y - tail_y) % snake.height
+        if d_x == snake.step_size:
+            buffer[offset] = 1.0
+        elif d_x == snake.width - snake.step_size:
+            buffer[offset + 1] = 1.0
+        elif d_y == snake.height - snake.step_size:
+            buffer[offset + 2] = 1.0
+        else:
+            buffer[offset + 3] = 1.0
+
+
+FEATURE_EXTRACTORS: dict[enums.Feature, type[FeatureExtractor]] = {
+    enums.Feature.APPLE_DIRECTION: AppleDirection,
+    enums.Feature.CLEAR_SIDES: ClearSides,
+    enums.Feature.RAY_DISTANCES: RayDistances,
+    enums.Feature.REACHABLE_AREA: ReachableArea,
+    enums.Feature.TAIL_DIRECTION: TailDirection,
+}
+
+
+class FeaturePipeline:
+    """Pipeline of feature extractors writing into one preallocated buffer.
+
+    The buffer holds the values of all features in the order of the features, which
+    is the order of the input nodes of the network. It is allocated once and
+    overwritten on every step, so it is handed to the network as it is.
+    """
+
+    def __init__(self, features: collections.abc.Iterable[enums.Feature]) -> None:
+        """Initialize the extractors of the features and their buffer."""
+        self.extractors = [FEATURE_EXTRACTORS[feature]() for feature in features]
+        self.offsets: list[int] = []
+        size = 0
+        for extractor in self.extractors:
+            self.offsets.append(size)
+            size += len(extractor.names)
+        self.buffer = [0.0] * size
+
+    @property
+    def names(self) -> list[str]:
+        """Return the names of the values in the buffer."""
+        return [name for extractor in self.extractors for name in extractor.names]
+
+    @property
+    def size(self) -> int:
+        """Return the number of values in the buffer."""
+        return len(self.buffer)
+
+    def compute(
+        self, snake: game_objects.Snake, apple: game_objects.Apple
+    ) -> list[float]:
+        """Write the features of the game into the buffer and return it."""
+        for extractor, offset in zip(self.extractors, self.offsets, strict=True):
+            extractor.write(self.buffer, offset, snake, apple)
+        return self.buffer
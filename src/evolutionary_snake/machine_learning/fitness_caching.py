@@ -0,0 +1,129 @@
+"""Cache of the fitness of genomes under the conditions they were evaluated in."""
+
+import collections
+import hashlib
+import json
+import logging
+import pathlib
+
+import neat
+
+from evolutionary_snake import settings
+from evolutionary_snake.machine_learning import fitness_evaluation
+
+logger = logging.getLogger(__name__)
+
+# The training settings the games of a genome depend on, the seeds of the episodes
+# are taken from the episode plan instead. Pruning is left out, because only the
+# fitness of genomes that played all episodes is cached.
+FITNESS_SETTINGS = {
+    "step_limit",
+    "episodes",
+    "fitness_aggregation",
+    "fitness_quantile",
+    "features",
+    "reachable_area_score",
+    "detect_loops",
+    "loop_penalty",
+}
+
+
+def _hash(data: object) -> str:
+    """Return the hash of JSON serializable data, independent of the key order."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def genome_hash(genome: neat.DefaultGenome) -> str:
+    """Return the hash of the genes the network of a genome is created from.
+
+    Disabled connections are left out, so genomes that only differ in them, and
+    therefore play the same, have the same hash.
+    """
+    return _hash(
+        {
+            "nodes": sorted(
+                [node.key, node.bias, node.response, node.activation, node.aggregation]
+                for node in genome.nodes.values()
+            ),
+            "connections": sorted(
+                [*connection.key, connection.weight]
+                for connection in genome.connections.values()
+                if connection.enabled
+            ),
+        }
+    )
+
+
+def conditions_hash(
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan,
+) -> str:
+    """Return the hash of the settings and episodes a genome is evaluated on.
+
+    The elite fitness is left out, so an elite hits the fitness it scored as an
+    offspring that was pruned on the elites before it.
+    """
+    return _hash(
+        {
+            "settings": training_settings.model_dump(
+                mode="json", include=FITNESS_SETTINGS
+            ),
+            "seeds": episode_plan.seeds,
+        }
+    )
+
+
+class FitnessCache(neat.reporting.BaseReporter):  # type: ignore[misc]
+    """Reporter that caches the fitness of genomes, evicting the least recently used.
+
+    A fitness is cached by the hash of the genome and the hash of the conditions it
+    was evaluated in. Elites only hit the fitness of the previous generation when
+    every generation plays the same episodes. When a path is given, the cache is
+    read from it when it exists and written to it after every generation, so a
+    resumed run with the same seed does not evaluate the genomes of the interrupted
+    run again.
+    """
+
+    def __init__(self, max_size: int, path_cache: pathlib.Path | None = None) -> None:
+        """Initialize the fitness cache, reading it from the path when it exists."""
+        self.max_size = max_size
+        self.path_cache = path_cache
+        self.entries: collections.OrderedDict[str, float] = collections.OrderedDict()
+        if path_cache is not None and path_cache.exists():
+            for key, fitness in json.loads(path_cache.read_text(encoding="utf-8")):
+                self.put(key, fitness)
+            msg = f"Read {len(self.entries)} cached fitnesses from {path_cache}"
+            logger.info(msg)
+
+    @staticmethod
+    def key(genome: neat.DefaultGenome, conditions: str) -> str:
+        """Return the key of the fitness of a genome under the given conditions."""
+        return f"{genome_hash(genome)}-{conditions}"
+
+    def get(self, key: str) -> float | None:
+        """Return the cached fitness of a key, or None when it is not cached."""
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: str, fitness: float) -> None:
+        """Cache the fitness of a key, evicting the least recently used fitness."""
+        self.entries[key] = fitness
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def post_evaluate(
+        self,
+        config: neat.Config,
+        population: dict[int, neat.DefaultGenome],
+        species: neat.DefaultSpeciesSet,
+        best_genome: neat.DefaultGenome,
+    ) -> None:
+        """Write the cache to its path, least recently used first."""
+        del config, population, species, best_genome
+        if self.path_cache is not None:
+            self.path_cache.write_text(
+                json.dumps(list(self.entries.items())), encoding="utf-8"
+            )
@@ -0,0 +1,104 @@
+"""Multi-episode fitness evaluation with a shared seed schedule."""
+
+import collections.abc
+import math
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+from evolutionary_snake import settings
+from evolutionary_snake.utils import enums
+
+FloatArray: typing.TypeAlias = npt.NDArray[np.float64]  # noqa: UP040
+
+AggregationFunctionsDict: dict[
+    enums.FitnessAggregation, collections.abc.Callable[[FloatArray, float], FloatArray]
+] = {
+    enums.FitnessAggregation.MEAN: lambda fitnesses, _: np.mean(fitnesses, axis=0),
+    enums.FitnessAggregation.MIN: lambda fitnesses, _: np.min(fitnesses, axis=0),
+    enums.FitnessAggregation.QUANTILE: lambda fitnesses, quantile: np.quantile(
+        fitnesses, quantile, axis=0
+    ),
+}
+# The quantile an aggregation takes of the episodes. The mean has no such quantile,
+# so its outcome cannot be bounded before every episode has been played.
+AggregationQuantilesDict: dict[enums.FitnessAggregation, float | None] = {
+    enums.FitnessAggregation.MEAN: None,
+    enums.FitnessAggregation.MIN: 0.0,
+}
+
+
+class EpisodePlan(typing.NamedTuple):
+    """The episodes every genome of a generation plays.
+
+    All genomes play the episodes with the same seeds, so they are compared on the
+    same games. Episodes of a genome stop early once it can no longer beat the
+    elite fitness, the fitness an elite scored on the same episodes, which is None
+    when episodes should never stop early.
+    """
+
+    seeds: tuple[int | None, ...]
+    elite_fitness: float | None = None
+
+
+def episode_seeds(
+    seed: int | None, generation: int, episodes: int
+) -> tuple[int | None, ...]:
+    """Return the seeds of the episodes of a generation.
+
+    The seeds are derived from the seed of the training run and the generation, so
+    a run with the same seed plays the same games. Without a seed every episode is
+    a random game.
+    """
+    if seed is None:
+        return (None,) * episodes
+    seed_sequence = np.random.SeedSequence((seed, generation))
+    return tuple(seed_sequence.generate_state(episodes, dtype=np.uint32).tolist())
+
+
+def plan_episodes(
+    training_settings: settings.TrainingSettings,
+    generation: int = 0,
+    seed: int | None = None,
+) -> EpisodePlan:
+    """Plan the episodes of a generation, without an elite fitness to prune on."""
+    return EpisodePlan(
+        seeds=episode_seeds(
+            seed=training_settings.seed if seed is None else seed,
+            generation=generation,
+            episodes=training_settings.episodes,
+        )
+    )
+
+
+def aggregate_fitness(
+    fitnesses: npt.ArrayLike, training_settings: settings.TrainingSettings
+) -> FloatArray:
+    """Aggregate the fitness of the episodes along the first axis."""
+    aggregation_function = AggregationFunctionsDict[
+        training_settings.fitness_aggregation
+    ]
+    return aggregation_function(
+        np.asarray(fitnesses, dtype=np.float64), training_settings.fitness_quantile
+    )
+
+
+def cannot_beat(
+    fitnesses: collections.abc.Sequence[float],
+    elite_fitness: float,
+    training_settings: settings.TrainingSettings,
+) -> bool:
+    """Return True if the remaining episodes cannot lift a genome above the elite.
+
+    The quantile of all episodes interpolates between two order statistics, it
+    cannot exceed the elite fitness once enough episodes scored at most that
+    fitness, whatever the remaining episodes score.
+    """
+    quantile = AggregationQuantilesDict.get(
+        training_settings.fitness_aggregation, training_settings.fitness_quantile
+    )
+    if quantile is None:
+        return False
+    n_required = math.ceil(quantile * (training_settings.episodes - 1)) + 1
+    return sum(fitness <= elite_fitness for fitness in fitnesses) >= n_required
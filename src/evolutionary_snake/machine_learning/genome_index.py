@@ -0,0 +1,128 @@
+"""Sidecar index of the best genome of every generation of a training run."""
+
+import hashlib
+import json
+import pathlib
+import typing
+
+import neat
+
+INDEX_FILENAME = "index.jsonl"
+
+
+class IndexEntry(typing.NamedTuple):
+    """The best genome of a generation, as stored in the index of a training run."""
+
+    path_index: pathlib.Path
+    generation: int
+    genome_key: int
+    fitness: float
+    config_hash: str
+    genome: dict[str, typing.Any]
+
+    @property
+    def path_neat_config(self) -> pathlib.Path:
+        """Return the path of the neat config saved next to the index."""
+        return self.path_index.parent / "neat_config"
+
+
+class GenomeIndex(neat.reporting.BaseReporter):  # type: ignore[misc]
+    """Reporter that appends the best genome of every generation to an index.
+
+    Every line of the index is a JSON object with the generation, the key and the
+    fitness of the best genome, the genome itself and the hash of the neat config
+    it was trained with, so the best genomes of a run are found without loading
+    any checkpoint.
+    """
+
+    def __init__(self, path_index: pathlib.Path, config_hash: str) -> None:
+        """Initialize the genome index."""
+        self.path_index = path_index
+        self.config_hash = config_hash
+        self.current_generation = 0
+
+    def start_generation(self, generation: int) -> None:
+        """Keep track of the current generation."""
+        self.current_generation = generation
+
+    def post_evaluate(
+        self,
+        config: neat.Config,
+        population: dict[int, neat.DefaultGenome],
+        species: neat.DefaultSpeciesSet,
+        best_genome: neat.DefaultGenome,
+    ) -> None:
+        """Append the best genome of the generation to the index."""
+        del config, population, species
+        line = {
+            "generation": self.current_generation,
+            "genome_key": best_genome.key,
+            "fitness": best_genome.fitness,
+            "config_hash": self.config_hash,
+            "genome": serialize_genome(best_genome),
+        }
+        with self.path_index.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(line) + "\n")
+
+
+def get_config_hash(path_neat_config: pathlib.Path) -> str:
+    """Return the hash of a neat config file."""
+    return hashlib.sha256(path_neat_config.read_bytes()).hexdigest()
+
+
+def serialize_genome(genome: neat.DefaultGenome) -> dict[str, typing.Any]:
+    """Return the genes of a genome as a JSON serializable dictionary."""
+    return {
+        "nodes": [
+            [node.key, node.bias, node.response, node.activation, node.aggregation]
+            for node in genome.nodes.values()
+        ],
+        "connections": [
+            [*connection.key, connection.weight, connection.enabled]
+            for connection in genome.connections.values()
+        ],
+    }
+
+
+def deserialize_genome(
+    genome_key: int, genes: dict[str, typing.Any]
+) -> neat.DefaultGenome:
+    """Create a genome from the genes stored by serialize_genome."""
+    genome = neat.DefaultGenome(genome_key)
+    for key, bias, response, activation, aggregation in genes["nodes"]:
+        node = neat.genes.DefaultNodeGene(key)
+        node.bias, node.response = bias, response
+        node.activation, node.aggregation = activation, aggregation
+        genome.nodes[key] = node
+    for input_key, output_key, weight, enabled in genes["connections"]:
+        connection = neat.genes.DefaultConnectionGene((input_key, output_key))
+        connection.weight, connection.enabled = weight, enabled
+        genome.connections[input_key, output_key] = connection
+    return genome
+
+
+def read_index(path: pathlib.Path) -> list[IndexEntry]:
+    """Read an index, or all indices in a directory and its subdirectories."""
+    path = pathlib.Path(path)
+    paths_index = sorted(path.rglob(INDEX_FILENAME)) if path.is_dir() else [path]
+    entries: list[IndexEntry] = []
+    for path_index in paths_index:
+        with path_index.open(encoding="utf-8") as file:
+            entries.extend(
+                IndexEntry(path_index=path_index, **json.loads(line)) for line in file
+            )
+    return entries
+
+
+def top_genomes(path: pathlib.Path, k: int) -> list[IndexEntry]:
+    """Return the k genomes with the highest fitness, best first.
+
+    A genome that was the best genome of several generations, like an elite, is
+    listed once with its highest fitness.
+    """
+    best: dict[tuple[pathlib.Path, int], IndexEntry] = {}
+    for entry in read_index(path):
+        key = (entry.path_index, entry.genome_key)
+        if key not in best or entry.fitness > best[key].fitness:
+            best[key] = entry
+    return sorted(best.values(), key=lambda entry: entry.fitness, reverse=True)[:k]
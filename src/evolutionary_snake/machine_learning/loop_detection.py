@@ -0,0 +1,68 @@
+"""Statistics of the games that were ended because they got stuck in a loop."""
+
+import dataclasses
+import logging
+
+import neat
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class LoopReport:
+    """Number of games, of games ended in a loop and of the steps that saved."""
+
+    games: int = 0
+    loops: int = 0
+    steps_saved: int = 0
+
+    def add_game(self, *, looped: bool, steps_saved: int) -> None:
+        """Add a game that did or did not end in a loop."""
+        self.games += 1
+        self.loops += looped
+        self.steps_saved += steps_saved
+
+    def add(self, other: "LoopReport") -> None:
+        """Add the games of another report to this report."""
+        self.games += other.games
+        self.loops += other.loops
+        self.steps_saved += other.steps_saved
+
+
+class LoopReporter(neat.reporting.BaseReporter):  # type: ignore[misc]
+    """Reporter that logs how many steps loop detection saved in every generation.
+
+    Evaluation functions add the loop report of every genome they evaluate.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the loop reporter."""
+        self.current_generation = 0
+        self.report = LoopReport()
+        self.generation_reports: list[LoopReport] = []
+
+    def start_generation(self, generation: int) -> None:
+        """Start collecting the loops of a new generation."""
+        self.current_generation = generation
+        self.report = LoopReport()
+
+    def add(self, report: LoopReport) -> None:
+        """Add the loop report of the games of a genome."""
+        self.report.add(report)
+
+    def post_evaluate(
+        self,
+        config: neat.Config,
+        population: dict[int, neat.DefaultGenome],
+        species: neat.DefaultSpeciesSet,
+        best_genome: neat.DefaultGenome,
+    ) -> None:
+        """Log the loops of the generation."""
+        del config, population, species, best_genome
+        self.generation_reports.append(self.report)
+        msg = (
+            f"Generation {self.current_generation} ended {self.report.loops} of "
+            f"{self.report.games} games in a loop, saving {self.report.steps_saved} "
+            f"steps"
+        )
+        logger.info(msg)
@@ -16,3 +16,5 @@ class LossTracker(pydantic.BaseModel):
         enums.Direction.DOWN: 0,
     }
     loss: float = 0
+    room_total: float = 0
+    steps_saved: int = 0
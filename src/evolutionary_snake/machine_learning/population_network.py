@@ -0,0 +1,149 @@
+"""Networks of a whole population packed into one segmented structure."""
+
+import collections.abc
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+from evolutionary_snake.machine_learning import compiled_network
+
+FloatArray: typing.TypeAlias = npt.NDArray[np.float64]  # noqa: UP040
+IntArray: typing.TypeAlias = npt.NDArray[np.int64]  # noqa: UP040
+
+
+class PopulationLevel(typing.NamedTuple):
+    """The nodes of all networks that are evaluated in the same pass.
+
+    Every connection into the level adds the value of its source times its weight
+    to the level node at its target position. The activations map the name of an
+    activation function to the positions of the level nodes that use it.
+    """
+
+    nodes: IntArray
+    sources: IntArray
+    targets: IntArray
+    weights: FloatArray
+    bias: FloatArray
+    response: FloatArray
+    activations: tuple[tuple[str, IntArray], ...]
+
+
+class PopulationNetwork:
+    """Networks of a whole population evaluated together in one vectorized pass.
+
+    The node values of all networks live in one flat array, every network in its own
+    segment. Level k holds layer k of every network, so a single pass over the
+    levels evaluates every network on its own input vector, however different the
+    topologies of the networks are.
+    """
+
+    def __init__(
+        self,
+        n_inputs: int,
+        n_values: int,
+        input_indices: IntArray,
+        output_indices: IntArray,
+        levels: collections.abc.Sequence[PopulationLevel],
+    ) -> None:
+        """Initialize the population network."""
+        self.n_inputs = n_inputs
+        self.n_values = n_values
+        self.input_indices = input_indices
+        self.output_indices = output_indices
+        self.levels = tuple(levels)
+
+    @classmethod
+    def create(
+        cls, networks: collections.abc.Sequence[compiled_network.CompiledNetwork]
+    ) -> "PopulationNetwork":
+        """Pack compiled networks with the same inputs and outputs into one network.
+
+        The population should hold at least one network.
+        """
+        offsets = np.cumsum([0] + [network.n_nodes for network in networks])[:-1]
+        n_levels = max(len(network.layers) for network in networks)
+        level_nodes: list[list[compiled_network.CompiledNode]] = [
+            [] for _ in range(n_levels)
+        ]
+        level_offsets: list[list[int]] = [[] for _ in range(n_levels)]
+        input_indices: list[int] = []
+        output_indices: list[list[int]] = []
+        for network, offset in zip(networks, offsets.tolist(), strict=True):
+            input_indices.extend(range(offset, offset + network.n_inputs))
+            output_indices.append([offset + i for i in network.output_indices])
+            position = 0
+            for level, layer in enumerate(network.layers):
+                size = layer.stop - layer.start
+                level_nodes[level].extend(network.nodes[position : position + size])
+                level_offsets[level].extend([offset] * size)
+                position += size
+
+        return cls(
+            n_inputs=networks[0].n_inputs,
+            n_values=sum(network.n_nodes for network in networks),
+            input_indices=np.array(input_indices, dtype=np.int64),
+            output_indices=np.array(output_indices, dtype=np.int64),
+            levels=[
+                _create_level(nodes, node_offsets)
+                for nodes, node_offsets in zip(level_nodes, level_offsets, strict=True)
+            ],
+        )
+
+    def activate(self, inputs: npt.ArrayLike) -> FloatArray:
+        """Return the outputs of every network for its own input vector.
+
+        The inputs hold one row per network, the outputs one row per network.
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        n_networks = self.output_indices.shape[0]
+        if inputs.shape != (n_networks, self.n_inputs):
+            shape = (n_networks, self.n_inputs)
+            msg = f"Expected inputs of shape {shape}, got {inputs.shape}"
+            raise RuntimeError(msg)
+        values = np.zeros(self.n_values, dtype=np.float64)
+        values[self.input_indices] = inputs.ravel()
+        for level in self.levels:
+            total = np.bincount(
+                level.targets,
+                weights=values[level.sources] * level.weights,
+                minlength=level.nodes.size,
+            )
+            z = level.bias + level.response * total
+            for name, positions in level.activations:
+                activation = compiled_network.ACTIVATION_FUNCTIONS[name]
+                values[level.nodes[positions]] = activation(z[positions])
+        return values[self.output_indices]
+
+
+def _create_level(
+    nodes: list[compiled_network.CompiledNode], node_offsets: list[int]
+) -> PopulationLevel:
+    """Create a level from nodes of all networks and the offsets of their segments."""
+    sources: list[int] = []
+    targets: list[int] = []
+    weights: list[float] = []
+    activations: dict[str, list[int]] = {}
+    for position, (node, offset) in enumerate(zip(nodes, node_offsets, strict=True)):
+        sources.extend(offset + source for source in node.sources)
+        targets.extend([position] * len(node.sources))
+        weights.extend(node.weights)
+        activations.setdefault(node.activation, []).append(position)
+    return PopulationLevel(
+        nodes=np.array(
+            [
+                offset + node.node_index
+                for node, offset in zip(nodes, node_offsets, strict=True)
+            ],
+            dtype=np.int64,
+        ),
+        sources=np.array(sources, dtype=np.int64),
+        targets=np.array(targets, dtype=np.int64),
+        weights=np.array(weights, dtype=np.float64),
+        bias=np.array([node.bias for node in nodes], dtype=np.float64),
+        response=np.array([node.response for node in nodes], dtype=np.float64),
+        activations=tuple(
+            (name, np.array(positions, dtype=np.int64))
+            for name, positions in activations.items()
+        ),
+    )
@@ -0,0 +1,213 @@
+"""Opt-in timers and counters of the phases of a game step."""
+
+import contextlib
+import dataclasses
+import json
+import logging
+import pathlib
+import time
+import types
+import typing
+
+import neat
+
+from evolutionary_snake.utils import enums
+
+PROFILE_FILENAME = "profile.jsonl"
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class ProfileReport:
+    """Time spent in and number of calls of every phase of one or more games."""
+
+    games: int = 0
+    steps: int = 0
+    times: dict[enums.ProfilePhase, float] = dataclasses.field(
+        default_factory=lambda: dict.fromkeys(enums.ProfilePhase, 0.0)
+    )
+    counts: dict[enums.ProfilePhase, int] = dataclasses.field(
+        default_factory=lambda: dict.fromkeys(enums.ProfilePhase, 0)
+    )
+
+    @property
+    def total_time(self) -> float:
+        """Return the time spent in all phases in seconds."""
+        return sum(self.times.values())
+
+    @property
+    def steps_per_second(self) -> float:
+        """Return the number of game steps per second of profiled time."""
+        total_time = self.total_time
+        return self.steps / total_time if total_time > 0 else 0.0
+
+    def add(self, other: "ProfileReport") -> None:
+        """Add the games of another report to this report."""
+        self.games += other.games
+        self.steps += other.steps
+        for phase in enums.ProfilePhase:
+            self.times[phase] += other.times[phase]
+            self.counts[phase] += other.counts[phase]
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Return the report as a JSON serializable dictionary."""
+        return {
+            "games": self.games,
+            "steps": self.steps,
+            "steps_per_second": self.steps_per_second,
+            "times": {str(phase): value for phase, value in self.times.items()},
+            "counts": {str(phase): value for phase, value in self.counts.items()},
+        }
+
+
+class _PhaseTimer:
+    """Context manager that times a single phase of a game profiler."""
+
+    __slots__ = ("_phase", "_profiler")
+
+    def __init__(self, profiler: "GameProfiler", phase: enums.ProfilePhase) -> None:
+        """Initialize the timer of a phase."""
+        self._profiler = profiler
+        self._phase = phase
+
+    def __enter__(self) -> None:
+        """Start timing the phase."""
+        self._profiler.start(self._phase)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Stop timing the phase."""
+        del exc_type, exc_value, traceback
+        self._profiler.stop()
+
+
+class GameProfiler:
+    """Time the phases of the steps of a single game.
+
+    Phases may be nested, the time of a phase excludes the time of the phases that
+    run within it, so the times of all phases add up to the profiled time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler without any profiled steps."""
+        self.steps = 0
+        self.times = dict.fromkeys(enums.ProfilePhase, 0.0)
+        self.counts = dict.fromkeys(enums.ProfilePhase, 0)
+        self._timers = {phase: _PhaseTimer(self, phase) for phase in enums.ProfilePhase}
+        self._phases: list[enums.ProfilePhase] = []
+        self._last_time = 0.0
+
+    def phase(
+        self, phase: enums.ProfilePhase
+    ) -> contextlib.AbstractContextManager[None]:
+        """Return a context manager that times a phase."""
+        return self._timers[phase]
+
+    def start(self, phase: enums.ProfilePhase) -> None:
+        """Start timing a phase, pausing the phase it runs within."""
+        now = time.perf_counter()
+        if self._phases:
+            self.times[self._phases[-1]] += now - self._last_time
+        self._phases.append(phase)
+        self.counts[phase] += 1
+        self._last_time = now
+
+    def stop(self) -> None:
+        """Stop timing the current phase, resuming the phase it runs within."""
+        now = time.perf_counter()
+        self.times[self._phases.pop()] += now - self._last_time
+        self._last_time = now
+
+    def count_step(self) -> None:
+        """Count a finished game step."""
+        self.steps += 1
+
+    def report(self) -> ProfileReport:
+        """Return the report of the profiled game."""
+        return ProfileReport(
+            games=1,
+            steps=self.steps,
+            times=self.times.copy(),
+            counts=self.counts.copy(),
+        )
+
+
+class NullProfiler(GameProfiler):
+    """Profiler that does not time anything, used when profiling is off."""
+
+    _null_timer = contextlib.nullcontext()
+
+    def phase(
+        self, phase: enums.ProfilePhase
+    ) -> contextlib.AbstractContextManager[None]:
+        """Return a context manager that does nothing."""
+        del phase
+        return self._null_timer
+
+    def count_step(self) -> None:
+        """Do not count the game step."""
+
+
+class ProfileReporter(neat.reporting.BaseReporter):  # type: ignore[misc]
+    """Reporter that aggregates the profiles of the games of every generation.
+
+    Evaluation functions add the profile of every genome they evaluate. After the
+    evaluation of a generation, its steps per second and the share of every phase
+    are logged, and the reports of the generation and of all its genomes are
+    appended to a JSON lines file when a path is given.
+    """
+
+    def __init__(self, path_report: pathlib.Path | None = None) -> None:
+        """Initialize the profile reporter."""
+        self.path_report = path_report
+        self.current_generation = 0
+        self.genome_reports: dict[int, ProfileReport] = {}
+        self.generation_reports: list[ProfileReport] = []
+
+    def start_generation(self, generation: int) -> None:
+        """Start collecting the profiles of a new generation."""
+        self.current_generation = generation
+        self.genome_reports = {}
+
+    def add(self, genome_key: int, report: ProfileReport) -> None:
+        """Add the profile of the games of a genome."""
+        self.genome_reports.setdefault(genome_key, ProfileReport()).add(report)
+
+    def post_evaluate(
+        self,
+        config: neat.Config,
+        population: dict[int, neat.DefaultGenome],
+        species: neat.DefaultSpeciesSet,
+        best_genome: neat.DefaultGenome,
+    ) -> None:
+        """Aggregate, log and export the profile of the generation."""
+        del config, population, species, best_genome
+        report = ProfileReport()
+        for genome_report in self.genome_reports.values():
+            report.add(genome_report)
+        self.generation_reports.append(report)
+        breakdown = "".join(
+            f"\n\t{phase}: {value:.4f} s ({report.counts[phase]} calls)"
+            for phase, value in report.times.items()
+        )
+        msg = (
+            f"Generation {self.current_generation} played {report.steps} steps in "
+            f"{report.games} games at {report.steps_per_second:.0f} steps/s:"
+            f"{breakdown}"
+        )
+        logger.info(msg)
+        if self.path_report is not None:
+            line = {
+                "generation": self.current_generation,
+                **report.to_dict(),
+                "genomes": {
+                    str(genome_key): genome_report.to_dict()
+                    for genome_key, genome_report in self.genome_reports.items()
+                },
+            }
+            with self.path_report.open("a", encoding="utf-8") as file:
+                file.write(json.dumps(line) + "\n")
@@ -0,0 +1,167 @@
+"""Asynchronous steady-state evolution of a NEAT population."""
+
+import collections.abc
+import itertools
+import queue
+import random
+import typing
+
+import neat
+
+GenomeItemType: typing.TypeAlias = tuple[int, neat.DefaultGenome]  # noqa: UP040
+ResultCallback: typing.TypeAlias = collections.abc.Callable[  # noqa: UP040
+    [float | BaseException], None
+]
+SubmitFunction: typing.TypeAlias = collections.abc.Callable[  # noqa: UP040
+    [GenomeItemType, float | None, ResultCallback], None
+]
+TOURNAMENT_SIZE = 3
+
+
+class SteadyStatePopulation:  # pylint: disable=too-many-instance-attributes
+    """Population that breeds a new genome whenever an evaluation finishes.
+
+    Evaluations are submitted asynchronously and their results are merged into the
+    population as they come in: an offspring replaces the worst genome when it is at
+    least as fit, so no evaluation waits for the slowest genome of a generation.
+    When episodes are pruned, an offspring has to be strictly fitter, as a pruned
+    offspring only reaches the fitness of the worst genome.
+
+    Offspring are bred by crossover and mutation of two parents that each win a
+    tournament over the whole population. This is simpler than
+    neat.DefaultReproduction: species are only computed for the reporters, so they
+    do not protect new structures, and the elitism, stagnation and
+    fitness_threshold of the neat config are not used.
+
+    The population mirrors neat.Population for its reporters: every pop_size
+    finished evaluations count as a generation, after which the population is
+    divided into species and reported.
+    """
+
+    def __init__(
+        self, config: neat.Config, max_in_flight: int, *, prune_episodes: bool = False
+    ) -> None:
+        """Initialize the steady-state population."""
+        self.config = config
+        self.max_in_flight = max_in_flight
+        self.prune_episodes = prune_episodes
+        self.reporters = neat.reporting.ReporterSet()
+        self.population: dict[int, neat.DefaultGenome] = {}
+        self.species = config.species_set_type(
+            config.species_set_config, self.reporters
+        )
+        self.generation = 0
+        self.best_genome: neat.DefaultGenome | None = None
+        self._genome_indexer = itertools.count(1)
+        self._results: queue.SimpleQueue[
+            tuple[neat.DefaultGenome, float | BaseException, bool]
+        ] = queue.SimpleQueue()
+        self._in_flight = 0
+
+    def add_reporter(self, reporter: neat.reporting.BaseReporter) -> None:
+        """Add a reporter, like neat.Population.add_reporter."""
+        self.reporters.add(reporter)
+
+    def run(self, submit: SubmitFunction, n: int) -> neat.DefaultGenome:
+        """Evolve the population for n generations and return the best genome.
+
+        The submit function starts the evaluation of a genome and eventually calls
+        the callback with its fitness, or with the error of the evaluation. Besides
+        the genome, it gets the fitness of the worst genome of a full population
+        when episodes are pruned, which an offspring has to beat to be kept, and
+        None otherwise.
+        """
+        if not self.population and self._in_flight == 0:
+            for _ in range(self.config.pop_size):
+                self._submit(submit, self._create_genome(), elite_fitness=None)
+        n_remaining = n * self.config.pop_size
+        self._submit_offspring(submit, n_remaining)
+        for _ in range(n):
+            self.reporters.start_generation(self.generation)
+            for _ in range(self.config.pop_size):
+                genome, fitness, pruned = self._results.get()
+                self._in_flight -= 1
+                n_remaining -= 1
+                if isinstance(fitness, BaseException):
+                    raise fitness
+                genome.fitness = fitness
+                self._merge(genome, pruned=pruned)
+                self._submit_offspring(submit, n_remaining)
+
+            self.species.speciate(self.config, self.population, self.generation)
+            best = max(self.population.values(), key=lambda genome: genome.fitness)
+            self.reporters.post_evaluate(
+                self.config, self.population, self.species, best
+            )
+            if self.best_genome is None or best.fitness > self.best_genome.fitness:
+                self.best_genome = best
+            self.reporters.end_generation(self.config, self.population, self.species)
+            self.generation += 1
+        return self.best_genome
+
+    def _submit(
+        self,
+        submit: SubmitFunction,
+        genome: neat.DefaultGenome,
+        elite_fitness: float | None,
+    ) -> None:
+        """Submit the evaluation of a genome, its result is queued when it finishes."""
+
+        def _callback(fitness: float | BaseException) -> None:
+            self._results.put((genome, fitness, elite_fitness is not None))
+
+        self._in_flight += 1
+        submit((genome.key, genome), elite_fitness, _callback)
+
+    def _submit_offspring(self, submit: SubmitFunction, n_remaining: int) -> None:
+        """Keep max_in_flight evaluations running, but no more than still needed."""
+        while self.population and self._in_flight < min(
+            self.max_in_flight, n_remaining
+        ):
+            self._submit(
+                submit,
+                self._breed(),
+                self._worst_fitness() if self.prune_episodes else None,
+            )
+
+    def _merge(self, genome: neat.DefaultGenome, *, pruned: bool) -> None:
+        """Add an evaluated genome, replacing the worst genome of a full population.
+
+        A genome whose episodes may have been pruned has to be strictly fitter than
+        the worst genome, a genome that played all episodes at least as fit.
+        """
+        if len(self.population) >= self.config.pop_size:
+            worst = min(self.population.values(), key=lambda genome: genome.fitness)
+            if genome.fitness < worst.fitness or (
+                pruned and genome.fitness == worst.fitness
+            ):
+                return
+            del self.population[worst.key]
+        self.population[genome.key] = genome
+
+    def _worst_fitness(self) -> float | None:
+        """Return the fitness of the worst genome once the population is full."""
+        if len(self.population) < self.config.pop_size:
+            return None
+        return float(min(genome.fitness for genome in self.population.values()))
+
+    def _create_genome(self) -> neat.DefaultGenome:
+        """Create a new genome from the genome config."""
+        genome = self.config.genome_type(next(self._genome_indexer))
+        genome.configure_new(self.config.genome_config)
+        return genome
+
+    def _breed(self) -> neat.DefaultGenome:
+        """Create an offspring of two parents that each win a tournament."""
+        genomes = list(self.population.values())
+        parent1, parent2 = (
+            max(
+                random.sample(genomes, min(TOURNAMENT_SIZE, len(genomes))),
+                key=lambda genome: genome.fitness,
+            )
+            for _ in range(2)
+        )
+        genome = self.config.genome_type(next(self._genome_indexer))
+        genome.configure_crossover(parent1, parent2, self.config.genome_config)
+        genome.mutate(self.config.genome_config)
+        return genome
@@ -0,0 +1,64 @@
+"""Successive halving of the genomes of a generation over growing step budgets."""
+
+import math
+import typing
+
+from evolutionary_snake import settings
+
+
+class Rung(typing.NamedTuple):
+    """The budget of a rung and the number of genomes that play it."""
+
+    n_genomes: int
+    step_limit: int
+    episodes: int
+
+
+def plan_rungs(
+    n_genomes: int, training_settings: settings.TrainingSettings
+) -> list[Rung]:
+    """Plan the rungs the genomes of a generation race through.
+
+    Every rung keeps the best 1 / eta of the genomes of the rung below it and gives
+    them eta times the budget, up to the step limit and episodes of the training
+    settings on the last rung. A step limit below zero has no budget to divide.
+    """
+    eta = training_settings.halving_eta
+    rungs = []
+    for rung in range(training_settings.halving_rungs):
+        factor = eta ** (training_settings.halving_rungs - 1 - rung)
+        rungs.append(
+            Rung(
+                n_genomes=n_genomes,
+                step_limit=max(training_settings.step_limit // factor, 1)
+                if training_settings.step_limit >= 0
+                else training_settings.step_limit,
+                episodes=max(training_settings.episodes // factor, 1),
+            )
+        )
+        n_genomes = max(math.ceil(n_genomes / eta), 1)
+    return rungs
+
+
+def promote(fitnesses: dict[int, float], n_genomes: int) -> set[int]:
+    """Return the keys of the fittest genomes of a rung, which play the next rung."""
+    return set(sorted(fitnesses, key=fitnesses.__getitem__, reverse=True)[:n_genomes])
+
+
+def assign_fitness(rung_fitnesses: list[dict[int, float]]) -> dict[int, float]:
+    """Return the fitness of every genome from the fitness it had on every rung.
+
+    Longer budgets give other fitnesses, so a genome keeps the fitness of the
+    highest rung it played. To rank every genome below the genomes that were
+    promoted past it, the fitnesses of the genomes that stopped on a rung are
+    shifted down, when needed, until the best of them is one below the worst
+    genome of the rungs above.
+    """
+    fitness = dict(rung_fitnesses[-1])
+    for fitnesses in reversed(rung_fitnesses[:-1]):
+        stopped = {key: value for key, value in fitnesses.items() if key not in fitness}
+        if not stopped:
+            continue
+        shift = min(min(fitness.values()) - 1 - max(stopped.values()), 0.0)
+        fitness.update({key: value + shift for key, value in stopped.items()})
+    return fitness
@@ -1,10 +1,16 @@
 """All public settings objects."""
 
 from evolutionary_snake.settings.game_settings import AiGameSettings, GameSettings
+from evolutionary_snake.settings.grid_geometry import (
+    GridGeometry,
+    get_grid_geometry,
+)
 from evolutionary_snake.settings.training_settings import TrainingSettings
 
 __all__ = [
     "AiGameSettings",
     "GameSettings",
+    "GridGeometry",
     "TrainingSettings",
+    "get_grid_geometry",
 ]
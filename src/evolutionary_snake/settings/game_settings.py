@@ -1,12 +1,14 @@
 """Config of the evolutionary snake game."""
 
-import itertools
 import os
 import pathlib
+import typing
 
 import neat
 import pydantic
 
+from evolutionary_snake.machine_learning import compiled_network, feature_names
+from evolutionary_snake.settings import grid_geometry
 from evolutionary_snake.utils import enums
 
 os.environ["PYTHONWARNINGS"] = "ignore"
@@ -25,24 +27,35 @@ class GameSettings(pydantic.BaseModel):
     boundary_type: enums.BoundaryType = enums.BoundaryType.HARD_BOUNDARY
     frame_rate_fps: float = 20
     run_in_background: bool = False
+    headless: bool = False
+    profile: bool = False
+    seed: int | None = None
+    path_replays: pathlib.Path | None = None
+    path_frames: pathlib.Path | None = None
 
     @property
-    def coordinates_grid(self) -> list[tuple[int, int]]:
-        """Returns the coordinates of the snake game grid."""
-        x_list = list(range(0, self.display_width, self.step_size))
-        y_list = list(range(0, self.display_height, self.step_size))
-        return list(itertools.product(x_list, y_list))
+    def geometry(self) -> grid_geometry.GridGeometry:
+        """Returns the cached geometry of the snake game grid and boundary."""
+        return grid_geometry.get_grid_geometry(
+            self.display_width, self.display_height, self.step_size
+        )
 
 
 class AiGameSettings(GameSettings):
-    """Settings of the AI game mode."""
+    """Settings of the AI game mode.
+
+    The names of the input nodes follow from the features, in the order they are
+    given, so they always match the inputs the network is fed.
+    """
 
     model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
     name: str = "AI Snake"
     path_neat_config: pathlib.Path = (
         pathlib.Path(__file__).parents[3] / "data" / "neat_config"
     )
-    neural_net: neat.nn.FeedForwardNetwork
+    neural_net: neat.nn.FeedForwardNetwork | compiled_network.CompiledNetwork | None = (
+        None
+    )
     step_limit: int = 50
     screens_per_row: int = 5
     screens_per_col: int = 3
@@ -50,6 +63,10 @@ class AiGameSettings(GameSettings):
     retracting_penalty: float = 1.5
     eat_apple_score: int = 100
     collision_penalty: int = 1000
+    reachable_area_score: float = 0
+    detect_loops: bool = False
+    loop_penalty: float = 100
+    features: tuple[enums.Feature, ...] = feature_names.DEFAULT_FEATURES
     node_names: dict[int, str] = {
         -1: "Apple_left",
         -2: "Apple_right",
@@ -64,3 +81,11 @@ class AiGameSettings(GameSettings):
         2: "UP",
         3: "DOWN",
     }
+
+    @pydantic.model_validator(mode="after")
+    def sync_input_node_names(self) -> typing.Self:
+        """Name the input nodes after the values of the features."""
+        self.node_names = feature_names.input_node_names(self.features) | {
+            key: name for key, name in self.node_names.items() if key >= 0
+        }
+        return self
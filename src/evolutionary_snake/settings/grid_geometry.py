@@ -0,0 +1,48 @@
+"""Geometry of the board of the evolutionary snake game."""
+
+import dataclasses
+import functools
+import itertools
+import typing
+
+
+@dataclasses.dataclass(frozen=True)
+class GridGeometry:
+    """Cells of the board and of the boundary around it.
+
+    Instances are created by get_grid_geometry, which computes the geometry once for
+    every board size. Pickling an instance only sends the board size, so a worker
+    process unpickles it into its own cached instance.
+    """
+
+    width: int
+    height: int
+    step_size: int
+    cells: tuple[tuple[int, int], ...]
+    boundary: frozenset[tuple[int, int]]
+
+    def on_board(self, x: int, y: int) -> bool:
+        """Return True if the cell at x, y lies on the board."""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __reduce__(self) -> tuple[typing.Any, tuple[int, int, int]]:
+        """Unpickle into the cached geometry of the same board size."""
+        return get_grid_geometry, (self.width, self.height, self.step_size)
+
+
+@functools.cache
+def get_grid_geometry(width: int, height: int, step_size: int) -> GridGeometry:
+    """Return the geometry of a board, computed once for every board size."""
+    x_list = range(0, width, step_size)
+    y_list = range(0, height, step_size)
+    x_outside = range(-step_size, width + step_size, step_size)
+    y_outside = range(-step_size, height + step_size, step_size)
+    boundary = {(x, y) for x in x_outside for y in (-step_size, height)}
+    boundary.update((x, y) for x in (-step_size, width) for y in y_outside)
+    return GridGeometry(
+        width=width,
+        height=height,
+        step_size=step_size,
+        cells=tuple(itertools.product(x_list, y_list)),
+        boundary=frozenset(boundary),
+    )
@@ -7,7 +7,8 @@ import zoneinfo
 import neat
 import pydantic
 
-from evolutionary_snake.utils import utility_functions
+from evolutionary_snake.machine_learning import feature_names
+from evolutionary_snake.utils import enums, utility_functions
 
 DATETIME_NOW = datetime.datetime.now(tz=zoneinfo.ZoneInfo("Europe/Amsterdam"))
 DATE = DATETIME_NOW.strftime("%Y%m%d")
@@ -19,6 +20,34 @@ class TrainingSettings(pydantic.BaseModel):
 
     generations: int = 25
     step_limit: int = 50
+    headless: bool = True
+    workers: int | None = pydantic.Field(default=None, ge=1)
+    chunk_size: int | None = pydantic.Field(default=None, ge=1)
+    seed: int | None = None
+    episodes: int = pydantic.Field(default=1, ge=1)
+    fitness_aggregation: enums.FitnessAggregation = enums.FitnessAggregation.MEAN
+    fitness_quantile: float = pydantic.Field(default=0.25, ge=0.0, le=1.0)
+    prune_episodes: bool = False
+    successive_halving: bool = False
+    halving_rungs: int = pydantic.Field(default=3, ge=1)
+    halving_eta: int = pydantic.Field(default=2, ge=2)
+    cache_fitness: bool = False
+    fixed_episodes: bool = False
+    fitness_cache_size: int = pydantic.Field(default=10_000, ge=1)
+    path_fitness_cache: pathlib.Path | None = None
+    full_snapshot_interval: int = pydantic.Field(default=10, ge=1)
+    broker_host: str = "127.0.0.1"
+    broker_port: int = pydantic.Field(default=5555, ge=0, le=65535)
+    heartbeat_timeout: float = pydantic.Field(default=30.0, gt=0.0)
+    local_workers: int = pydantic.Field(default=0, ge=0)
+    profile: bool = False
+    record_replays: bool = False
+    mosaic_viewer: bool = False
+    mosaic_refresh_fps: float = pydantic.Field(default=10.0, gt=0.0)
+    features: tuple[enums.Feature, ...] = feature_names.DEFAULT_FEATURES
+    reachable_area_score: float = pydantic.Field(default=0.0, ge=0.0)
+    detect_loops: bool = False
+    loop_penalty: float = pydantic.Field(default=100.0, ge=0.0)
     checkpoint_prefix: pathlib.Path = pydantic.Field(
         default=pathlib.Path(__file__).parents[3]
         / "data"
@@ -45,3 +74,15 @@ class TrainingSettings(pydantic.BaseModel):
     def neat_config(self) -> neat.Config:
         """Returns the neat config instance."""
         return utility_functions.get_neat_config(self.path_neat_config)
+
+    def validate_num_inputs(self, neat_config: neat.Config) -> None:
+        """Raise a ValueError if the features do not match the inputs of the config."""
+        n_features = len(feature_names.input_names(self.features))
+        num_inputs = neat_config.genome_config.num_inputs
+        if n_features != num_inputs:
+            msg = (
+                f"The features {[str(feature) for feature in self.features]} give "
+                f"{n_features} inputs, but the neat config has num_inputs = "
+                f"{num_inputs}."
+            )
+            raise ValueError(msg)
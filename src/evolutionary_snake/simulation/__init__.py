@@ -0,0 +1,17 @@
+"""Package containing simulation engines that run many games at once."""
+
+from evolutionary_snake.simulation.batch_game_engine import BatchGameEngine
+from evolutionary_snake.simulation.replay import (
+    REPLAY_DIRNAME,
+    Replay,
+    append_replay,
+    read_replays,
+)
+
+__all__ = [
+    "REPLAY_DIRNAME",
+    "BatchGameEngine",
+    "Replay",
+    "append_replay",
+    "read_replays",
+]
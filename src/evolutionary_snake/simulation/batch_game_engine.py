@@ -0,0 +1,297 @@
+"""Batch game engine that advances a population of AI snake games in lockstep."""
+
+import collections.abc
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+from evolutionary_snake import settings
+from evolutionary_snake.utils import enums
+
+IntArray: typing.TypeAlias = npt.NDArray[np.int64]  # noqa: UP040
+BoolArray: typing.TypeAlias = npt.NDArray[np.bool_]  # noqa: UP040
+FloatArray: typing.TypeAlias = npt.NDArray[np.float64]  # noqa: UP040
+Policy: typing.TypeAlias = collections.abc.Callable[  # noqa: UP040
+    [FloatArray, BoolArray], npt.ArrayLike
+]
+
+# Indexed by the values of enums.Direction: LEFT, RIGHT, UP, DOWN.
+DIRECTION_DX: IntArray = np.array([-1, 1, 0, 0], dtype=np.int64)
+DIRECTION_DY: IntArray = np.array([0, 0, -1, 1], dtype=np.int64)
+DIRECTION_OPPOSITES: IntArray = np.array(
+    [
+        enums.Direction.RIGHT.value,
+        enums.Direction.LEFT.value,
+        enums.Direction.DOWN.value,
+        enums.Direction.UP.value,
+    ],
+    dtype=np.int64,
+)
+SENTINEL_X = -1
+
+
+class BatchGameEngine:  # pylint: disable=too-many-instance-attributes
+    """Advance many AI snake games in lockstep as NumPy arrays.
+
+    Every game follows the rules of the AiGameMode: the snake moves as in
+    Snake.update, the loss is tracked as in AiGameMode._loop and the final score is
+    processed as in AiGameMode.process_score once a game has ended. Positions are
+    stored in grid cells, the bodies live in ring buffers with one row per game.
+    """
+
+    def __init__(
+        self,
+        game_settings: settings.AiGameSettings,
+        n_games: int,
+        seeds: collections.abc.Sequence[int | np.random.SeedSequence] | None = None,
+    ) -> None:
+        """Initialize the batch game engine."""
+        self.game_settings = game_settings
+        self.n_games = n_games
+        self.step_size = game_settings.step_size
+        self.columns = game_settings.display_width // self.step_size
+        self.rows = game_settings.display_height // self.step_size
+        self.capacity = self.columns * self.rows
+        self.periodic = (
+            game_settings.boundary_type == enums.BoundaryType.PERIODIC_BOUNDARY
+        )
+        if seeds is None:
+            seeds = np.random.SeedSequence(game_settings.seed).spawn(n_games)
+        self.rngs = [np.random.default_rng(seed) for seed in seeds]
+        self.games: IntArray = np.arange(n_games, dtype=np.int64)
+
+        # the snake starts in the center, its tail is still outside the board
+        head_x = game_settings.display_width // 2 // self.step_size
+        self.sentinel_y = game_settings.display_width // 2 // self.step_size
+        self.body_x: IntArray = np.full(
+            (n_games, self.capacity), SENTINEL_X, dtype=np.int64
+        )
+        self.body_y: IntArray = np.full(
+            (n_games, self.capacity), self.sentinel_y, dtype=np.int64
+        )
+        self.body_x[:, 0] = head_x
+        self.head_index: IntArray = np.zeros(n_games, dtype=np.int64)
+        self.length: IntArray = np.full(
+            n_games, game_settings.snake_length_init, dtype=np.int64
+        )
+        self.occupancy = np.zeros((n_games, self.columns, self.rows), dtype=np.uint16)
+        self.occupancy[:, head_x, self.sentinel_y] = 1
+        self.direction: IntArray = np.array(
+            [rng.integers(0, len(enums.Direction)) for rng in self.rngs],
+            dtype=np.int64,
+        )
+        self.apple_x: IntArray = np.zeros(n_games, dtype=np.int64)
+        self.apple_y: IntArray = np.zeros(n_games, dtype=np.int64)
+        self.spawn_apples(self.games)
+
+        self.alive: BoolArray = np.ones(n_games, dtype=np.bool_)
+        self.collided: BoolArray = np.zeros(n_games, dtype=np.bool_)
+        self.loss: FloatArray = np.zeros(n_games, dtype=np.float64)
+        self.score: IntArray = np.zeros(n_games, dtype=np.int64)
+        self.steps_total: IntArray = np.zeros(n_games, dtype=np.int64)
+        self.steps_without_apple: IntArray = np.zeros(n_games, dtype=np.int64)
+        self.direction_counts: IntArray = np.zeros(
+            (n_games, len(enums.Direction)), dtype=np.int64
+        )
+        self.apple_distance = self.distance_to_apple()
+        self._finish_games()
+
+    @property
+    def head_x(self) -> IntArray:
+        """Return the column of the head of every snake."""
+        return self.body_x[self.games, self.head_index]
+
+    @property
+    def head_y(self) -> IntArray:
+        """Return the row of the head of every snake."""
+        return self.body_y[self.games, self.head_index]
+
+    def coordinates(self, game: int) -> list[tuple[int, int]]:
+        """Return the pixel coordinates of the snake of a game, head first."""
+        indices = (self.head_index[game] + np.arange(self.length[game])) % self.capacity
+        return list(
+            zip(
+                (self.body_x[game, indices] * self.step_size).tolist(),
+                (self.body_y[game, indices] * self.step_size).tolist(),
+                strict=True,
+            )
+        )
+
+    def on_board(self, x: IntArray, y: IntArray) -> BoolArray:
+        """Return True for every cell that lies on the board."""
+        return (x >= 0) & (x < self.columns) & (y >= 0) & (y < self.rows)
+
+    def occupied(self, games: IntArray, x: IntArray, y: IntArray) -> BoolArray:
+        """Return True for every cell on the board occupied by the snake of a game."""
+        inside = self.on_board(x, y)
+        occupied = np.zeros(games.shape, dtype=np.bool_)
+        occupied[inside] = self.occupancy[games[inside], x[inside], y[inside]] > 0
+        return occupied
+
+    def distance_to_apple(self) -> FloatArray:
+        """Measure the distance to the apple for every game."""
+        width = self.game_settings.display_width
+        height = self.game_settings.display_height
+        head_x, head_y = self.head_x * self.step_size, self.head_y * self.step_size
+        apple_x, apple_y = self.apple_x * self.step_size, self.apple_y * self.step_size
+
+        dx_outer = np.minimum(width - head_x, width - apple_x) + np.minimum(
+            head_x, apple_x
+        )
+        dy_outer = np.minimum(height - head_y, height - apple_y) + np.minimum(
+            head_y, apple_y
+        )
+        dx_shortest = np.minimum(np.abs(apple_x - head_x), dx_outer)
+        dy_shortest = np.minimum(np.abs(apple_y - head_y), dy_outer)
+        distance: FloatArray = np.sqrt(dx_shortest**2 + dy_shortest**2)
+        return distance
+
+    def compute_input_vectors(self) -> FloatArray:
+        """Compute the input vector of every game in one vectorized call.
+
+        The columns follow the network inputs of feature_names.DEFAULT_FEATURES.
+        """
+        head_x, head_y = self.head_x, self.head_y
+        input_vectors = np.empty((self.n_games, 8), dtype=np.float64)
+        input_vectors[:, 0] = self.apple_x < head_x
+        input_vectors[:, 1] = self.apple_x > head_x
+        input_vectors[:, 2] = self.apple_y > head_y
+        input_vectors[:, 3] = self.apple_y < head_y
+        if not self.periodic:
+            input_vectors[:, 4] = head_x != self.columns
+            input_vectors[:, 5] = head_x != 0
+            input_vectors[:, 6] = head_y != self.rows
+            input_vectors[:, 7] = head_y != 0
+            return input_vectors
+
+        # the periodic checks mirror the Snake.*_side_clear methods
+        games, zeros = self.games, np.zeros_like(head_x)
+        last_column, last_row = self.columns - 1, self.rows - 1
+        input_vectors[:, 4] = ~(
+            self.occupied(games, head_x + 1, head_y)
+            | ((head_x == last_column) & self.occupied(games, zeros, head_y))
+        )
+        input_vectors[:, 5] = ~self.occupied(games, head_x - 1, head_y)
+        input_vectors[:, 6] = ~(
+            self.occupied(games, head_x, head_y + 1)
+            | ((head_y == 0) & self.occupied(games, head_x, zeros + last_row))
+        )
+        input_vectors[:, 7] = ~(
+            self.occupied(games, head_x, head_y - 1)
+            | ((head_y == last_row) & self.occupied(games, head_x, zeros))
+        )
+        return input_vectors
+
+    def step(self, directions: npt.ArrayLike) -> None:
+        """Advance every game that is still alive by one step.
+
+        The directions hold one enums.Direction value per game, the directions of
+        games that have ended are ignored.
+        """
+        games = np.flatnonzero(self.alive)
+        if games.size == 0:
+            return
+        requested = np.asarray(directions, dtype=np.int64)[games]
+        self.direction_counts[games, requested] += 1
+        current = self.direction[games]
+        direction = np.where(
+            requested == DIRECTION_OPPOSITES[current], current, requested
+        )
+        self.direction[games] = direction
+
+        head_index = self.head_index[games]
+        head_x = self.body_x[games, head_index] + DIRECTION_DX[direction]
+        head_y = self.body_y[games, head_index] + DIRECTION_DY[direction]
+        if self.periodic:
+            head_x %= self.columns
+            head_y %= self.rows
+
+        # release the tail, the freed slot of the ring buffer becomes a sentinel
+        tail_index = (head_index + self.length[games] - 1) % self.capacity
+        tail_x = self.body_x[games, tail_index]
+        tail_y = self.body_y[games, tail_index]
+        inside = self.on_board(tail_x, tail_y)
+        self.occupancy[games[inside], tail_x[inside], tail_y[inside]] -= 1
+        self.body_x[games, tail_index] = SENTINEL_X
+        self.body_y[games, tail_index] = self.sentinel_y
+
+        # write the new head in front of the old one
+        head_index = (head_index - 1) % self.capacity
+        self.head_index[games] = head_index
+        self.body_x[games, head_index] = head_x
+        self.body_y[games, head_index] = head_y
+        inside = self.on_board(head_x, head_y)
+        hit_itself = self.occupied(games, head_x, head_y)
+        self.occupancy[games[inside], head_x[inside], head_y[inside]] += 1
+        self.collided[games] = ~inside | hit_itself
+
+        self._update_loss(games, head_x, head_y)
+        self._finish_games()
+
+    def run(self, policy: Policy) -> FloatArray:
+        """Play all games until they have ended and return their loss.
+
+        The policy receives the input vectors of all games and the mask of the games
+        that are alive and returns the direction of every game.
+        """
+        while self.alive.any():
+            self.step(policy(self.compute_input_vectors(), self.alive))
+        return self.loss
+
+    def _update_loss(self, games: IntArray, head_x: IntArray, head_y: IntArray) -> None:
+        """Apply the rules of AiGameMode._loop to the games that have moved."""
+        game_settings = self.game_settings
+        apple_distance = self.distance_to_apple()[games]
+        self.loss[games] += np.where(
+            apple_distance <= self.apple_distance[games],
+            game_settings.approaching_score,
+            -game_settings.retracting_penalty,
+        )
+        self.apple_distance[games] = apple_distance
+
+        eaten = (head_x == self.apple_x[games]) & (head_y == self.apple_y[games])
+        eaters = games[eaten]
+        self.length[eaters] += 1
+        self.score[eaters] += 1
+        self.loss[eaters] += game_settings.eat_apple_score
+        self.steps_without_apple[eaters] = 0
+        self.steps_without_apple[games[~eaten]] += 1
+        self.spawn_apples(eaters)
+        self.steps_total[games] += 1
+
+    def spawn_apples(self, games: IntArray) -> None:
+        """Place a new apple on a free cell for each of the given games.
+
+        A game whose snake fills the board keeps its apple, as there is no free cell
+        left to place it on.
+        """
+        for game in games:
+            free_cells = np.flatnonzero(self.occupancy[game].ravel() == 0)
+            if free_cells.size == 0:
+                continue
+            cell = int(free_cells[self.rngs[game].integers(free_cells.size)])
+            self.apple_x[game], self.apple_y[game] = divmod(cell, self.rows)
+
+    def _finish_games(self) -> None:
+        """End the games that collided or played too long without eating an apple.
+
+        The loss of the ended games is processed as in AiGameMode.process_score.
+        """
+        step_limit = self.game_settings.step_limit
+        ending = self.alive & (
+            self.collided
+            | ((self.steps_without_apple >= step_limit) & (step_limit >= 0))
+        )
+        games = np.flatnonzero(ending)
+        if games.size == 0:
+            return
+        self.alive[games] = False
+        self.loss[games[self.collided[games]]] -= self.game_settings.collision_penalty
+        self.loss[games] += self.steps_total[games]
+        exploration_minimum = self.direction_counts[games].min(axis=1)
+        explored = exploration_minimum > 0
+        explorers = games[explored]
+        self.loss[explorers] += np.abs(self.loss[explorers]) * np.sqrt(
+            exploration_minimum[explored] + 1
+        )
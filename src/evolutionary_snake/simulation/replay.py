@@ -0,0 +1,62 @@
+"""Compact replays of games, stored as JSON lines."""
+
+import base64
+import json
+import pathlib
+import typing
+import zlib
+
+REPLAY_DIRNAME = "replays"
+
+
+class Replay(typing.NamedTuple):
+    """The settings, seed and directions needed to re-simulate a game.
+
+    The directions hold a byte per step with the value of the direction the game
+    chose. Together with the seed in the game settings, they reproduce every step
+    of the game without the network that played it.
+    """
+
+    name: str
+    game_settings: dict[str, typing.Any]
+    directions: bytes
+    score: int
+
+    @property
+    def steps(self) -> int:
+        """Return the number of steps of the game."""
+        return len(self.directions)
+
+
+def append_replay(path_replays: pathlib.Path, replay: Replay) -> None:
+    """Append a replay to a JSON lines file, compressing its directions."""
+    path_replays.parent.mkdir(parents=True, exist_ok=True)
+    line = {
+        "name": replay.name,
+        "game_settings": replay.game_settings,
+        "score": replay.score,
+        "directions": base64.b64encode(zlib.compress(replay.directions)).decode(),
+    }
+    with path_replays.open("a", encoding="utf-8") as file:
+        file.write(json.dumps(line) + "\n")
+
+
+def read_replays(path: pathlib.Path) -> list[Replay]:
+    """Read the replays of a file, or of all files in a directory and below."""
+    path = pathlib.Path(path)
+    paths_replays = sorted(path.rglob("*.jsonl")) if path.is_dir() else [path]
+    replays: list[Replay] = []
+    for path_replays in paths_replays:
+        with path_replays.open(encoding="utf-8") as file:
+            replays.extend(_replay_from_line(json.loads(line)) for line in file)
+    return replays
+
+
+def _replay_from_line(line: dict[str, typing.Any]) -> Replay:
+    """Create a replay from a line written by append_replay."""
+    return Replay(
+        name=line["name"],
+        game_settings=line["game_settings"],
+        directions=zlib.decompress(base64.b64decode(line["directions"])),
+        score=line["score"],
+    )
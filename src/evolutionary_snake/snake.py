@@ -4,11 +4,13 @@ import operator
 import pathlib
 import typing
 
-import neat
-from neat import nn
-
-from evolutionary_snake import game_modes
+from evolutionary_snake import game_modes, simulation
 from evolutionary_snake.game_modes import base_game_mode
+from evolutionary_snake.machine_learning import (
+    checkpointing,
+    compiled_network,
+    genome_index,
+)
 from evolutionary_snake.settings import game_settings
 from evolutionary_snake.utils import enums, utility_functions
 
@@ -41,20 +43,47 @@ GamaModeDict: dict[enums.GameMode, GameModeFactory] = {
 
 
 def _get_neural_net_from_checkpoint(
-    path_checkpoint: pathlib.Path,
-) -> nn.FeedForwardNetwork:
-    """Create a neural network from a checkpoint."""
-    checkpoint = neat.Checkpointer.restore_checkpoint(path_checkpoint).population
+    path_checkpoint: pathlib.Path, rank: int = 1
+) -> compiled_network.CompiledNetwork:
+    """Create a neural network from a checkpoint.
+
+    A run directory or a genome index selects the genome of the given rank from the
+    index of the best genomes, a checkpoint file the genome with the highest fitness
+    of its population.
+    """
+    path_checkpoint = pathlib.Path(path_checkpoint)
+    if path_checkpoint.is_dir() or path_checkpoint.name == genome_index.INDEX_FILENAME:
+        return _get_neural_net_from_index(path_checkpoint, rank=rank)
+    checkpoint = checkpointing.load_genomes(path_checkpoint)
     path_neat_config = pathlib.Path(path_checkpoint).parent / "neat_config"
     neat_config = utility_functions.get_neat_config(path_neat_config)
     d = {k: v.fitness for k, v in checkpoint.items() if v.fitness is not None}
     best_genome_key = max(d.items(), key=operator.itemgetter(1))[0]
     genome = checkpoint[best_genome_key]
-    return nn.FeedForwardNetwork.create(genome, neat_config)
+    return compiled_network.CompiledNetwork.create(genome, neat_config)
+
+
+def _get_neural_net_from_index(
+    path_index: pathlib.Path, rank: int
+) -> compiled_network.CompiledNetwork:
+    """Create a neural network from the genome of the given rank in an index."""
+    entries = genome_index.top_genomes(path_index, k=rank)
+    if len(entries) < rank:
+        msg = f"{path_index} holds fewer than {rank} genomes."
+        raise ValueError(msg)
+    entry = entries[rank - 1]
+    if genome_index.get_config_hash(entry.path_neat_config) != entry.config_hash:
+        msg = f"Genome {entry.genome_key} was trained with another neat config."
+        raise ValueError(msg)
+    neat_config = utility_functions.get_neat_config(entry.path_neat_config)
+    genome = genome_index.deserialize_genome(entry.genome_key, entry.genome)
+    return compiled_network.CompiledNetwork.create(genome, neat_config)
 
 
 def run_snake(
-    game_mode: enums.GameMode, path_checkpoint: pathlib.Path | None = None
+    game_mode: enums.GameMode,
+    path_checkpoint: pathlib.Path | None = None,
+    rank: int = 1,
 ) -> None:
     """Main entry point to run snake."""
     game_mode_factory = GamaModeDict.get(game_mode)
@@ -62,12 +91,39 @@ def run_snake(
         message = f"Unknown game mode {game_mode}"
         raise KeyError(message)
 
-    kwargs = {}
+    kwargs: dict[str, typing.Any] = {}
     if path_checkpoint:
-        kwargs["neural_net"] = _get_neural_net_from_checkpoint(path_checkpoint)
+        kwargs["neural_net"] = _get_neural_net_from_checkpoint(
+            path_checkpoint, rank=rank
+        )
     game = game_mode_factory(**kwargs)
     return game.run()
 
 
+def run_replay(
+    path_replays: pathlib.Path,
+    index: int = 0,
+    frames: range | None = None,
+    *,
+    headless: bool = False,
+    path_frames: pathlib.Path | None = None,
+) -> game_modes.ReplayGameMode:
+    """Re-simulate a recorded game and return the finished replay game mode.
+
+    The replay is selected by its index in a replay file, or in all replay files
+    of a directory. Only the given frame range is rendered, and exported to a PNG
+    image sequence or an animated GIF when a path to frames is given.
+    """
+    replays = simulation.read_replays(path_replays)
+    if not 0 <= index < len(replays):
+        msg = f"{path_replays} holds {len(replays)} replays, not replay {index}."
+        raise IndexError(msg)
+    game = game_modes.ReplayGameMode(
+        replays[index], headless=headless, frames=frames, path_frames=path_frames
+    )
+    game.run()
+    return game
+
+
 if __name__ == "__main__":  # pragma: no cover
     run_snake(game_mode=enums.GameMode.HUMAN_PLAYER)
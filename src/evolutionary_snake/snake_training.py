@@ -1,113 +1,595 @@
 """Main entry point to run evolutionary snake."""
 
+import collections.abc
+import contextlib
 import functools
 import logging
 import multiprocessing
+import multiprocessing.pool
+import os
+import pathlib
+import queue
+import secrets
+import tempfile
 import typing
 
 import neat
+import numpy as np
+import numpy.typing as npt
 
-from evolutionary_snake import game_modes, settings
+from evolutionary_snake import (
+    distributed,
+    game_canvas,
+    game_modes,
+    settings,
+    simulation,
+)
+from evolutionary_snake.machine_learning import (
+    checkpointing,
+    compiled_network,
+    feature_names,
+    fitness_caching,
+    fitness_evaluation,
+    genome_index,
+    loop_detection,
+    population_network,
+    profiling,
+    steady_state,
+    successive_halving,
+)
 from evolutionary_snake.settings import TrainingSettings
-from evolutionary_snake.utils import enums
+from evolutionary_snake.utils import enums, utility_functions
 
 GenomesType: typing.TypeAlias = list[tuple[int, neat.DefaultGenome]]  # noqa: UP040
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
 
+# The training modes that play every game in a game mode of this process or of its
+# worker pool, the only modes that profile, show, report loops and cache fitness
+SEQUENTIAL_LIKE_MODES = (enums.TrainingMode.SEQUENTIAL, enums.TrainingMode.PARALLEL)
+
+
 def _run_snake(
     game_settings: settings.AiGameSettings,
-    genome: neat.DefaultGenome,
-    genome_id: int,
-    genome_dict: dict[int, neat.DefaultGenome],
-) -> neat.DefaultGenome:
-    """Run a snake game with a neural network."""
+    profile_report: profiling.ProfileReport | None = None,
+    canvas: game_canvas.GameRenderer | None = None,
+    loop_report: loop_detection.LoopReport | None = None,
+) -> float:
+    """Run a snake game with a neural network and return its fitness.
+
+    When a profile report is given, the profile of the game is added to it. When a
+    canvas is given, the game is rendered on it instead of its own canvas. When a
+    loop report is given, whether the game ended in a loop is added to it.
+    """
     snake_game = game_modes.AiGameMode(game_settings=game_settings)
+    if canvas is not None:
+        snake_game.canvas = canvas
     snake_game.run()
-    genome.fitness = snake_game.loss_tracker.loss
-    genome_dict[genome_id] = genome
-    return genome
+    if profile_report is not None:
+        profile_report.add(snake_game.profiler.report())
+    if loop_report is not None:
+        loop_report.add_game(
+            looped=snake_game.looped,
+            steps_saved=snake_game.loss_tracker.steps_saved,
+        )
+    return snake_game.loss_tracker.loss
 
 
-def _eval_genomes_sequential(
-    genomes: GenomesType,
+def _evaluate_genome(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    genome_item: tuple[int, neat.DefaultGenome],
     neat_config: neat.Config,
-    step_limit: int,
-) -> None:
-    """Evaluate genomes sequentially."""
-    genome_dict: dict[int, neat.DefaultGenome] = {}
-    for genome_id, genome in genomes:
-        neural_net = neat.nn.FeedForwardNetwork.create(genome, neat_config)
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan,
+    *,
+    screen_index: int | None = None,
+    profile_report: profiling.ProfileReport | None = None,
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] | None = None,
+    loop_report: loop_detection.LoopReport | None = None,
+) -> float:
+    """Evaluate a single genome on the planned episodes and return its fitness.
+
+    When the genome can no longer beat the elite, the remaining episodes are
+    skipped and its fitness is aggregated from the episodes it played. When a
+    profile report is given, the games of the genome are profiled and added to it.
+    When replays are recorded, the replay of every game is saved next to the
+    checkpoints. With a snapshot queue, the games are played headless and shown on
+    the tile of the screen index in the mosaic viewer. When a loop report is given,
+    the games that ended in a loop are added to it.
+    """
+    genome_id, genome = genome_item
+    neural_net = compiled_network.CompiledNetwork.create(genome, neat_config)
+    # every worker process appends the replays of its games to its own file
+    path_replays = (
+        training_settings.checkpoint_prefix.parent
+        / simulation.REPLAY_DIRNAME
+        / f"replays-{os.getpid()}.jsonl"
+        if training_settings.record_replays
+        else None
+    )
+    fitnesses: list[float] = []
+    for seed in episode_plan.seeds:
         game_settings = settings.AiGameSettings(
             name=f"snake_{str(genome_id).zfill(2)}",
             neural_net=neural_net,
             run_in_background=False,
-            step_limit=step_limit,
+            headless=training_settings.headless or snapshot_queue is not None,
+            step_limit=training_settings.step_limit,
+            features=training_settings.features,
+            reachable_area_score=training_settings.reachable_area_score,
+            detect_loops=training_settings.detect_loops,
+            loop_penalty=training_settings.loop_penalty,
+            profile=profile_report is not None,
+            seed=seed,
+            path_replays=path_replays,
+        )
+        if screen_index is not None:
+            game_settings.display_y = 100 + int(
+                1.1
+                * game_settings.display_height
+                * (screen_index // game_settings.screens_per_row)
+            )
+            game_settings.display_x = int(
+                1.1
+                * game_settings.display_width
+                * (screen_index % game_settings.screens_per_row)
+            )
+        fitnesses.append(
+            _run_snake(
+                game_settings=game_settings,
+                profile_report=profile_report,
+                canvas=_create_tile_canvas(
+                    snapshot_queue, screen_index, game_settings, training_settings
+                ),
+                loop_report=loop_report,
+            )
+        )
+        if episode_plan.elite_fitness is not None and fitness_evaluation.cannot_beat(
+            fitnesses, episode_plan.elite_fitness, training_settings
+        ):
+            break
+    return float(fitness_evaluation.aggregate_fitness(fitnesses, training_settings))
+
+
+def _create_tile_canvas(
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] | None,
+    screen_index: int | None,
+    game_settings: settings.AiGameSettings,
+    training_settings: settings.TrainingSettings,
+) -> game_canvas.TileCanvas | None:
+    """Return the canvas of the tile of the screen index, None without a queue."""
+    if snapshot_queue is None:
+        return None
+    return game_canvas.TileCanvas(
+        snapshot_queue,
+        tile=screen_index or 0,
+        game_settings=game_settings,
+        refresh_fps=training_settings.mosaic_refresh_fps,
+    )
+
+
+def _evaluate_genome_on_screen(
+    indexed_genome_item: tuple[int, tuple[int, neat.DefaultGenome]],
+    neat_config: neat.Config,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan,
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] | None = None,
+) -> tuple[float, profiling.ProfileReport | None, loop_detection.LoopReport | None]:
+    """Evaluate a genome in a worker, tiling its window or tile by the genome index.
+
+    Returns the fitness of the genome and, when profiling, the profile of its games
+    and, when detecting loops, the loop report of its games.
+    """
+    screen_index, genome_item = indexed_genome_item
+    profile_report = profiling.ProfileReport() if training_settings.profile else None
+    loop_report = (
+        loop_detection.LoopReport() if training_settings.detect_loops else None
+    )
+    fitness = _evaluate_genome(
+        genome_item=genome_item,
+        neat_config=neat_config,
+        training_settings=training_settings,
+        episode_plan=episode_plan,
+        screen_index=screen_index,
+        profile_report=profile_report,
+        snapshot_queue=snapshot_queue,
+        loop_report=loop_report,
+    )
+    return fitness, profile_report, loop_report
+
+
+def _add_profile(
+    profile_reporter: profiling.ProfileReporter | None,
+    genome_id: int,
+    profile_report: profiling.ProfileReport | None,
+) -> None:
+    """Add the profile of a genome to the reporter, if both are there."""
+    if profile_reporter is not None and profile_report is not None:
+        profile_reporter.add(genome_id, profile_report)
+
+
+def _add_loops(
+    loop_reporter: loop_detection.LoopReporter | None,
+    loop_report: loop_detection.LoopReport | None,
+) -> None:
+    """Add the loop report of a genome to the reporter, if both are there."""
+    if loop_reporter is not None and loop_report is not None:
+        loop_reporter.add(loop_report)
+
+
+def _assign_results(
+    genomes: GenomesType,
+    results: list[
+        tuple[float, profiling.ProfileReport | None, loop_detection.LoopReport | None]
+    ],
+    profile_reporter: profiling.ProfileReporter | None,
+    loop_reporter: loop_detection.LoopReporter | None,
+) -> None:
+    """Assign the fitness of every genome and add its profile and loops."""
+    for (genome_id, genome), (fitness, profile_report, loop_report) in zip(
+        genomes, results, strict=True
+    ):
+        genome.fitness = fitness
+        _add_profile(profile_reporter, genome_id, profile_report)
+        _add_loops(loop_reporter, loop_report)
+
+
+def _eval_genomes_sequential(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    genomes: GenomesType,
+    neat_config: neat.Config,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan | None = None,
+    profile_reporter: profiling.ProfileReporter | None = None,
+    *,
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] | None = None,
+    loop_reporter: loop_detection.LoopReporter | None = None,
+) -> None:
+    """Evaluate genomes sequentially.
+
+    When profiling, the profile of every genome is added to the profile reporter.
+    With a snapshot queue, every genome is shown on its tile of the mosaic viewer.
+    When detecting loops, the loops of every genome are added to the loop reporter.
+    """
+    episode_plan = episode_plan or fitness_evaluation.plan_episodes(training_settings)
+    for screen_index, (genome_id, genome) in enumerate(genomes):
+        profile_report = (
+            profiling.ProfileReport() if training_settings.profile else None
+        )
+        loop_report = (
+            loop_detection.LoopReport() if training_settings.detect_loops else None
         )
-        genome_evaluated = _run_snake(
-            game_settings=game_settings,
-            genome=genome,
-            genome_id=genome_id,
-            genome_dict=genome_dict,
+        genome.fitness = _evaluate_genome(
+            genome_item=(genome_id, genome),
+            neat_config=neat_config,
+            training_settings=training_settings,
+            episode_plan=episode_plan,
+            screen_index=screen_index,
+            profile_report=profile_report,
+            snapshot_queue=snapshot_queue,
+            loop_report=loop_report,
         )
-        genome_dict[genome_id] = genome_evaluated
+        _add_profile(profile_reporter, genome_id, profile_report)
+        _add_loops(loop_reporter, loop_report)
 
 
-def _eval_genomes_parallel(
-    genomes: list[tuple[int, neat.DefaultGenome]],
+def _eval_genomes_parallel(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    genomes: GenomesType,
     neat_config: neat.config.Config,
-    step_limit: int,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan | None = None,
+    *,
+    pool: multiprocessing.pool.Pool | None = None,
+    profile_reporter: profiling.ProfileReporter | None = None,
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] | None = None,
+    loop_reporter: loop_detection.LoopReporter | None = None,
 ) -> None:
-    """Evaluate genomes in parallel."""
-    jobs: list[multiprocessing.Process] = []
-    job_names: dict[str, int] = {}
+    """Evaluate genomes in parallel on a pool of worker processes.
 
-    genome_dict = multiprocessing.Manager().dict()
-    for i, (genome_id, genome) in enumerate(genomes):
-        neural_net = neat.nn.FeedForwardNetwork.create(genome, neat_config)
-        game_settings = settings.AiGameSettings(
-            name=f"snake_{str(genome_id).zfill(2)}",
-            neural_net=neural_net,
-            run_in_background=False,
-            step_limit=step_limit,
+    The pool is normally created once by run_snake_training and reused for every
+    generation. Without a pool, a temporary one is created for this call only.
+    When profiling, the workers send back the profile of every genome, which is
+    added to the profile reporter. With a snapshot queue, the workers show every
+    genome on its tile of the mosaic viewer. When detecting loops, the workers send
+    back the loops of every genome, which are added to the loop reporter.
+    """
+    if pool is None:
+        with worker_pool(training_settings) as temporary_pool:
+            _eval_genomes_parallel(
+                genomes=genomes,
+                neat_config=neat_config,
+                training_settings=training_settings,
+                episode_plan=episode_plan,
+                pool=temporary_pool,
+                profile_reporter=profile_reporter,
+                snapshot_queue=snapshot_queue,
+                loop_reporter=loop_reporter,
+            )
+        return
+
+    episode_plan = episode_plan or fitness_evaluation.plan_episodes(training_settings)
+    results = pool.map(
+        functools.partial(
+            _evaluate_genome_on_screen,
+            neat_config=neat_config,
+            training_settings=training_settings,
+            episode_plan=episode_plan,
+            snapshot_queue=snapshot_queue,
+        ),
+        enumerate(genomes),
+        chunksize=training_settings.chunk_size,
+    )
+    _assign_results(genomes, results, profile_reporter, loop_reporter)
+    msg = (
+        f"All snakes have taken {training_settings.step_limit} steps without "
+        f"taking an apple or collided to itself or the wall"
+    )
+    logger.info(msg)
+
+
+def _eval_genomes_vectorized(
+    genomes: GenomesType,
+    neat_config: neat.config.Config,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan | None = None,
+    *,
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] | None = None,
+) -> None:
+    """Evaluate all genomes in lockstep on a single batch game engine.
+
+    The networks of all genomes are packed into one population network, so every
+    step evaluates the networks of all games in a single vectorized pass. Every
+    genome plays all planned episodes at once, so episodes never stop early. The
+    batch game engine only senses the default features, does not score the
+    reachable area, does not detect loops and is not shown on the mosaic viewer.
+    """
+    del snapshot_queue
+    if training_settings.features != feature_names.DEFAULT_FEATURES:
+        msg = "The vectorized training mode only supports the default features."
+        raise ValueError(msg)
+    if training_settings.reachable_area_score:
+        msg = "The vectorized training mode does not score the reachable area."
+        raise ValueError(msg)
+    if training_settings.detect_loops:
+        msg = "The vectorized training mode does not detect loops."
+        raise ValueError(msg)
+    episode_plan = episode_plan or fitness_evaluation.plan_episodes(training_settings)
+    networks = [
+        compiled_network.CompiledNetwork.create(genome, neat_config)
+        for _, genome in genomes
+    ]
+    network = population_network.PopulationNetwork.create(
+        networks * len(episode_plan.seeds)
+    )
+    seeds = [seed for seed in episode_plan.seeds for _ in genomes]
+    engine = simulation.BatchGameEngine(
+        game_settings=settings.AiGameSettings(
+            headless=True, step_limit=training_settings.step_limit
+        ),
+        n_games=len(seeds),
+        seeds=None if None in seeds else typing.cast("list[int]", seeds),
+    )
+
+    def _policy(
+        input_vectors: npt.NDArray[np.float64], alive: npt.NDArray[np.bool_]
+    ) -> npt.NDArray[np.int64]:
+        del alive
+        directions: npt.NDArray[np.int64] = np.argmax(
+            network.activate(input_vectors), axis=1
         )
-        game_settings.display_y = 100 + int(
-            1.1 * game_settings.display_height * (i // game_settings.screens_per_row)
+        return directions
+
+    fitnesses = fitness_evaluation.aggregate_fitness(
+        engine.run(_policy).reshape(len(episode_plan.seeds), len(genomes)),
+        training_settings,
+    )
+    for (_, genome), fitness in zip(genomes, fitnesses.tolist(), strict=True):
+        genome.fitness = fitness
+    msg = (
+        f"{len(genomes)} snakes finished with a mean score of {engine.score.mean()} "
+        f"after {engine.steps_total.sum()} steps in total"
+    )
+    logger.info(msg)
+
+
+def _eval_genomes_distributed(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    genomes: GenomesType,
+    neat_config: neat.config.Config,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan | None = None,
+    broker: distributed.Broker | None = None,
+    *,
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] | None = None,
+) -> None:
+    """Evaluate genomes on workers that connect to a broker over TCP.
+
+    The broker is normally created once by run_snake_training and reused for every
+    generation. Without a broker, a temporary one is created for this call only.
+    The neat config, the training settings and the episode plan are sent to every
+    worker once per generation, followed by the genomes it evaluates. The games on
+    the workers are not shown on the mosaic viewer.
+    """
+    del snapshot_queue
+    if broker is None:
+        with distributed_broker(training_settings) as temporary_broker:
+            _eval_genomes_distributed(
+                genomes=genomes,
+                neat_config=neat_config,
+                training_settings=training_settings,
+                episode_plan=episode_plan,
+                broker=temporary_broker,
+            )
+        return
+
+    episode_plan = episode_plan or fitness_evaluation.plan_episodes(training_settings)
+    with tempfile.TemporaryDirectory() as path_directory:
+        path_neat_config = pathlib.Path(path_directory) / "neat_config"
+        neat_config.save(path_neat_config)
+        neat_config_text = path_neat_config.read_text(encoding="utf-8")
+    context = {
+        "neat_config": neat_config_text,
+        "training_settings": training_settings.model_dump(
+            mode="json", exclude={"checkpoint_prefix", "path_neat_config"}
+        ),
+        "seeds": list(episode_plan.seeds),
+        "elite_fitness": episode_plan.elite_fitness,
+    }
+    payloads = [
+        {"genome_key": genome_id, "genome": genome_index.serialize_genome(genome)}
+        for genome_id, genome in genomes
+    ]
+    for index, fitness in broker.imap_unordered(payloads, context=context):
+        genomes[index][1].fitness = fitness
+
+
+def create_task_evaluator(
+    context: dict[str, typing.Any],
+) -> collections.abc.Callable[[dict[str, typing.Any]], float]:
+    """Create the function a distributed worker evaluates genomes with.
+
+    The context is sent by _eval_genomes_distributed once per generation.
+    """
+    with tempfile.TemporaryDirectory() as path_directory:
+        path_neat_config = pathlib.Path(path_directory) / "neat_config"
+        path_neat_config.write_text(context["neat_config"], encoding="utf-8")
+        neat_config = utility_functions.get_neat_config(path_neat_config)
+    training_settings = settings.TrainingSettings(
+        **context["training_settings"],
+        checkpoint_prefix=pathlib.Path(tempfile.gettempdir()) / "checkpoint-",
+    )
+    episode_plan = fitness_evaluation.EpisodePlan(
+        seeds=tuple(context["seeds"]), elite_fitness=context["elite_fitness"]
+    )
+
+    def _evaluate_task(payload: dict[str, typing.Any]) -> float:
+        genome = genome_index.deserialize_genome(
+            payload["genome_key"], payload["genome"]
         )
-        game_settings.display_x = int(
-            1.1 * (game_settings.display_width * (i % game_settings.screens_per_row))
+        return _evaluate_genome(
+            genome_item=(genome.key, genome),
+            neat_config=neat_config,
+            training_settings=training_settings,
+            episode_plan=episode_plan,
         )
 
-        p = multiprocessing.Process(
-            target=_run_snake,
+    return _evaluate_task
+
+
+def _submit_steady_state(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    genome_item: steady_state.GenomeItemType,
+    elite_fitness: float | None,
+    callback: steady_state.ResultCallback,
+    *,
+    pool: multiprocessing.pool.Pool,
+    neat_config: neat.config.Config,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan,
+) -> None:
+    """Start the evaluation of a genome of a steady-state population on the pool.
+
+    All genomes play the same episodes. When episodes are pruned, a genome stops
+    playing once it can no longer beat the worst genome of the population, which it
+    has to replace to be kept.
+    """
+    pool.apply_async(
+        _evaluate_genome,
+        kwds={
+            "genome_item": genome_item,
+            "neat_config": neat_config,
+            "training_settings": training_settings,
+            "episode_plan": episode_plan._replace(elite_fitness=elite_fitness),
+        },
+        callback=callback,
+        error_callback=callback,
+    )
+
+
+@contextlib.contextmanager
+def distributed_broker(
+    training_settings: settings.TrainingSettings,
+) -> collections.abc.Iterator[distributed.Broker]:
+    """Provide a broker that distributed workers connect to.
+
+    Workers on other machines are started with the training-worker command. Next to
+    those, TrainingSettings.local_workers worker processes are started on this
+    machine. Idle workers are shut down once the training has finished.
+    """
+    broker = distributed.Broker(
+        host=training_settings.broker_host,
+        port=training_settings.broker_port,
+        heartbeat_timeout=training_settings.heartbeat_timeout,
+    )
+    processes = [
+        multiprocessing.Process(
+            target=distributed.run_worker,
             kwargs={
-                "game_settings": game_settings,
-                "genome": genome,
-                "genome_id": genome_id,
-                "genome_dict": genome_dict,
+                "host": broker.host,
+                "port": broker.port,
+                "create_evaluator": create_task_evaluator,
             },
+            daemon=True,
         )
-        job_names[p.name] = genome_id
-        jobs.append(p)
-        p.start()
+        for _ in range(training_settings.local_workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        yield broker
+    finally:
+        broker.close()
+        for process in processes:
+            process.join()
 
-    while True:
-        snakes_alive = [p for p in jobs if p.is_alive()]
-        if len(snakes_alive) == 0:
-            msg = (
-                f"All snakes have taken {step_limit} steps without taking an apple "
-                f"or collided to itself or the wall"
-            )
 
-            logger.info(msg)
-            break
+@contextlib.contextmanager
+def worker_pool(
+    training_settings: settings.TrainingSettings,
+) -> collections.abc.Iterator[multiprocessing.pool.Pool]:
+    """Provide a pool of worker processes used for parallel evaluation.
 
-    for p in jobs:
-        p.join()
+    The pool is sized to the number of cores unless TrainingSettings.workers is set.
+    Workers are shut down gracefully once the training has finished.
+    """
+    pool = multiprocessing.Pool(processes=training_settings.workers)
+    try:
+        yield pool
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
 
-    for genome_id, genome in genomes:
-        genome.fitness = genome_dict[genome_id].fitness
+
+@contextlib.contextmanager
+def mosaic_viewer(
+    training_settings: settings.TrainingSettings,
+) -> collections.abc.Iterator[queue.Queue[game_canvas.GameSnapshot | None]]:
+    """Provide the snapshot queue of a mosaic viewer with a tile for every genome.
+
+    The viewer runs in its own process, so rendering never slows down evaluation.
+    Its queue is shared through a manager, so it can be sent to pool workers. The
+    viewer is stopped once the training has finished.
+    """
+    n_tiles = training_settings.neat_config.pop_size
+    with multiprocessing.Manager() as manager:
+        # the queue holds a few snapshots per genome, the rest are dropped
+        snapshot_queue = manager.Queue(maxsize=4 * n_tiles)
+        process = multiprocessing.Process(
+            target=game_canvas.run_mosaic_viewer,
+            args=(
+                snapshot_queue,
+                n_tiles,
+                settings.GameSettings(),
+                training_settings.mosaic_refresh_fps,
+            ),
+        )
+        process.start()
+        try:
+            yield snapshot_queue
+        finally:
+            snapshot_queue.put(None)
+            process.join()
 
 
 class EvaluationFunction(typing.Protocol):  # pylint: disable=too-few-public-methods
@@ -115,46 +597,391 @@ class EvaluationFunction(typing.Protocol):  # pylint: disable=too-few-public-met
 
     def __call__(
         self,
-        genomes: list[tuple[int, neat.DefaultGenome]],
+        genomes: GenomesType,
         neat_config: neat.config.Config,
-        step_limit: int,
+        training_settings: settings.TrainingSettings,
+        episode_plan: fitness_evaluation.EpisodePlan | None = None,
+        *,
+        snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] | None = None,
     ) -> None:
-        """Run the training evaluation function."""
+        """Run the training evaluation function, showing its games on the queue."""
+
+
+def _eval_genomes_successive_halving(
+    genomes: GenomesType,
+    neat_config: neat.config.Config,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan | None = None,
+    *,
+    evaluation_function: EvaluationFunction,
+    **evaluation_kwargs: typing.Any,  # noqa: ANN401
+) -> None:
+    """Race the genomes through rungs of growing budgets with successive halving.
+
+    All genomes play the first rung on a short budget and only the fittest genomes
+    of every rung play the next one, so most genomes are culled cheaply. Every rung
+    is evaluated by the evaluation function of the training mode, on the first
+    episodes of the plan. Episodes only stop early on the last rung, which plays the
+    full budget the elite fitness was measured on.
+    """
+    episode_plan = episode_plan or fitness_evaluation.plan_episodes(training_settings)
+    rungs = successive_halving.plan_rungs(len(genomes), training_settings)
+    rung_fitnesses: list[dict[int, float]] = []
+    rung_genomes = genomes
+    for rung in rungs:
+        if rung_fitnesses:
+            promoted = successive_halving.promote(rung_fitnesses[-1], rung.n_genomes)
+            rung_genomes = [item for item in rung_genomes if item[0] in promoted]
+        evaluation_function(
+            genomes=rung_genomes,
+            neat_config=neat_config,
+            training_settings=training_settings.model_copy(
+                update={"step_limit": rung.step_limit, "episodes": rung.episodes}
+            ),
+            episode_plan=fitness_evaluation.EpisodePlan(
+                seeds=episode_plan.seeds[: rung.episodes],
+                elite_fitness=episode_plan.elite_fitness if rung is rungs[-1] else None,
+            ),
+            **evaluation_kwargs,
+        )
+        rung_fitnesses.append({key: genome.fitness for key, genome in rung_genomes})
+    fitness = successive_halving.assign_fitness(rung_fitnesses)
+    for genome_id, genome in genomes:
+        genome.fitness = fitness[genome_id]
+    msg = (
+        f"Successive halving raced {len(genomes)} genomes through rungs of "
+        f"{[rung.n_genomes for rung in rungs]} genomes"
+    )
+    logger.info(msg)
+
+
+def _eval_genomes_pruned(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    genomes: GenomesType,
+    neat_config: neat.config.Config,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan | None = None,
+    *,
+    evaluation_function: EvaluationFunction,
+    elite_evaluation_function: EvaluationFunction | None = None,
+    **evaluation_kwargs: typing.Any,  # noqa: ANN401
+) -> None:
+    """Evaluate the elites first and prune the episodes of the other genomes.
+
+    The elites carried over from the previous generation, the genomes that still
+    have a fitness, play all episodes of this generation first. The other genomes
+    stop playing once they cannot beat the best elite on the same episodes.
+    Episodes without a seed are random games, which prove nothing, so they are
+    never pruned. With an elite evaluation function, the elites are evaluated by it
+    instead, so with successive halving they play the full budget outside the race
+    of the other genomes.
+    """
+    episode_plan = episode_plan or fitness_evaluation.plan_episodes(training_settings)
+    elites = [item for item in genomes if item[1].fitness is not None]
+    offspring = [item for item in genomes if item[1].fitness is None]
+    if not elites or None in episode_plan.seeds:
+        evaluation_function(
+            genomes=genomes,
+            neat_config=neat_config,
+            training_settings=training_settings,
+            episode_plan=episode_plan._replace(elite_fitness=None),
+            **evaluation_kwargs,
+        )
+        return
+    (elite_evaluation_function or evaluation_function)(
+        genomes=elites,
+        neat_config=neat_config,
+        training_settings=training_settings,
+        episode_plan=episode_plan._replace(elite_fitness=None),
+        **evaluation_kwargs,
+    )
+    if offspring:
+        evaluation_function(
+            genomes=offspring,
+            neat_config=neat_config,
+            training_settings=training_settings,
+            episode_plan=episode_plan._replace(
+                elite_fitness=max(genome.fitness for _, genome in elites)
+            ),
+            **evaluation_kwargs,
+        )
+
+
+def _lookup_fitnesses(
+    genomes: GenomesType,
+    keys: dict[int, str],
+    fitness_cache: fitness_caching.FitnessCache,
+) -> tuple[dict[str, float], dict[str, tuple[int, neat.DefaultGenome]]]:
+    """Return the cached fitness of the keys and a genome of every uncached key."""
+    fitnesses: dict[str, float] = {}
+    uncached: dict[str, tuple[int, neat.DefaultGenome]] = {}
+    for genome_id, genome in genomes:
+        key = keys[genome_id]
+        if key in fitnesses or key in uncached:
+            continue
+        fitness = fitness_cache.get(key)
+        if fitness is None:
+            uncached[key] = (genome_id, genome)
+        else:
+            fitnesses[key] = fitness
+    return fitnesses, uncached
+
+
+def _eval_genomes_cached(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    genomes: GenomesType,
+    neat_config: neat.config.Config,
+    training_settings: settings.TrainingSettings,
+    episode_plan: fitness_evaluation.EpisodePlan | None = None,
+    *,
+    evaluation_function: EvaluationFunction,
+    fitness_cache: fitness_caching.FitnessCache,
+    **evaluation_kwargs: typing.Any,  # noqa: ANN401
+) -> None:
+    """Evaluate only the genomes whose fitness is not cached for the same episodes.
+
+    Elites and offspring identical to another genome reuse the fitness of the first
+    evaluation of their network under the same settings and seeds, the other
+    genomes are evaluated by the evaluation function of the training mode. Only a
+    fitness above the elite fitness is known to be of all episodes, so the fitness
+    of a genome that may have been pruned is not cached. Episodes without a seed
+    are random games, so their fitness is never cached.
+    """
+    episode_plan = episode_plan or fitness_evaluation.plan_episodes(training_settings)
+    if None in episode_plan.seeds:
+        evaluation_function(
+            genomes=genomes,
+            neat_config=neat_config,
+            training_settings=training_settings,
+            episode_plan=episode_plan,
+            **evaluation_kwargs,
+        )
+        return
+    conditions = fitness_caching.conditions_hash(training_settings, episode_plan)
+    keys = {
+        genome_id: fitness_cache.key(genome, conditions)
+        for genome_id, genome in genomes
+    }
+    fitnesses, uncached = _lookup_fitnesses(genomes, keys, fitness_cache)
+    if uncached:
+        evaluation_function(
+            genomes=list(uncached.values()),
+            neat_config=neat_config,
+            training_settings=training_settings,
+            episode_plan=episode_plan,
+            **evaluation_kwargs,
+        )
+    for key, (_, genome) in uncached.items():
+        fitnesses[key] = genome.fitness
+        if (
+            episode_plan.elite_fitness is None
+            or genome.fitness > episode_plan.elite_fitness
+        ):
+            fitness_cache.put(key, genome.fitness)
+    for genome_id, genome in genomes:
+        genome.fitness = fitnesses[keys[genome_id]]
+    msg = (
+        f"The fitness cache skipped {len(genomes) - len(uncached)} of "
+        f"{len(genomes)} genomes"
+    )
+    logger.info(msg)
 
 
 TrainingFunctionsDict: dict[enums.TrainingMode, EvaluationFunction] = {
     enums.TrainingMode.SEQUENTIAL: _eval_genomes_sequential,
     enums.TrainingMode.PARALLEL: _eval_genomes_parallel,
+    enums.TrainingMode.VECTORIZED: _eval_genomes_vectorized,
+    enums.TrainingMode.DISTRIBUTED: _eval_genomes_distributed,
 }
 
 
+def _enter_evaluation_context(
+    stack: contextlib.ExitStack,
+    training_mode: enums.TrainingMode,
+    training_settings: settings.TrainingSettings,
+    profile_reporter: profiling.ProfileReporter | None,
+    loop_reporter: loop_detection.LoopReporter | None,
+) -> dict[str, typing.Any]:
+    """Enter the contexts the evaluation function needs and return its kwargs.
+
+    The contexts, like the worker pool, stay open for all generations and are
+    closed by the stack once the training has finished.
+    """
+    evaluation_kwargs: dict[str, typing.Any] = {}
+    if profile_reporter is not None:
+        evaluation_kwargs["profile_reporter"] = profile_reporter
+    if loop_reporter is not None:
+        evaluation_kwargs["loop_reporter"] = loop_reporter
+    if training_settings.mosaic_viewer and training_mode in SEQUENTIAL_LIKE_MODES:
+        evaluation_kwargs["snapshot_queue"] = stack.enter_context(
+            mosaic_viewer(training_settings)
+        )
+    if training_mode == enums.TrainingMode.PARALLEL:
+        evaluation_kwargs["pool"] = stack.enter_context(worker_pool(training_settings))
+    if training_mode == enums.TrainingMode.DISTRIBUTED:
+        evaluation_kwargs["broker"] = stack.enter_context(
+            distributed_broker(training_settings)
+        )
+    return evaluation_kwargs
+
+
+def _get_evaluation_function(
+    training_mode: enums.TrainingMode,
+    training_settings: settings.TrainingSettings,
+    fitness_cache: fitness_caching.FitnessCache | None,
+) -> EvaluationFunction:
+    """Return the evaluation function of the training mode with its wrappers."""
+    evaluation_function = TrainingFunctionsDict[training_mode]
+    # rungs of successive halving play other episodes, so each rung is cached
+    if fitness_cache is not None:
+        evaluation_function = functools.partial(
+            _eval_genomes_cached,
+            evaluation_function=evaluation_function,
+            fitness_cache=fitness_cache,
+        )
+    # the elites play the full budget, only the other genomes race through the rungs
+    elite_evaluation_function = evaluation_function
+    if training_settings.successive_halving:
+        evaluation_function = functools.partial(
+            _eval_genomes_successive_halving, evaluation_function=evaluation_function
+        )
+    # the elites are evaluated before any other genome, so they wrap all others
+    if (
+        training_settings.prune_episodes
+        and training_mode != enums.TrainingMode.VECTORIZED
+    ):
+        evaluation_function = functools.partial(
+            _eval_genomes_pruned,
+            evaluation_function=evaluation_function,
+            elite_evaluation_function=elite_evaluation_function,
+        )
+    return evaluation_function
+
+
+def _warn_unsupported_settings(
+    training_mode: enums.TrainingMode, training_settings: settings.TrainingSettings
+) -> None:
+    """Warn about the training settings the training mode ignores."""
+    if training_settings.mosaic_viewer and training_mode not in SEQUENTIAL_LIKE_MODES:
+        msg = f"The mosaic viewer is not supported in the {training_mode} training mode"
+        logger.warning(msg)
+    if (
+        training_settings.successive_halving
+        and training_mode == enums.TrainingMode.STEADY_STATE
+    ):
+        msg = "Successive halving is not supported in the steady_state training mode"
+        logger.warning(msg)
+    if training_settings.cache_fitness and training_mode not in SEQUENTIAL_LIKE_MODES:
+        msg = f"Caching fitness is not supported in the {training_mode} training mode"
+        logger.warning(msg)
+
+
 def run_snake_training(
     training_mode: enums.TrainingMode,
     training_settings: settings.TrainingSettings | None = None,
 ) -> None:
     """Main entry point to run snake."""
     training_settings = training_settings or TrainingSettings()
-    population = neat.Population(training_settings.neat_config)
+    training_settings.validate_num_inputs(training_settings.neat_config)
+    # the steady-state population shares the reporters of neat.Population
+    population: neat.Population
+    if training_mode == enums.TrainingMode.STEADY_STATE:
+        # twice as many genomes as workers are evaluated, so workers never wait
+        population = steady_state.SteadyStatePopulation(
+            training_settings.neat_config,
+            max_in_flight=2 * (training_settings.workers or os.cpu_count() or 1),
+            prune_episodes=training_settings.prune_episodes,
+        )
+    else:
+        population = neat.Population(training_settings.neat_config)
 
     # Add a stdout reporter to show progress in the terminal.
     population.add_reporter(neat.StdOutReporter(show_species_detail=True))
     stats = neat.StatisticsReporter()
     population.add_reporter(stats)
+    checkpointer = checkpointing.Checkpointer(
+        filename_prefix=training_settings.checkpoint_prefix,
+        full_snapshot_interval=training_settings.full_snapshot_interval,
+    )
+    population.add_reporter(checkpointer)
+    # the neat config is saved first, so checkpoints can be used during training
+    path_neat_config = training_settings.checkpoint_prefix.parent / "neat_config"
+    training_settings.neat_config.save(path_neat_config)
     population.add_reporter(
-        neat.Checkpointer(
-            generation_interval=1,
-            filename_prefix=training_settings.checkpoint_prefix.as_posix(),
+        genome_index.GenomeIndex(
+            path_index=path_neat_config.parent / genome_index.INDEX_FILENAME,
+            config_hash=genome_index.get_config_hash(path_neat_config),
         )
     )
+    profile_reporter = None
+    if training_settings.profile and training_mode in SEQUENTIAL_LIKE_MODES:
+        profile_reporter = profiling.ProfileReporter(
+            path_report=path_neat_config.parent / profiling.PROFILE_FILENAME
+        )
+        population.add_reporter(profile_reporter)
+    elif training_settings.profile:
+        msg = f"Profiling is not supported in the {training_mode} training mode"
+        logger.warning(msg)
+    loop_reporter = None
+    if training_settings.detect_loops and training_mode in SEQUENTIAL_LIKE_MODES:
+        loop_reporter = loop_detection.LoopReporter()
+        population.add_reporter(loop_reporter)
+    fitness_cache = None
+    if training_settings.cache_fitness and training_mode in SEQUENTIAL_LIKE_MODES:
+        fitness_cache = fitness_caching.FitnessCache(
+            max_size=training_settings.fitness_cache_size,
+            path_cache=training_settings.path_fitness_cache,
+        )
+        population.add_reporter(fitness_cache)
+    _warn_unsupported_settings(training_mode, training_settings)
 
-    training_mode_func = TrainingFunctionsDict[training_mode]
-    population.run(
-        functools.partial(training_mode_func, step_limit=training_settings.step_limit),
-        n=training_settings.generations,
-    )
-    training_settings.neat_config.save(
-        training_settings.checkpoint_prefix.parent / "neat_config"
-    )
+    # every generation plays its own games, shared by all genomes of the generation,
+    # unless the episodes are fixed, so the fitness cache also hits the elites
+    seed = training_settings.seed
+    if seed is None:
+        seed = secrets.randbits(32)
+    msg = f"Training with seed {seed}"
+    logger.info(msg)
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(checkpointer)
+        if training_mode == enums.TrainingMode.STEADY_STATE:
+            population.run(
+                functools.partial(
+                    _submit_steady_state,
+                    pool=stack.enter_context(worker_pool(training_settings)),
+                    neat_config=training_settings.neat_config,
+                    training_settings=training_settings,
+                    episode_plan=fitness_evaluation.plan_episodes(
+                        training_settings, seed=seed
+                    ),
+                ),
+                n=training_settings.generations,
+            )
+            return
+        training_mode_func = _get_evaluation_function(
+            training_mode, training_settings, fitness_cache
+        )
+        evaluation_kwargs = _enter_evaluation_context(
+            stack, training_mode, training_settings, profile_reporter, loop_reporter
+        )
+
+        def _evaluate_generation(
+            genomes: GenomesType, neat_config: neat.Config
+        ) -> None:
+            training_mode_func(
+                genomes=genomes,
+                neat_config=neat_config,
+                training_settings=training_settings,
+                episode_plan=fitness_evaluation.plan_episodes(
+                    training_settings,
+                    generation=0
+                    if training_settings.fixed_episodes
+                    else population.generation,
+                    seed=seed,
+                ),
+                **evaluation_kwargs,
+            )
+
+        population.run(_evaluate_generation, n=training_settings.generations)
 
 
 if __name__ == "__main__":  # pragma: no cover
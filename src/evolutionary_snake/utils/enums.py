@@ -31,3 +31,37 @@ class TrainingMode(enum.StrEnum):
 
     SEQUENTIAL = "sequential"
     PARALLEL = "parallel"
+    VECTORIZED = "vectorized"
+    DISTRIBUTED = "distributed"
+    STEADY_STATE = "steady_state"
+
+
+class FitnessAggregation(enum.StrEnum):
+    """Enum to define how the fitness of multiple episodes is aggregated."""
+
+    MEAN = "mean"
+    MIN = "min"
+    QUANTILE = "quantile"
+
+
+class ProfilePhase(enum.StrEnum):
+    """Enum to define the profiled phases of a game step."""
+
+    GAME_STATE = "game_state"
+    EVENTS = "events"
+    DIRECTION = "direction"
+    SNAKE_UPDATE = "snake_update"
+    GAME_LOGIC = "game_logic"
+    INPUT_VECTOR = "input_vector"
+    RENDER = "render"
+    SLEEP = "sleep"
+
+
+class Feature(enum.StrEnum):
+    """Enum to define the features the network of the AI game mode senses."""
+
+    APPLE_DIRECTION = "apple_direction"
+    CLEAR_SIDES = "clear_sides"
+    RAY_DISTANCES = "ray_distances"
+    REACHABLE_AREA = "reachable_area"
+    TAIL_DIRECTION = "tail_direction"
@@ -0,0 +1,63 @@
+"""Tests for the runner module."""
+
+import collections.abc
+import pathlib
+
+import pytest
+
+from evolutionary_snake import benchmarking
+
+
+def test_run_benchmark() -> None:
+    """Test that a benchmark is called often enough to take the minimum time."""
+    # GIVEN a benchmark of a function that counts its calls
+    n_calls = 0
+
+    def _setup() -> collections.abc.Callable[[], None]:
+        def _call() -> None:
+            nonlocal n_calls
+            n_calls += 1
+
+        return _call
+
+    benchmark = benchmarking.Benchmark(name="count", params={"n": 1}, setup=_setup)
+    # WHEN the benchmark is run
+    repeats = 3
+    result = benchmarking.run_benchmark(benchmark, repeats=repeats, min_time=0.001)
+    # THEN every repeat should call the function more than once
+    assert result.number > 1
+    assert len(result.times) == repeats
+    assert n_calls >= repeats * result.number
+    # AND the result should be named after the benchmark and its parameters
+    assert result.key == benchmark.key == "count[n=1]"
+    assert 0 < result.best <= result.median
+
+
+def test_compare_results(tmp_path: pathlib.Path) -> None:
+    """Test comparing results to a baseline saved by an earlier run."""
+    # GIVEN a baseline saved to a file
+    baseline = [
+        benchmarking.BenchmarkResult(name="a", params={}, number=1, times=[2.0, 1.0]),
+        benchmarking.BenchmarkResult(name="b", params={}, number=1, times=[1.0]),
+    ]
+    path_baseline = tmp_path / "baseline.json"
+    benchmarking.save_results(baseline, path_baseline)
+    # AND results of which one benchmark became slower and one is new
+    results = [
+        benchmarking.BenchmarkResult(name="a", params={}, number=1, times=[1.5]),
+        benchmarking.BenchmarkResult(name="b", params={}, number=1, times=[1.0]),
+        benchmarking.BenchmarkResult(name="c", params={}, number=1, times=[1.0]),
+    ]
+    # WHEN the results are compared to the loaded baseline
+    comparisons = benchmarking.compare_results(
+        results, benchmarking.load_results(path_baseline)
+    )
+    # THEN only the benchmarks of the baseline should be compared by their best time
+    assert [comparison.key for comparison in comparisons] == ["a", "b"]
+    assert comparisons[0].ratio == pytest.approx(1.5)
+    # AND only the slower benchmark should have regressed
+    tolerance = 0.1
+    assert [comparison.regressed(tolerance) for comparison in comparisons] == [
+        True,
+        False,
+    ]
@@ -0,0 +1,56 @@
+"""Tests for the suite module."""
+
+import pathlib
+
+import pytest
+
+from evolutionary_snake import benchmarking
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+def test_quick_benchmarks(path_neat_config: pathlib.Path) -> None:
+    """Test that every benchmark of the quick grid runs."""
+    # GIVEN the benchmarks of the quick grid
+    benchmarks = benchmarking.get_benchmarks(
+        quick=True, path_neat_config=path_neat_config
+    )
+    # WHEN every benchmark is run once
+    results = [
+        benchmarking.run_benchmark(benchmark, repeats=1, min_time=0.0)
+        for benchmark in benchmarks
+    ]
+    # THEN every benchmark should have its own key
+    keys = [result.key for result in results]
+    assert len(set(keys)) == len(keys)
+    # AND every hot path should be covered
+    assert {result.name for result in results} == {
+        "snake_update",
+        "collision_checks",
+        "apple_spawn",
+        "input_vector",
+        "features",
+        "network_activate",
+        "ai_episode",
+        "training_generation",
+    }
+    assert all(result.best > 0 for result in results)
+
+
+def test_benchmarks_are_reproducible(path_neat_config: pathlib.Path) -> None:
+    """Test that the setup of a benchmark always builds the same state."""
+    # GIVEN the benchmark of a full episode
+    benchmark = next(
+        benchmark
+        for benchmark in benchmarking.get_benchmarks(
+            quick=True, path_neat_config=path_neat_config
+        )
+        if benchmark.name == "ai_episode"
+    )
+    # WHEN it is set up twice
+    # THEN both episodes should end with the same loss
+    assert benchmark.setup()() == benchmark.setup()()
@@ -65,14 +65,6 @@ def snake_fixture(boundary: base_boundary.BaseBoundary) -> game_objects.Snake:
 
 
 @pytest.fixture(name="apple")
-def apple_fixture(
-    game_settings: settings.GameSettings,
-    boundary: base_boundary.BaseBoundary,
-    snake: game_objects.Snake,
-) -> game_objects.Apple:
+def apple_fixture(snake: game_objects.Snake) -> game_objects.Apple:
     """Fixture to create an apple object."""
-    return game_objects.Apple(
-        boundary=boundary,
-        snake_coordinates=snake.coordinates,
-        settings=game_settings,
-    )
+    return game_objects.Apple(free_cells=snake.free_cells)
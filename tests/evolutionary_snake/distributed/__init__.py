@@ -0,0 +1 @@
+"""Test modules for the distributed package."""
@@ -0,0 +1,159 @@
+"""Tests for the broker module."""
+
+import collections.abc
+import concurrent.futures
+import socket
+import time
+import typing
+
+import pytest
+
+from evolutionary_snake import distributed
+from evolutionary_snake.distributed import protocol
+
+
+def _create_evaluator(
+    context: dict[str, typing.Any],
+) -> collections.abc.Callable[[typing.Any], typing.Any]:
+    """Create an evaluator that multiplies a payload by the factor of the context."""
+
+    def _evaluate(payload: int | str) -> int | str:
+        if payload == "fail":
+            msg = "Cannot evaluate this payload"
+            raise ValueError(msg)
+        if payload == "slow":
+            time.sleep(0.3)
+            return payload
+        factor: int = context["factor"]
+        return payload * factor
+
+    return _evaluate
+
+
+def _start_worker(
+    broker: distributed.Broker, executor: concurrent.futures.Executor
+) -> concurrent.futures.Future[int]:
+    """Start a worker on a thread that sends heartbeats every 50 ms."""
+    return executor.submit(
+        distributed.run_worker,
+        host=broker.host,
+        port=broker.port,
+        create_evaluator=_create_evaluator,
+        heartbeat_interval=0.05,
+    )
+
+
+class _SilentWorker:
+    """Worker that takes a task from the broker without ever answering."""
+
+    def __init__(self, broker: distributed.Broker) -> None:
+        """Connect to the broker and request a task."""
+        self.connection = socket.create_connection((broker.host, broker.port))
+        self.reader = self.connection.makefile("rb")
+        self.writer = self.connection.makefile("wb")
+        protocol.send(self.writer, {"type": protocol.REQUEST})
+
+    def receive_task(self) -> protocol.Message | None:
+        """Wait for the task the broker hands out to this worker."""
+        message = protocol.receive(self.reader)
+        if message is not None and message["type"] == protocol.CONTEXT:
+            message = protocol.receive(self.reader)
+        return message
+
+    def close(self) -> None:
+        """Disconnect from the broker."""
+        self.reader.close()
+        self.writer.close()
+        self.connection.close()
+
+
+def test_broker_evaluates_tasks() -> None:
+    """Test that the tasks of several jobs are evaluated by all workers."""
+    # GIVEN a broker with two workers
+    with (
+        concurrent.futures.ThreadPoolExecutor() as executor,
+        distributed.Broker() as broker,
+    ):
+        workers = [_start_worker(broker, executor) for _ in range(2)]
+        # AND the workers wait for a job
+        time.sleep(0.1)
+        # WHEN two jobs with a different context are evaluated
+        payloads: list[typing.Any] = [*range(10), "slow"]
+        results = dict(broker.imap_unordered(payloads, context={"factor": 2}))
+        results_other = dict(broker.imap_unordered(payloads, context={"factor": 3}))
+        broker.close()
+        # THEN every job should have the results of its own context
+        assert results == {
+            i: payload * 2 for i, payload in enumerate(payloads[:-1])
+        } | {len(payloads) - 1: "slow"}
+        assert results_other == {
+            i: payload * 3 for i, payload in enumerate(payloads[:-1])
+        } | {len(payloads) - 1: "slow"}
+        # AND the workers should have shut down after evaluating all tasks
+        assert sum(worker.result() for worker in workers) >= 2 * len(payloads)
+
+
+def test_broker_steals_tasks() -> None:
+    """Test that an idle worker steals the task of a worker that does not answer."""
+    # GIVEN a broker with a worker that takes a task without ever answering
+    with (
+        concurrent.futures.ThreadPoolExecutor() as executor,
+        distributed.Broker(heartbeat_timeout=60.0) as broker,
+    ):
+        silent_worker = _SilentWorker(broker)
+        job = executor.submit(
+            lambda: dict(broker.imap_unordered(["slow"], context={"factor": 2}))
+        )
+        assert silent_worker.receive_task() is not None
+        # WHEN another worker connects
+        worker = _start_worker(broker, executor)
+        # AND the silent worker disconnects while the task runs on the other worker
+        time.sleep(0.1)
+        silent_worker.close()
+        # THEN the other worker should steal the task long before the heartbeat
+        # timeout and evaluate it once
+        assert job.result(timeout=10.0) == {0: "slow"}
+        broker.close()
+        assert worker.result() == 1
+
+
+@pytest.mark.parametrize("disconnect", [False, True])
+def test_broker_requeues_lost_tasks(disconnect: bool) -> None:  # noqa: FBT001
+    """Test that the task of a lost worker is handed out again."""
+    # GIVEN a broker that does not steal tasks
+    with (
+        concurrent.futures.ThreadPoolExecutor() as executor,
+        distributed.Broker(
+            heartbeat_timeout=60.0 if disconnect else 0.2, steal_tasks=False
+        ) as broker,
+    ):
+        # AND a worker that takes a task and disconnects or misses its heartbeats
+        silent_worker = _SilentWorker(broker)
+        job = executor.submit(
+            lambda: dict(broker.imap_unordered([1, "slow"], context={"factor": 2}))
+        )
+        assert silent_worker.receive_task() is not None
+        if disconnect:
+            silent_worker.close()
+        # WHEN another worker connects
+        worker = _start_worker(broker, executor)
+        # THEN it should evaluate all tasks, its heartbeats keep its own slow task
+        results_exp = {0: 2, 1: "slow"}
+        assert job.result(timeout=10.0) == results_exp
+        broker.close()
+        assert worker.result() == len(results_exp)
+        silent_worker.close()
+
+
+def test_broker_raises_worker_error() -> None:
+    """Test that an error of a worker is raised by the broker."""
+    # GIVEN a broker with a worker
+    with (
+        concurrent.futures.ThreadPoolExecutor() as executor,
+        distributed.Broker() as broker,
+    ):
+        _start_worker(broker, executor)
+        # WHEN a task fails on the worker
+        # THEN a RuntimeError with the error of the worker should be raised
+        with pytest.raises(RuntimeError, match=r"(?s)failed on a worker.*ValueError"):
+            dict(broker.imap_unordered(["fail"], context={"factor": 2}))
@@ -1,8 +1,14 @@
 """Test module to test the canvas module."""
 
+import typing
+
+import numpy as np
 import pygame
+import pytest
 
-from evolutionary_snake import game_canvas, settings
+from evolutionary_snake import game_canvas, game_objects, settings
+from evolutionary_snake.game_canvas import image_export
+from evolutionary_snake.utils import enums
 
 
 def test_canvas_init(game_settings: settings.GameSettings) -> None:
@@ -33,3 +39,62 @@ def test_canvas_with_pygame_init(game_settings: settings.GameSettings) -> None:
     assert pygame.get_init()
     # AND the canvas attribute should not be equal to None
     assert canvas.canvas is not None
+
+
+def _to_array(frame: pygame.Surface | image_export.FrameType) -> np.ndarray:
+    """Return a copy of a frame as an array of pixels."""
+    if isinstance(frame, pygame.Surface):
+        return pygame.surfarray.array3d(frame)
+    return frame.copy()
+
+
+@pytest.mark.parametrize(
+    "canvas_class", [game_canvas.Canvas, game_canvas.OffscreenCanvas]
+)
+def test_canvas_draws_changed_cells(
+    game_settings: settings.GameSettings,
+    snake: game_objects.Snake,
+    apple: game_objects.Apple,
+    canvas_class: type[game_canvas.GameCanvas[typing.Any]],
+) -> None:
+    """Test that only changed cells are repainted, into the frame of a full redraw."""
+    # GIVEN a canvas that drew a snake whose tail has entered the board
+    canvas = canvas_class(game_settings=game_settings)
+    for _ in range(snake.length):
+        snake.update(enums.Direction.RIGHT)
+        canvas.draw(snake=snake, apple=apple)
+    steps = 10
+    for step in range(steps):
+        # WHEN the snake moves, and the apple moves halfway
+        snake.update(enums.Direction.RIGHT)
+        moved_apple = step == steps // 2
+        if moved_apple:
+            apple = game_objects.Apple(free_cells=snake.free_cells)
+        frame = _to_array(canvas.draw(snake=snake, apple=apple, score=step))
+        # THEN only the new head, the freed tail and the moved apple are repainted
+        assert canvas.dirty_cells == 2 + 2 * moved_apple
+        # AND the frame should equal the frame of a new canvas
+        np.testing.assert_array_equal(
+            frame,
+            _to_array(
+                canvas_class(game_settings=game_settings).draw(
+                    snake=snake, apple=apple, score=step
+                )
+            ),
+        )
+
+
+def test_canvas_creates_font_once(
+    game_settings: settings.GameSettings,
+    snake: game_objects.Snake,
+    apple: game_objects.Apple,
+) -> None:
+    """Test that the score font is created once, not every time a score is drawn."""
+    # GIVEN a canvas
+    canvas = game_canvas.Canvas(game_settings=game_settings)
+    font = canvas.font
+    # WHEN it draws other scores
+    for score in range(3):
+        canvas.draw(snake=snake, apple=apple, score=score)
+    # THEN the font should not have been created again
+    assert canvas.font is font
@@ -0,0 +1,88 @@
+"""Test module to test the image export module."""
+
+import pathlib
+
+import numpy as np
+import pygame
+
+from evolutionary_snake import game_canvas
+
+PALETTE = [(255, 255, 255), (0, 0, 0), (150, 0, 0)]
+
+
+def _create_frame(height: int, width: int, seed: int = 0) -> np.ndarray:
+    """Return a frame of random colors of the palette."""
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(PALETTE), size=(height, width))
+    return np.array(PALETTE, dtype=np.uint8)[indices]
+
+
+def _load_image(path: pathlib.Path) -> np.ndarray:
+    """Load the (first) frame of an image as an array of shape (height, width, 3)."""
+    return pygame.surfarray.array3d(pygame.image.load(path)).transpose(1, 0, 2)
+
+
+def test_encode_png(tmp_path: pathlib.Path) -> None:
+    """Test that an encoded PNG image decodes to the frame."""
+    # GIVEN a frame that is not square
+    frame = _create_frame(height=12, width=9)
+    # WHEN it is encoded as PNG and saved
+    path_png = tmp_path / "frame.png"
+    path_png.write_bytes(game_canvas.encode_png(frame))
+    # THEN the image should hold the frame
+    np.testing.assert_array_equal(_load_image(path_png), frame)
+
+
+def test_png_sequence_writer(tmp_path: pathlib.Path) -> None:
+    """Test that the frames are written to numbered PNG images."""
+    # GIVEN a writer of a PNG image sequence
+    path_frames = tmp_path / "frames"
+    n_frames = 3
+    frames = [_create_frame(height=6, width=8, seed=seed) for seed in range(n_frames)]
+    # WHEN the frames are written
+    with game_canvas.create_frame_writer(
+        path_frames, palette=PALETTE, frame_rate_fps=20
+    ) as writer:
+        for frame in frames:
+            writer.write(frame)
+    # THEN every frame should be an image of the sequence
+    assert isinstance(writer, game_canvas.PngSequenceWriter)
+    paths_frames = sorted(path_frames.iterdir())
+    assert [path.name for path in paths_frames] == [
+        "frame_00000.png",
+        "frame_00001.png",
+        "frame_00002.png",
+    ]
+    for path_frame, frame in zip(paths_frames, frames, strict=True):
+        np.testing.assert_array_equal(_load_image(path_frame), frame)
+
+
+def test_gif_writer(tmp_path: pathlib.Path) -> None:
+    """Test that the frames are written to an animated GIF."""
+    # GIVEN a writer of a GIF
+    path_gif = tmp_path / "replay.GIF"
+    # AND frames of noise, that fill the code table of the compression
+    frames = [_create_frame(height=200, width=150, seed=seed) for seed in range(2)]
+    # WHEN the frames are written
+    with game_canvas.create_frame_writer(
+        path_gif, palette=PALETTE, frame_rate_fps=20
+    ) as writer:
+        for frame in frames:
+            writer.write(frame)
+    # THEN the GIF should hold every frame and end with its trailer
+    assert isinstance(writer, game_canvas.GifWriter)
+    assert writer.n_frames == len(frames)
+    assert path_gif.read_bytes().endswith(b"\x3b")
+    # AND its first frame should decode to the first frame
+    np.testing.assert_array_equal(_load_image(path_gif), frames[0])
+
+
+def test_gif_writer_without_frames(tmp_path: pathlib.Path) -> None:
+    """Test that a GIF writer without frames does not create a file."""
+    # GIVEN a writer of a GIF
+    path_gif = tmp_path / "replay.gif"
+    writer = game_canvas.GifWriter(path_gif, palette=PALETTE, frame_rate_fps=20)
+    # WHEN it is closed without writing a frame
+    writer.close()
+    # THEN no GIF should have been created
+    assert not path_gif.exists()
@@ -0,0 +1,117 @@
+"""Test module to test the mosaic viewer module."""
+
+import queue
+import threading
+
+import pygame
+import pytest
+
+from evolutionary_snake import game_canvas, game_objects, settings
+from evolutionary_snake.game_canvas import mosaic_viewer
+
+
+def test_tile_canvas_throttles_snapshots(
+    game_settings: settings.GameSettings,
+    snake: game_objects.Snake,
+    apple: game_objects.Apple,
+) -> None:
+    """Test that a tile canvas sends at most a snapshot per refresh."""
+    # GIVEN a tile canvas that refreshes far less often than it draws
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] = queue.Queue()
+    tile = 3
+    canvas = game_canvas.TileCanvas(
+        snapshot_queue, tile=tile, game_settings=game_settings, refresh_fps=1e-3
+    )
+    # WHEN the game is drawn twice and the canvas is closed
+    score = 7
+    canvas.draw(snake=snake, apple=apple)
+    canvas.draw(snake=snake, apple=apple, score=score)
+    canvas.close()
+    # THEN the first drawing and the final state should have been sent
+    first, final = snapshot_queue.get_nowait(), snapshot_queue.get_nowait()
+    assert snapshot_queue.empty()
+    assert first is not None
+    assert final is not None
+    assert (first.tile, first.score, first.finished) == (tile, 0, False)
+    assert (final.tile, final.score, final.finished) == (tile, score, True)
+    # AND only the cells of the snake on the board should have been sent
+    step_size = game_settings.step_size
+    assert final.snake == ((snake.x[0] // step_size, snake.y[0] // step_size),)
+    assert final.apple == (apple.x // step_size, apple.y // step_size)
+
+
+def test_tile_canvas_drops_snapshots_when_full(
+    game_settings: settings.GameSettings,
+    snake: game_objects.Snake,
+    apple: game_objects.Apple,
+) -> None:
+    """Test that a tile canvas never waits for room on the queue while drawing."""
+    # GIVEN a tile canvas with a full queue
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] = queue.Queue(1)
+    snapshot_queue.put(None)
+    canvas = game_canvas.TileCanvas(
+        snapshot_queue, tile=0, game_settings=game_settings, refresh_fps=1e9
+    )
+    # WHEN the game is drawn
+    canvas.draw(snake=snake, apple=apple)
+    # THEN the snapshot should have been dropped
+    assert snapshot_queue.get_nowait() is None
+    # AND a canvas that never drew should not send a final snapshot
+    game_canvas.TileCanvas(
+        snapshot_queue, tile=0, game_settings=game_settings, refresh_fps=1
+    ).close()
+    assert snapshot_queue.empty()
+
+
+@pytest.mark.parametrize("refresh_fps", [1e9, 100])
+def test_mosaic_viewer_renders_tiles(
+    game_settings: settings.GameSettings, refresh_fps: float
+) -> None:
+    """Test that the mosaic viewer renders the latest snapshot of every tile."""
+    # GIVEN a queue with snapshots of the games of three tiles
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] = queue.Queue()
+    snapshots = [
+        game_canvas.GameSnapshot(tile=0, snake=((0, 0),), apple=(5, 5), score=0),
+        game_canvas.GameSnapshot(tile=0, snake=((1, 0),), apple=(5, 5), score=0),
+        game_canvas.GameSnapshot(
+            tile=2, snake=((2, 2), (2, 3)), apple=(9, 9), score=1, finished=True
+        ),
+    ]
+    for snapshot in snapshots:
+        snapshot_queue.put(snapshot)
+    # AND a viewer with a tile for each game
+    n_tiles = 3
+    viewer = game_canvas.MosaicViewer(
+        n_tiles, game_settings, refresh_fps=refresh_fps, tile_size=40
+    )
+    # WHEN the viewer runs until it is stopped
+    threading.Timer(0.05, snapshot_queue.put, args=(None,)).start()
+    viewer.run(snapshot_queue)
+    # THEN every tile should show its latest snapshot
+    assert viewer.snapshots == {0: snapshots[1], 2: snapshots[2]}
+    cell_size = viewer.layout.cell_size
+    assert viewer.canvas.get_at((1 + cell_size, 1)) == pygame.Color(
+        *game_canvas.canvas.SNAKE_RGB
+    )
+    assert viewer.canvas.get_at((1, 1)) == pygame.Color(
+        *game_canvas.canvas.BACKGROUND_RGB
+    )
+    # AND the tile of the finished game should be greyed out
+    x_tile, y_tile = 0, viewer.layout.tile_height
+    assert viewer.canvas.get_at((x_tile + 1, y_tile + 1)) == pygame.Color(
+        *mosaic_viewer.FINISHED_RGB
+    )
+    pygame.quit()
+
+
+def test_run_mosaic_viewer(game_settings: settings.GameSettings) -> None:
+    """Test that the mosaic viewer process target quits pygame when stopped."""
+    # GIVEN a queue that stops the viewer
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] = queue.Queue()
+    snapshot_queue.put(None)
+    # WHEN the viewer is run
+    game_canvas.run_mosaic_viewer(
+        snapshot_queue, n_tiles=2, game_settings=game_settings, refresh_fps=10
+    )
+    # THEN pygame should have been quit
+    assert not pygame.get_init()
@@ -0,0 +1,58 @@
+"""Test module to test the offscreen canvas module."""
+
+import pathlib
+
+import numpy as np
+import pytest
+
+from evolutionary_snake import game_canvas, game_modes, game_objects, settings
+from evolutionary_snake.game_canvas.canvas import SNAKE_RGB
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+def test_offscreen_canvas_draws_score(
+    game_settings: settings.GameSettings,
+    snake: game_objects.Snake,
+    apple: game_objects.Apple,
+) -> None:
+    """Test that the score is drawn below the board."""
+    # GIVEN an offscreen canvas
+    canvas = game_canvas.OffscreenCanvas(game_settings=game_settings)
+    # WHEN it draws a score
+    score = 12345
+    frame = canvas.draw(snake=snake, apple=apple, score=score).copy()
+    # THEN the strip below the board should hold its digits
+    strip = frame[game_settings.display_height :]
+    assert any(np.array_equal(pixel, SNAKE_RGB) for pixel in strip.reshape(-1, 3))
+    # AND another score should show other digits
+    assert not np.array_equal(
+        canvas.draw(snake=snake, apple=apple, score=score + 1)[
+            game_settings.display_height :
+        ],
+        strip,
+    )
+    # AND closing the canvas without a writer should do nothing
+    canvas.close()
+    assert canvas.writer is None
+
+
+def test_offscreen_game_exports_frames(
+    ai_settings: settings.AiGameSettings, tmp_path: pathlib.Path
+) -> None:
+    """Test that a headless game with a path to frames exports every frame."""
+    # GIVEN headless AI settings with a path to frames
+    ai_settings.run_in_background = False
+    ai_settings.headless = True
+    ai_settings.path_frames = tmp_path / "frames"
+    # WHEN the game is played
+    game_mode = game_modes.AiGameMode(game_settings=ai_settings)
+    game_mode.run()
+    # THEN every step and the final state should have been exported
+    assert isinstance(game_mode.canvas, game_canvas.OffscreenCanvas)
+    n_frames = len(list(ai_settings.path_frames.iterdir()))
+    assert n_frames == game_mode.loss_tracker.steps_total + 1
@@ -2,6 +2,7 @@
 
 import pathlib
 
+import neat
 import pygame
 import pytest
 
@@ -28,6 +29,7 @@ def game_mode_fixture(
     game_mode.snake.direction = enums.Direction.RIGHT
     game_mode.apple.x = (ai_settings.display_width // 2) - 2 * ai_settings.step_size
     game_mode.apple.y = (ai_settings.display_height // 2) + 2 * ai_settings.step_size
+    game_mode.apple_distance = game_mode.distance_to_apple()
 
     return game_mode
 
@@ -46,7 +48,7 @@ def test_ai_game_mode_snake_runs_into_hard_boundary(
     exp_steps_without_apple = 10
     assert game_mode.steps_without_apple == exp_steps_without_apple
     # AND the loss should be equal to an expected value
-    exp_loss = -997.5
+    exp_loss = -1000.0
     assert game_mode.loss_tracker.loss == exp_loss
     # AND the score should be equal to 0
     assert game_mode.score == 0
@@ -137,3 +139,203 @@ def test_ai_game_mode_snake_explores_all_directions(
     assert round(game_mode.loss_tracker.loss) == exp_loss
     # AND the score should be equal to 0
     assert game_mode.score == 0
+
+
+@pytest.fixture(name="seeded_neural_net")
+def seeded_neural_net_fixture(neat_config: neat.Config) -> neat.nn.FeedForwardNetwork:
+    """Fixture to return a neural network with randomly initialized connections."""
+    genome = neat.DefaultGenome(key=1)
+    genome.configure_new(neat_config.genome_config)
+    return neat.nn.FeedForwardNetwork.create(genome, neat_config)
+
+
+def test_ai_game_mode_headless_does_not_use_pygame(
+    ai_settings: game_settings.AiGameSettings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the headless game mode never touches pygame or sleeps."""
+
+    # GIVEN a headless AI game mode
+    def _fail(*_: object) -> None:
+        pytest.fail("pygame or time.sleep should not be used in headless mode")
+
+    for target in (
+        "pygame.init",
+        "pygame.quit",
+        "pygame.event.pump",
+        "pygame.key.get_pressed",
+        "time.sleep",
+    ):
+        monkeypatch.setattr(target, _fail)
+    ai_settings.headless = True
+    game_mode = game_modes.AiGameMode(game_settings=ai_settings)
+    # WHEN the game is run
+    game_mode.run()
+    # THEN the game should have finished without a canvas
+    assert not game_mode.running
+    assert game_mode.canvas is None
+
+
+def test_ai_game_mode_headless_matches_rendered(
+    ai_settings: game_settings.AiGameSettings,
+    seeded_neural_net: neat.nn.FeedForwardNetwork,
+) -> None:
+    """Test that a seeded headless game replays the same game as the rendered mode."""
+    # GIVEN a seeded rendered game and a seeded headless game with the same network
+    settings_rendered = ai_settings.model_copy(
+        update={"neural_net": seeded_neural_net, "seed": 7, "frame_rate_fps": 1e6}
+    )
+    settings_headless = settings_rendered.model_copy(update={"headless": True})
+    game_rendered = game_modes.AiGameMode(game_settings=settings_rendered)
+    game_headless = game_modes.AiGameMode(game_settings=settings_headless)
+    # WHEN both games are run
+    game_rendered.run()
+    game_headless.run()
+    # THEN both games should have followed the same trajectory
+    assert game_headless.snake.coordinates == game_rendered.snake.coordinates
+    assert (game_headless.apple.x, game_headless.apple.y) == (
+        game_rendered.apple.x,
+        game_rendered.apple.y,
+    )
+    assert game_headless.loss_tracker == game_rendered.loss_tracker
+    assert game_headless.score == game_rendered.score
+
+
+def test_ai_game_mode_without_neural_net(
+    ai_settings: game_settings.AiGameSettings,
+) -> None:
+    """Test that the AI game mode cannot be played without a neural network."""
+    # GIVEN AI settings without a neural network
+    ai_settings.neural_net = None
+    # WHEN an AI game mode is instantiated
+    # THEN a ValueError should be raised
+    with pytest.raises(ValueError, match="requires a neural network"):
+        game_modes.AiGameMode(game_settings=ai_settings)
+
+
+def test_ai_game_mode_profiles_phases(
+    ai_settings: game_settings.AiGameSettings,
+) -> None:
+    """Test that every phase of every step of a profiled game is timed."""
+    # GIVEN an AI game mode that is profiled
+    ai_settings.profile = True
+    ai_settings.frame_rate_fps = 1000
+    game_mode = game_modes.AiGameMode(game_settings=ai_settings)
+    # WHEN the game is run
+    game_mode.run()
+    # THEN the profile should count every step
+    report = game_mode.profiler.report()
+    steps = game_mode.loss_tracker.steps_total
+    assert report.steps == steps
+    # AND every phase should be timed once per step
+    assert report.counts == dict.fromkeys(enums.ProfilePhase, steps) | {
+        enums.ProfilePhase.GAME_STATE: steps + 1
+    }
+    assert report.total_time > 0
+    assert report.steps_per_second > 0
+
+
+def test_ai_game_mode_does_not_profile_by_default(
+    game_mode: game_modes.AiGameMode,
+) -> None:
+    """Test that a game is not profiled unless profiling is on."""
+    # GIVEN an AI game mode with default settings
+    # WHEN the game is run
+    game_mode.run()
+    # THEN its profile should be empty
+    report = game_mode.profiler.report()
+    assert (report.steps, report.total_time) == (0, 0.0)
+    assert report.steps_per_second == 0.0
+
+
+def test_ai_game_mode_scores_reachable_area(
+    ai_settings: game_settings.AiGameSettings,
+) -> None:
+    """Test that the reachable area score rewards the room the snake had."""
+    # GIVEN a seeded headless game with and without a reachable area score
+    reachable_area_score = 10.0
+    ai_settings = ai_settings.model_copy(update={"headless": True, "seed": 3})
+    game_mode = game_modes.AiGameMode(game_settings=ai_settings)
+    game_mode_scored = game_modes.AiGameMode(
+        game_settings=ai_settings.model_copy(
+            update={"reachable_area_score": reachable_area_score}
+        )
+    )
+    # WHEN both games are run
+    game_mode.run()
+    game_mode_scored.run()
+    # THEN the room of every step before the collision should have been counted
+    loss_tracker = game_mode_scored.loss_tracker
+    assert loss_tracker.room_total == loss_tracker.steps_total - 1
+    assert game_mode.loss_tracker.room_total == 0
+    # AND the scored loss should be higher by the score of the mean room
+    assert loss_tracker.loss - game_mode.loss_tracker.loss == pytest.approx(
+        reachable_area_score * loss_tracker.room_total / loss_tracker.steps_total
+    )
+
+
+@pytest.mark.parametrize("detect_loops", [False, True])
+def test_ai_game_mode_detects_loops(
+    game_mode: game_modes.AiGameMode,
+    monkeypatch: pytest.MonkeyPatch,
+    detect_loops: bool,  # noqa: FBT001
+) -> None:
+    """Test that a snake circling without eating is stopped once it loops."""
+    # GIVEN an AI game mode that detects loops, or not
+    game_mode.game_settings.detect_loops = detect_loops
+    game_mode.game_settings.headless = True
+    # AND a snake that circles around a square forever
+    directions = [
+        enums.Direction.RIGHT,
+        enums.Direction.DOWN,
+        enums.Direction.LEFT,
+        enums.Direction.UP,
+    ]
+    monkeypatch.setattr(
+        game_mode,
+        "get_direction",
+        helper_functions.get_direction_generator(directions * 100),
+    )
+    # WHEN the game is run
+    game_mode.run()
+    # THEN a detected loop should end the game once the body first repeats
+    steps_loop, step_limit = 6, game_mode.game_settings.step_limit
+    assert game_mode.looped == detect_loops
+    assert game_mode.loss_tracker.steps_total == (
+        steps_loop if detect_loops else step_limit
+    )
+    # AND the steps left until the step limit should be counted as saved
+    assert game_mode.loss_tracker.steps_saved == (
+        step_limit - steps_loop if detect_loops else 0
+    )
+
+
+def test_ai_game_mode_loop_state_is_order_aware(
+    game_mode: game_modes.AiGameMode,
+) -> None:
+    """Test that bodies on the same cells in another order are different states."""
+    # GIVEN a snake of nine segments that runs along the rows of a block of cells,
+    # which ate before
+    game_mode.steps_without_apple = 1
+    step_size = game_mode.game_settings.step_size
+    rows = [(0, 0), (1, 0), (2, 0), (2, 1), (1, 1), (0, 1), (0, 2), (1, 2), (2, 2)]
+    columns = [(0, 0), (0, 1), (0, 2), (1, 2), (1, 1), (1, 0), (2, 0), (2, 1), (2, 2)]
+    game_mode.snake.length = len(rows)
+
+    def _place(cells: list[tuple[int, int]]) -> None:
+        for index, (column, row) in enumerate(cells):
+            game_mode.snake.move_segment(index, column * step_size, row * step_size)
+
+    _place(rows)
+    coordinates = game_mode.snake.coordinates
+    assert not game_mode.detect_loop()
+    # WHEN the segments run along the columns, between the same head and tail
+    _place(columns)
+    # THEN the body should cover the same cells but the game should not have looped
+    assert set(game_mode.snake.coordinates) == set(coordinates)
+    assert game_mode.snake.head == coordinates[0]
+    assert game_mode.snake.segment(len(rows) - 1) == coordinates[-1]
+    assert not game_mode.detect_loop()
+    # AND returning to the first body should be a loop
+    _place(rows)
+    assert game_mode.detect_loop()
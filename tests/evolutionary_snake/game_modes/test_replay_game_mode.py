@@ -0,0 +1,127 @@
+"""Module to test the replay game mode."""
+
+import itertools
+import pathlib
+
+import pytest
+
+from evolutionary_snake import game_modes, simulation
+from evolutionary_snake.game_objects import snake
+from evolutionary_snake.settings import game_settings
+from evolutionary_snake.utils import enums
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+@pytest.fixture(name="recorded_game")
+def recorded_game_fixture(
+    ai_settings: game_settings.AiGameSettings, tmp_path: pathlib.Path
+) -> game_modes.AiGameMode:
+    """Fixture to return a finished AI game that recorded its replay."""
+    ai_settings.boundary_type = enums.BoundaryType.PERIODIC_BOUNDARY
+    ai_settings.headless = True
+    ai_settings.path_replays = tmp_path / "replays.jsonl"
+    game_mode = game_modes.AiGameMode(game_settings=ai_settings)
+    game_mode.run()
+    return game_mode
+
+
+def _read_replay(recorded_game: game_modes.AiGameMode) -> simulation.Replay:
+    """Read the single replay the recorded game wrote."""
+    assert recorded_game.game_settings.path_replays is not None
+    replays = simulation.read_replays(recorded_game.game_settings.path_replays)
+    assert len(replays) == 1
+    return replays[0]
+
+
+def test_replay_reproduces_game(recorded_game: game_modes.AiGameMode) -> None:
+    """Test that a replay re-simulates every step of the recorded game."""
+    # GIVEN the replay of a game without a seed
+    assert recorded_game.game_settings.seed is None
+    replay = _read_replay(recorded_game)
+    assert replay.steps == recorded_game.loss_tracker.steps_total
+    # WHEN the replay is run headless
+    game_mode = game_modes.ReplayGameMode(replay)
+    game_mode.run()
+    # THEN it should end in the state of the recorded game
+    assert game_mode.step == replay.steps
+    assert game_mode.score == replay.score == recorded_game.score
+    assert game_mode.snake.coordinates == recorded_game.snake.coordinates
+    assert (game_mode.apple.x, game_mode.apple.y) == (
+        recorded_game.apple.x,
+        recorded_game.apple.y,
+    )
+
+
+def test_replay_renders_frame_range(recorded_game: game_modes.AiGameMode) -> None:
+    """Test that a rendered replay only shows the frames of its frame range."""
+    # GIVEN the replay of a game
+    replay = _read_replay(recorded_game)
+    # WHEN a frame range is replayed with rendering
+    frames = range(5, 8)
+    game_mode = game_modes.ReplayGameMode(replay, headless=False, frames=frames)
+    assert game_mode.step == frames.start
+    game_mode.run()
+    # THEN the replay should stop at the end of the frame range
+    assert game_mode.step == frames.stop
+    # AND the replayed snake should be where the recorded snake was at that step
+    expected = game_modes.ReplayGameMode(replay, frames=range(frames.stop))
+    expected.run()
+    assert game_mode.snake.coordinates == expected.snake.coordinates
+
+
+@pytest.mark.parametrize("frames", [range(0), range(5, 5)])
+def test_replay_empty_frame_range(
+    recorded_game: game_modes.AiGameMode, frames: range
+) -> None:
+    """Test that an empty frame range replays no frames."""
+    # GIVEN the replay of a game
+    replay = _read_replay(recorded_game)
+    # WHEN an empty frame range is replayed
+    game_mode = game_modes.ReplayGameMode(replay, frames=frames)
+    game_mode.run()
+    # THEN the replay should stop at the start of the frame range
+    assert game_mode.step == frames.start
+
+
+def _create_replay(seed: int, directions: list[enums.Direction]) -> simulation.Replay:
+    """Create the replay of a game on a periodic board."""
+    return simulation.Replay(
+        name=f"snake_{seed}",
+        game_settings={"seed": seed, "boundary_type": "periodic_boundary"},
+        directions=bytes(direction.value for direction in directions),
+        score=0,
+    )
+
+
+def _directions_to_apple(game_mode: game_modes.ReplayGameMode) -> list[enums.Direction]:
+    """Return the directions that move the head of the snake onto the apple."""
+    head_x, head_y = game_mode.snake.head
+    step_size = game_mode.game_settings.step_size
+    dx, dy = game_mode.apple.x - head_x, game_mode.apple.y - head_y
+    return [enums.Direction.RIGHT if dx > 0 else enums.Direction.LEFT] * (
+        abs(dx) // step_size
+    ) + [enums.Direction.DOWN if dy > 0 else enums.Direction.UP] * (
+        abs(dy) // step_size
+    )
+
+
+def test_replay_eats_apple() -> None:
+    """Test that a replay eats the apples the recorded game ate."""
+    # GIVEN the replay of a game that moves straight to the apple
+    for seed in itertools.count():
+        directions = _directions_to_apple(
+            game_modes.ReplayGameMode(_create_replay(seed, directions=[]))
+        )
+        game_mode = game_modes.ReplayGameMode(_create_replay(seed, directions))
+        if directions[0] != snake.DIRECTION_OPPOSITES[game_mode.snake.direction]:
+            break
+    # WHEN the replay is run
+    game_mode.run()
+    # THEN the snake should have eaten the apple
+    assert game_mode.score == 1
+    assert game_mode.snake.length == game_mode.game_settings.snake_length_init + 1
@@ -0,0 +1,55 @@
+"""Module to test the free cells index."""
+
+import random
+
+import pytest
+
+from evolutionary_snake import game_objects
+from evolutionary_snake.utils import enums
+
+
+def test_free_cells() -> None:
+    """Test adding, removing and sampling free cells."""
+    # GIVEN a free cells index of three cells
+    free_cells = game_objects.FreeCells([(0, 0), (0, 15), (0, 30)])
+    # WHEN the first cell is removed and a known cell is added again
+    free_cells.remove((0, 0))
+    free_cells.add((0, 15))
+    # THEN the index should only hold the remaining cells
+    n_cells_exp = 2
+    assert len(free_cells) == n_cells_exp
+    assert (0, 0) not in free_cells
+    # AND removing a cell that is not free should be a no-op
+    free_cells.remove((0, 0))
+    assert len(free_cells) == n_cells_exp
+    # AND sampling should only return the remaining cells
+    rng = random.Random(0)  # noqa: S311
+    assert {free_cells.sample(rng) for _ in range(20)} == {(0, 15), (0, 30)}
+
+
+def test_free_cells_empty() -> None:
+    """Test that sampling from a full board raises an error."""
+    # GIVEN an empty free cells index
+    free_cells = game_objects.FreeCells([])
+    # WHEN a cell is sampled
+    # THEN a ValueError should be raised
+    with pytest.raises(ValueError, match="no free cell"):
+        free_cells.sample(random.Random(0))  # noqa: S311
+
+
+def test_free_cells_follow_snake(snake: game_objects.Snake) -> None:
+    """Test that the free cells of a snake follow it while it moves."""
+    # GIVEN a snake moving to the right
+    snake.direction = enums.Direction.RIGHT
+    # WHEN the snake grows and moves three steps to the right
+    snake.length += 1
+    for _ in range(3):
+        snake.update(direction=enums.Direction.RIGHT)
+    # THEN the free cells should be exactly the cells of the board without the snake
+    n_cells = snake.width // snake.step_size * snake.height // snake.step_size
+    assert len(snake.free_cells) == n_cells - snake.length
+    assert not any(cell in snake.free_cells for cell in snake.coordinates)
+    # AND an apple should never be placed on top of the snake
+    for _ in range(100):
+        apple = game_objects.Apple(free_cells=snake.free_cells)
+        assert (apple.x, apple.y) not in snake.coordinates
@@ -1,9 +1,13 @@
 """Module to test the snake object."""
 
+import random
+
 import pytest
 
 from evolutionary_snake import game_objects, settings
 from evolutionary_snake.game_objects import boundaries
+from evolutionary_snake.game_objects.boundaries import boundary_factory
+from evolutionary_snake.utils import enums
 
 
 def test_snake(snake: game_objects.Snake) -> None:
@@ -68,3 +72,222 @@ def test_snake_hard_boundary(
     snake.update(direction=direction_init)
     # THEN the direction should not have changed
     assert snake.direction == direction_init
+
+
+def test_snake_occupancy(snake: game_objects.Snake) -> None:
+    """Test that the occupied cells follow the snake while it moves."""
+    # GIVEN a snake moving to the right
+    snake.direction = enums.Direction.RIGHT
+    # WHEN the snake moves three steps to the right
+    for _ in range(3):
+        snake.update(direction=enums.Direction.RIGHT)
+    # THEN the cells of the body should be occupied
+    assert all(snake.occupies(x, y) for x, y in snake.coordinates)
+    # AND the cell the tail left should be free again
+    assert not snake.occupies(150, 150)
+    # AND the snake should not have collided with itself
+    assert not snake.collided_with_itself()
+
+
+def test_snake_ring_buffer(snake: game_objects.Snake) -> None:
+    """Test that the body views follow the snake after the ring buffer wraps."""
+    # GIVEN a snake of length three moving to the right in a periodic boundary
+    snake.length = 3
+    snake.direction = enums.Direction.RIGHT
+    # WHEN the snake moves more steps than there are cells on the board
+    for _ in range(snake.capacity + 1):
+        snake.update(direction=enums.Direction.RIGHT)
+    # THEN the body should be continuous behind the head
+    assert snake.coordinates == [(165, 150), (150, 150), (135, 150)]
+    assert snake.x[:3] == [165, 150, 135]
+    # AND the segments beyond the length should be parked outside the board
+    x_parked = -15
+    assert snake.x[-1] == snake.x[snake.length] == x_parked
+    # AND indexing past the capacity should raise an IndexError
+    with pytest.raises(IndexError, match="out of range"):
+        _ = snake.x[snake.capacity]
+    # AND moving a segment through a view should keep the occupied cells in sync
+    snake.y[2] = 165
+    assert snake.occupies(135, 165)
+    assert not snake.occupies(135, 150)
+    # AND moving a parked segment should not occupy a cell
+    snake.x[snake.length] = 0
+    assert not snake.occupies(0, 150)
+
+
+def test_snake_collided_with_itself(snake: game_objects.Snake) -> None:
+    """Test that the snake collides with itself when moving in a circle."""
+    # GIVEN a snake of length five moving to the right
+    snake.length = 5
+    snake.direction = enums.Direction.RIGHT
+    # WHEN the snake moves in a circle
+    for direction in (
+        enums.Direction.RIGHT,
+        enums.Direction.DOWN,
+        enums.Direction.LEFT,
+        enums.Direction.UP,
+    ):
+        assert not snake.collided_with_itself()
+        snake.update(direction=direction)
+    # THEN the snake should have collided with itself
+    assert snake.collided_with_itself()
+    # AND moving on should release the tail from the cell it shares with the head
+    snake.update(direction=enums.Direction.UP)
+    assert not snake.collided_with_itself()
+    assert snake.occupies(150, 150)
+
+
+@pytest.mark.parametrize(
+    ("direction_init", "directions", "clear_exp"),
+    [
+        # the head wraps to the right edge next to its own body at the left edge
+        (
+            enums.Direction.RIGHT,
+            [enums.Direction.RIGHT] * 10 + [enums.Direction.DOWN, enums.Direction.LEFT],
+            [False, True, True, False],
+        ),
+        # the head wraps to the bottom edge next to its own body at the top edge
+        (
+            enums.Direction.DOWN,
+            [enums.Direction.DOWN] * 10 + [enums.Direction.RIGHT, enums.Direction.UP],
+            [True, False, True, False],
+        ),
+        # the head moves away from the body to the right
+        (
+            enums.Direction.RIGHT,
+            [enums.Direction.RIGHT] * 2,
+            [True, False, True, True],
+        ),
+    ],
+)
+def test_snake_side_clear_periodic(
+    snake: game_objects.Snake,
+    direction_init: enums.Direction,
+    directions: list[enums.Direction],
+    clear_exp: list[bool],
+) -> None:
+    """Test the side clear checks with periodic boundaries."""
+    # GIVEN a snake of length eight in a periodic boundary
+    snake.length = 8
+    snake.direction = direction_init
+    # WHEN the snake follows the given directions
+    for direction in directions:
+        snake.update(direction=direction)
+    # THEN the side checks should match the expected values
+    assert [
+        snake.right_side_clear(),
+        snake.left_side_clear(),
+        snake.bottom_side_clear(),
+        snake.top_side_clear(),
+    ] == clear_exp
+
+
+def test_snake_body_distance(snake: game_objects.Snake) -> None:
+    """Test the distance from the head to the body along the lines of the board."""
+    # GIVEN a snake of length five that turned around its tail
+    snake.length = 5
+    snake.direction = enums.Direction.RIGHT
+    for direction in [enums.Direction.RIGHT] * 4 + [enums.Direction.DOWN] * 2:
+        snake.update(direction=direction)
+    snake.update(direction=enums.Direction.LEFT)
+    # WHEN the distances to the body are measured
+    # THEN the body should be found along rows, columns and diagonals
+    assert snake.body_distance(1, 0) == 1
+    assert snake.body_distance(0, -1) == 2  # noqa: PLR2004
+    assert snake.body_distance(1, -1) == 1
+    # AND no body should be found where there is none
+    assert snake.body_distance(-1, 0) == 0
+    assert snake.body_distance(1, 1) == 0
+    assert snake.body_distance(-1, -1) == 0
+    # AND no body should be found once the head left the board
+    snake.x[0] = -15
+    assert snake.body_distance(1, 0) == 0
+
+
+STEPS = {
+    enums.Direction.RIGHT: (1, 0),
+    enums.Direction.LEFT: (-1, 0),
+    enums.Direction.UP: (0, -1),
+    enums.Direction.DOWN: (0, 1),
+}
+
+
+def _next_cell(
+    snake: game_objects.Snake, cell: tuple[int, int], direction: enums.Direction
+) -> tuple[int, int]:
+    """Return the cell next to a cell, wrapped around a periodic board."""
+    d_x, d_y = STEPS[direction]
+    x, y = cell[0] + d_x * snake.step_size, cell[1] + d_y * snake.step_size
+    if isinstance(snake.boundary, boundaries.PeriodicBoundary):
+        return x % snake.width, y % snake.height
+    return x, y
+
+
+def _is_free(snake: game_objects.Snake, cell: tuple[int, int]) -> bool:
+    """Return True if a cell lies on the board and the snake does not occupy it."""
+    return snake.geometry.on_board(*cell) and not snake.occupies(*cell)
+
+
+def _reachable_area_reference(snake: game_objects.Snake) -> int:
+    """Count the free cells reachable from the head one cell at a time."""
+    reached = {snake.head}
+    frontier = [snake.head]
+    while frontier:
+        cell = frontier.pop()
+        for direction in STEPS:
+            neighbour = _next_cell(snake, cell, direction)
+            if neighbour not in reached and _is_free(snake, neighbour):
+                reached.add(neighbour)
+                frontier.append(neighbour)
+    return len(reached) - 1
+
+
+@pytest.mark.parametrize(
+    "boundary_type",
+    [enums.BoundaryType.HARD_BOUNDARY, enums.BoundaryType.PERIODIC_BOUNDARY],
+)
+def test_snake_reachable_area(
+    game_settings: settings.GameSettings, boundary_type: enums.BoundaryType
+) -> None:
+    """Test the flood fill of the area reachable from the head along a random walk."""
+    # GIVEN a long snake on a small board
+    game_settings.boundary_type = boundary_type
+    snake = game_objects.Snake(
+        length=24,
+        width=120,
+        height=90,
+        step_size=15,
+        boundary=boundary_factory.boundary_factory(game_settings),
+        rng=random.Random(0),  # noqa: S311  # nosec
+    )
+    rng = random.Random(1)  # noqa: S311  # nosec
+    # WHEN the snake walks randomly until it has trapped itself
+    for _ in range(200):
+        free_directions = [
+            direction
+            for direction in STEPS
+            if _is_free(snake, _next_cell(snake, snake.head, direction))
+        ]
+        if not free_directions:
+            break
+        snake.update(direction=rng.choice(free_directions))
+        # THEN the flood fill should reach the cells a cell by cell search reaches
+        assert snake.reachable_area() == _reachable_area_reference(snake)
+
+
+def test_snake_reachable_area_threshold(snake: game_objects.Snake) -> None:
+    """Test that the flood fill stops at the threshold and caches its area."""
+    # GIVEN a snake on an empty board of 20 by 20 cells
+    n_free_cells = 399
+    # WHEN the reachable area is asked up to a threshold
+    threshold = 10
+    area = snake.reachable_area(threshold=threshold)
+    # THEN the fill should have stopped once it reached the threshold
+    assert threshold <= area < n_free_cells
+    # AND the whole area should be filled once it is asked without a threshold
+    assert snake.reachable_area() == n_free_cells
+    # AND the cached area should answer a threshold on the same step
+    assert snake.reachable_area(threshold=threshold) == n_free_cells
+    # AND the area should be filled again once the snake moved
+    snake.update(direction=snake.direction)
+    assert snake.reachable_area() == n_free_cells - 1
@@ -0,0 +1,159 @@
+"""Tests for the checkpointing module."""
+
+import pathlib
+import random
+import typing
+
+import neat
+import numpy as np
+import pytest
+
+from evolutionary_snake.machine_learning import checkpointing
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+def _genome_state(genome: neat.DefaultGenome) -> tuple[typing.Any, ...]:
+    """Return the fitness and the genes of a genome."""
+    nodes = {
+        key: (node.bias, node.response, node.activation, node.aggregation)
+        for key, node in genome.nodes.items()
+    }
+    connections = {
+        key: (connection.weight, connection.enabled)
+        for key, connection in genome.connections.items()
+    }
+    return genome.fitness, nodes, connections
+
+
+def _run_population(
+    neat_config: neat.Config, tmp_path: pathlib.Path, generations: int
+) -> neat.Population:
+    """Evolve a population, saving checkpoints in both formats every generation."""
+    neat_config.pop_size = 12
+    neat_config.reproduction_config.elitism = 1
+    random.seed(0)
+    population = neat.Population(neat_config)
+    population.add_reporter(
+        neat.Checkpointer(
+            generation_interval=1,
+            filename_prefix=(tmp_path / "neat-checkpoint-").as_posix(),
+        )
+    )
+    with checkpointing.Checkpointer(
+        filename_prefix=tmp_path / "checkpoint-", full_snapshot_interval=2
+    ) as checkpointer:
+        population.add_reporter(checkpointer)
+
+        def _evaluate(
+            genomes: list[tuple[int, neat.DefaultGenome]], config: neat.Config
+        ) -> None:
+            del config
+            for _, genome in genomes:
+                genome.fitness = random.random()  # noqa: S311  # nosec
+
+        population.run(_evaluate, n=generations)
+    return population
+
+
+def test_checkpointer_matches_neat_checkpointer(
+    neat_config: neat.Config, tmp_path: pathlib.Path
+) -> None:
+    """Test that the checkpoints hold the same genomes as those of neat-python."""
+    # GIVEN a population that is checkpointed in both formats
+    generations = 4
+    _run_population(neat_config, tmp_path, generations=generations)
+    for generation in range(generations):
+        # WHEN the genomes of a checkpoint are loaded
+        genomes = checkpointing.load_genomes(tmp_path / f"checkpoint-{generation}")
+        genomes_exp = checkpointing.load_genomes(
+            tmp_path / f"neat-checkpoint-{generation}"
+        )
+        # THEN they should be equal to the genomes of the neat-python checkpoint
+        assert list(genomes) == list(genomes_exp)
+        assert [_genome_state(genome) for genome in genomes.values()] == [
+            _genome_state(genome) for genome in genomes_exp.values()
+        ]
+
+    # AND only every other checkpoint should store the genes of all genomes
+    n_genomes = [
+        np.load(tmp_path / f"checkpoint-{generation}")["genes_key"].size
+        for generation in range(generations)
+    ]
+    assert n_genomes[0] == n_genomes[2] == neat_config.pop_size
+    assert n_genomes[1] < neat_config.pop_size
+    assert n_genomes[3] < neat_config.pop_size
+
+
+def test_restore_checkpoint(neat_config: neat.Config, tmp_path: pathlib.Path) -> None:
+    """Test that a restored population equals the one restored by neat-python."""
+    # GIVEN a population that is checkpointed in both formats
+    _run_population(neat_config, tmp_path, generations=2)
+    # WHEN a delta checkpoint is restored in both formats
+    population_exp = checkpointing.restore_checkpoint(
+        tmp_path / "neat-checkpoint-1", neat_config
+    )
+    random_state_exp = random.getstate()
+    population = checkpointing.restore_checkpoint(
+        tmp_path / "checkpoint-1", neat_config
+    )
+    # THEN the state of the random number generator should be equal
+    assert random.getstate() == random_state_exp
+    # AND the generation and the species should be equal
+    assert population.generation == population_exp.generation
+    species_exp = population_exp.species
+    assert population.species.genome_to_species == species_exp.genome_to_species
+    for key, species in population.species.species.items():
+        assert species.representative.key == species_exp.species[key].representative.key
+        assert list(species.members) == list(species_exp.species[key].members)
+        assert species.fitness_history == species_exp.species[key].fitness_history
+    # AND the restored population should continue without reusing genome keys
+    keys = set(population.population)
+
+    def _evaluate(
+        genomes: list[tuple[int, neat.DefaultGenome]], config: neat.Config
+    ) -> None:
+        del config
+        for _, genome in genomes:
+            genome.fitness = 0.0
+
+    population.run(_evaluate, n=1)
+    keys_new = set(population.population) - keys
+    assert keys_new
+    assert min(keys_new) > max(keys)
+
+
+def test_load_genomes_missing_previous_genomes(
+    neat_config: neat.Config, tmp_path: pathlib.Path
+) -> None:
+    """Test that a delta checkpoint fails to load when its genomes are missing."""
+    # GIVEN a delta checkpoint whose full snapshot is replaced by an empty population
+    population = _run_population(neat_config, tmp_path, generations=2)
+    with checkpointing.Checkpointer(
+        filename_prefix=tmp_path / "checkpoint-"
+    ) as checkpointer:
+        checkpointer.save_checkpoint({}, population.species, generation=0)
+    # WHEN the delta checkpoint is loaded
+    # THEN a ValueError should be raised
+    with pytest.raises(ValueError, match="misses genomes"):
+        checkpointing.load_genomes(tmp_path / "checkpoint-1")
+
+
+def test_checkpointer_raises_write_error(
+    neat_config: neat.Config, tmp_path: pathlib.Path
+) -> None:
+    """Test that an error while writing in the background is raised on closing."""
+    # GIVEN a checkpointer that writes into a directory that does not exist
+    population = neat.Population(neat_config)
+    checkpointer = checkpointing.Checkpointer(
+        filename_prefix=tmp_path / "missing" / "checkpoint-"
+    )
+    # WHEN a checkpoint is saved and the checkpointer is closed
+    checkpointer.save_checkpoint(population.population, population.species, 0)
+    # THEN the error of the background thread should be raised
+    with pytest.raises(FileNotFoundError):
+        checkpointer.close()
@@ -0,0 +1,107 @@
+"""Tests for the compiled network module."""
+
+import math
+import pathlib
+import pickle  # nosec
+import random
+
+import neat
+import numpy as np
+import pytest
+
+from evolutionary_snake.machine_learning import compiled_network
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+def _mutated_genome(neat_config: neat.Config, seed: int) -> neat.DefaultGenome:
+    """Return a genome with hidden nodes and mixed activation functions."""
+    random.seed(seed)
+    genome = neat.DefaultGenome(key=seed)
+    genome.configure_new(neat_config.genome_config)
+    for _ in range(30):
+        genome.mutate(neat_config.genome_config)
+    for key in list(genome.nodes)[::3]:
+        genome.nodes[key].activation = "tanh"
+    return genome
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_compiled_network_matches_feed_forward_network(
+    neat_config: neat.Config, seed: int
+) -> None:
+    """Test that the compiled network computes the same outputs as neat-python."""
+    # GIVEN a mutated genome
+    genome = _mutated_genome(neat_config, seed=seed)
+    # WHEN it is compiled and turned into a neat-python network
+    network = compiled_network.CompiledNetwork.create(genome, neat_config)
+    network_exp = neat.nn.FeedForwardNetwork.create(genome, neat_config)
+    # THEN single input vectors should give exactly the same outputs
+    inputs = np.random.default_rng(seed).random((50, 8))
+    outputs_exp = [network_exp.activate(row) for row in inputs.tolist()]
+    assert [network.activate(row) for row in inputs.tolist()] == outputs_exp
+    # AND a batch of input vectors should give the same outputs up to rounding
+    assert network.activate_many(inputs) == pytest.approx(np.array(outputs_exp))
+    # AND an unpickled network should give the same outputs
+    network_unpickled = pickle.loads(pickle.dumps(network))  # noqa: S301  # nosec
+    assert network_unpickled.activate(inputs[0].tolist()) == outputs_exp[0]
+
+
+def test_compiled_network_non_finite_weights(neat_config: neat.Config) -> None:
+    """Test that non-finite weights give the same outputs as neat-python."""
+    # GIVEN a mutated genome with an infinite and a missing weight
+    genome = _mutated_genome(neat_config, seed=0)
+    connections = [cg for cg in genome.connections.values() if cg.enabled]
+    connections[0].weight = math.inf
+    connections[-1].weight = math.nan
+    # WHEN it is compiled and turned into a neat-python network
+    network = compiled_network.CompiledNetwork.create(genome, neat_config)
+    network_exp = neat.nn.FeedForwardNetwork.create(genome, neat_config)
+    # THEN single input vectors should give the same outputs
+    for row in np.random.default_rng(0).random((10, 8)).tolist():
+        np.testing.assert_array_equal(network.activate(row), network_exp.activate(row))
+
+
+def test_compiled_network_unconnected_outputs(neat_config: neat.Config) -> None:
+    """Test that outputs without any connection stay zero."""
+    # GIVEN a genome without connections
+    genome = neat.DefaultGenome(key=1)
+    # WHEN it is compiled
+    network = compiled_network.CompiledNetwork.create(genome, neat_config)
+    # THEN all outputs should be zero
+    assert network.activate([1.0] * 8) == [0.0] * 4
+    assert network.activate_many(np.ones((2, 8))).tolist() == [[0.0] * 4] * 2
+
+
+@pytest.mark.parametrize(
+    ("attribute", "value"),
+    [("aggregation", "product"), ("activation", "custom")],
+)
+def test_compiled_network_unsupported_node(
+    neat_config: neat.Config, attribute: str, value: str
+) -> None:
+    """Test that nodes with an unsupported function cannot be compiled."""
+    # GIVEN a genome with an unsupported aggregation or activation function
+    genome = _mutated_genome(neat_config, seed=0)
+    setattr(genome.nodes[0], attribute, value)
+    # WHEN it is compiled
+    # THEN a NotImplementedError should be raised
+    with pytest.raises(NotImplementedError, match="is not supported"):
+        compiled_network.CompiledNetwork.create(genome, neat_config)
+
+
+def test_compiled_network_invalid_inputs(neat_config: neat.Config) -> None:
+    """Test that inputs of the wrong size are rejected."""
+    # GIVEN a compiled network
+    genome = _mutated_genome(neat_config, seed=0)
+    network = compiled_network.CompiledNetwork.create(genome, neat_config)
+    # WHEN it is activated with too few inputs
+    # THEN a RuntimeError should be raised
+    with pytest.raises(RuntimeError, match="Expected 8 inputs"):
+        network.activate([1.0] * 7)
+    with pytest.raises(RuntimeError, match="Expected inputs of shape"):
+        network.activate_many(np.ones((2, 7)))
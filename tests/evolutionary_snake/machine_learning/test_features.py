@@ -0,0 +1,152 @@
+"""Tests for the features module."""
+
+import pytest
+
+from evolutionary_snake import game_objects, settings
+from evolutionary_snake.game_objects import boundaries
+from evolutionary_snake.game_objects.boundaries import boundary_factory
+from evolutionary_snake.machine_learning import feature_names, features
+from evolutionary_snake.utils import enums
+
+
+def test_feature_pipeline_default_features(
+    apple: game_objects.Apple,
+    snake: game_objects.Snake,
+) -> None:
+    """Test the values of the default features."""
+    # GIVEN a predefined snake and apple object
+    apple.x = 120
+    apple.y = 120
+    # AND a pipeline of the default features
+    pipeline = features.FeaturePipeline(feature_names.DEFAULT_FEATURES)
+    # WHEN the features are computed
+    buffer = pipeline.compute(snake=snake, apple=apple)
+    # THEN the buffer should hold the direction of the apple and the clear sides
+    assert buffer == [True, False, False, True, True, True, True, True]
+    # AND the buffer should be reused on the next step
+    snake.update(direction=snake.direction)
+    assert pipeline.compute(snake=snake, apple=apple) is buffer
+
+
+def test_feature_pipeline_names(
+    apple: game_objects.Apple,
+    snake: game_objects.Snake,
+) -> None:
+    """Test that the pipeline of all features writes a value for every input name."""
+    # GIVEN a pipeline of all features
+    pipeline = features.FeaturePipeline(enums.Feature)
+    # WHEN the features are computed
+    buffer = pipeline.compute(snake=snake, apple=apple)
+    # THEN there should be a value for every input node of the settings
+    node_names = settings.AiGameSettings(features=tuple(enums.Feature)).node_names
+    assert pipeline.names == [node_names[-index] for index in range(1, len(buffer) + 1)]
+    assert pipeline.size == len(buffer)
+
+
+def test_ray_distances(game_settings: settings.GameSettings) -> None:
+    """Test the distances to the wall, the body and the apple along the rays."""
+    # GIVEN a snake of length five that turned back next to its body
+    snake = game_objects.Snake(
+        length=5,
+        width=300,
+        height=300,
+        step_size=15,
+        boundary=boundaries.HardBoundary(game_settings),
+    )
+    snake.direction = enums.Direction.RIGHT
+    for direction in [enums.Direction.RIGHT] * 2 + [enums.Direction.DOWN] * 2:
+        snake.update(direction=direction)
+    snake.update(direction=enums.Direction.LEFT)
+    # AND an apple straight down and to the left of the head
+    apple = game_objects.Apple(free_cells=snake.free_cells)
+    apple.x, apple.y = 120, 225
+    # WHEN the ray distances are computed
+    pipeline = features.FeaturePipeline([enums.Feature.RAY_DISTANCES])
+    rays = dict(
+        zip(pipeline.names, pipeline.compute(snake=snake, apple=apple), strict=True)
+    )
+    # THEN the wall should be sensed by the distance to the edge of the board
+    assert rays["Ray_right_wall"] == pytest.approx(1 / 9)
+    assert rays["Ray_up_left_wall"] == pytest.approx(1 / 12)
+    # AND the body should be sensed where it crosses a ray
+    assert rays["Ray_right_body"] == 1
+    assert rays["Ray_up_body"] == pytest.approx(1 / 2)
+    assert rays["Ray_up_right_body"] == 1
+    assert rays["Ray_left_body"] == 0
+    # AND the apple should only be sensed on the ray it lies on
+    assert rays["Ray_down_left_apple"] == pytest.approx(1 / 3)
+    assert sum(value for name, value in rays.items() if name.endswith("apple")) == (
+        pytest.approx(1 / 3)
+    )
+    # AND nothing should be sensed once the head left the board
+    snake.x[0] = -15
+    assert not any(pipeline.compute(snake=snake, apple=apple))
+
+
+@pytest.mark.parametrize(
+    ("boundary_type", "reachable_area_exp"),
+    [
+        (enums.BoundaryType.HARD_BOUNDARY, 0.0),
+        (enums.BoundaryType.PERIODIC_BOUNDARY, 13 / 16),
+    ],
+)
+def test_reachable_area(
+    game_settings: settings.GameSettings,
+    boundary_type: enums.BoundaryType,
+    reachable_area_exp: float,
+) -> None:
+    """Test the area reachable from a head that is cornered by its body."""
+    # GIVEN a snake on a board of 4 by 4 cells with its head in a corner
+    game_settings.boundary_type = boundary_type
+    snake = game_objects.Snake(
+        length=3,
+        width=60,
+        height=60,
+        step_size=15,
+        boundary=boundary_factory.boundary_factory(game_settings),
+    )
+    apple = game_objects.Apple(free_cells=snake.free_cells)
+    # AND its body next to its head on both sides
+    snake.move_segment(0, 0, 0)
+    snake.move_segment(1, 15, 0)
+    snake.move_segment(2, 0, 15)
+    # WHEN the reachable area is computed
+    pipeline = features.FeaturePipeline([enums.Feature.REACHABLE_AREA])
+    # THEN only a periodic board should leave a way out of the corner
+    assert pipeline.compute(snake=snake, apple=apple) == [
+        pytest.approx(reachable_area_exp)
+    ]
+    # AND nothing should be reachable once the head left the board
+    snake.x[0] = -15
+    assert pipeline.compute(snake=snake, apple=apple) == [0.0]
+
+
+@pytest.mark.parametrize(
+    ("directions", "tail_direction_exp"),
+    [
+        ([], [0.0, 0.0, 0.0, 0.0]),
+        ([enums.Direction.RIGHT] * 3, [1.0, 0.0, 0.0, 0.0]),
+        ([enums.Direction.RIGHT] * 11, [1.0, 0.0, 0.0, 0.0]),
+        ([enums.Direction.UP] * 3, [0.0, 0.0, 1.0, 0.0]),
+        ([enums.Direction.DOWN] * 3, [0.0, 0.0, 0.0, 1.0]),
+        ([enums.Direction.DOWN] * 2 + [enums.Direction.LEFT] * 3, [0, 1.0, 0, 0]),
+    ],
+)
+def test_tail_direction(
+    apple: game_objects.Apple,
+    snake: game_objects.Snake,
+    directions: list[enums.Direction],
+    tail_direction_exp: list[float],
+) -> None:
+    """Test the direction of the tail, also when it wraps a periodic board."""
+    # GIVEN a snake that moved in the given directions
+    snake.direction = directions[0] if directions else enums.Direction.RIGHT
+    for direction in directions:
+        snake.update(direction=direction)
+    # WHEN the tail direction is computed
+    pipeline = features.FeaturePipeline([enums.Feature.TAIL_DIRECTION])
+    # THEN it should be the direction the tail moves in
+    assert pipeline.compute(snake=snake, apple=apple) == tail_direction_exp
+    # AND a snake without a tail should have no tail direction
+    snake.length = 1
+    assert pipeline.compute(snake=snake, apple=apple) == [0.0] * 4
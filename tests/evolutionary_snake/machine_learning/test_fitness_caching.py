@@ -0,0 +1,112 @@
+"""Tests for the fitness caching module."""
+
+import copy
+import pathlib
+
+import neat
+import pytest
+
+from evolutionary_snake.machine_learning import fitness_caching, fitness_evaluation
+from evolutionary_snake.settings import TrainingSettings
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+def test_genome_hash(neat_config: neat.Config) -> None:
+    """Test that genomes with the same network have the same hash."""
+    # GIVEN a genome and a copy of it with another key
+    genome = next(iter(neat.Population(neat_config).population.values()))
+    genome_copy = copy.deepcopy(genome)
+    genome_copy.key = genome.key + 1
+    # AND a disabled connection that was added to the copy
+    connection = neat.genes.DefaultConnectionGene((-1, -2))
+    connection.weight, connection.enabled = 1.0, False
+    genome_copy.connections[connection.key] = connection
+    # WHEN the hashes of the genomes are compared
+    # THEN the genomes should have the same hash
+    assert fitness_caching.genome_hash(genome) == fitness_caching.genome_hash(
+        genome_copy
+    )
+    # AND the hash should change with a weight of an enabled connection
+    next(iter(genome_copy.connections.values())).weight += 1.0
+    assert fitness_caching.genome_hash(genome) != fitness_caching.genome_hash(
+        genome_copy
+    )
+
+
+def test_conditions_hash() -> None:
+    """Test that the conditions hash only depends on how the genomes play."""
+    # GIVEN training settings and the episodes the genomes play
+    training_settings = TrainingSettings(step_limit=50)
+    episode_plan = fitness_evaluation.EpisodePlan(seeds=(1, 2))
+    conditions = fitness_caching.conditions_hash(training_settings, episode_plan)
+    # WHEN settings that do not change the games are changed
+    # THEN the conditions should have the same hash
+    assert conditions == fitness_caching.conditions_hash(
+        training_settings.model_copy(update={"generations": 1, "workers": 2}),
+        episode_plan,
+    )
+    # AND the hash should change with the step limit and the seeds
+    assert conditions != fitness_caching.conditions_hash(
+        training_settings.model_copy(update={"step_limit": 100}), episode_plan
+    )
+    assert conditions != fitness_caching.conditions_hash(
+        training_settings, fitness_evaluation.EpisodePlan(seeds=(1, 3))
+    )
+    # AND the elite fitness the episodes are pruned on should not change the hash
+    assert conditions == fitness_caching.conditions_hash(
+        training_settings.model_copy(update={"prune_episodes": True}),
+        episode_plan._replace(elite_fitness=1.0),
+    )
+
+
+def test_fitness_cache_evicts_least_recently_used() -> None:
+    """Test that a full cache evicts the fitness that was used least recently."""
+    # GIVEN a full cache of two fitnesses
+    fitness_cache = fitness_caching.FitnessCache(max_size=2)
+    fitness_cache.put("a", 1.0)
+    fitness_cache.put("b", 2.0)
+    # WHEN the first fitness is used and a third is cached
+    assert fitness_cache.get("a") == 1.0
+    fitness_cache.put("c", 3.0)
+    # THEN the fitness that was not used should be evicted
+    assert fitness_cache.get("b") is None
+    assert list(fitness_cache.entries.items()) == [("a", 1.0), ("c", 3.0)]
+
+
+def test_fitness_cache_without_path(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a cache without a path is not written after a generation."""
+    # GIVEN a cache without a path
+    monkeypatch.chdir(tmp_path)
+    fitness_cache = fitness_caching.FitnessCache(max_size=2)
+    fitness_cache.put("a", 1.0)
+    # WHEN a generation has been evaluated in the working directory
+    fitness_cache.post_evaluate(None, {}, None, None)
+    # THEN no file should be written
+    assert not list(tmp_path.iterdir())
+
+
+def test_fitness_cache_persists(tmp_path: pathlib.Path) -> None:
+    """Test that a cache is written after a generation and read by the next run."""
+    # GIVEN a cache with a path and two fitnesses
+    path_cache = tmp_path / "fitness_cache.json"
+    fitness_cache = fitness_caching.FitnessCache(max_size=2, path_cache=path_cache)
+    fitness_cache.put("a", 1.0)
+    fitness_cache.put("b", 2.0)
+    # WHEN a generation has been evaluated
+    fitness_cache.post_evaluate(None, {}, None, None)
+    # THEN a cache of the resumed run should read the fitnesses
+    assert fitness_caching.FitnessCache(max_size=2, path_cache=path_cache).entries == {
+        "a": 1.0,
+        "b": 2.0,
+    }
+    # AND a smaller cache should keep the most recently used fitness
+    assert fitness_caching.FitnessCache(max_size=1, path_cache=path_cache).entries == {
+        "b": 2.0
+    }
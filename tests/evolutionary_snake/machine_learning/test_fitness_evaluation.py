@@ -0,0 +1,93 @@
+"""Tests for the fitness evaluation module."""
+
+import pytest
+
+from evolutionary_snake import settings
+from evolutionary_snake.machine_learning import fitness_evaluation
+from evolutionary_snake.utils import enums
+
+
+def test_episode_seeds() -> None:
+    """Test that the seed schedule is deterministic per generation."""
+    # GIVEN a seed of a training run
+    seed = 42
+    # WHEN the seeds of three episodes are generated for two generations
+    seeds = fitness_evaluation.episode_seeds(seed=seed, generation=0, episodes=3)
+    # THEN the seeds should be the same for the same generation
+    assert seeds == fitness_evaluation.episode_seeds(seed, generation=0, episodes=3)
+    assert len(set(seeds)) == len(seeds)
+    # AND differ between generations
+    assert seeds != fitness_evaluation.episode_seeds(seed, generation=1, episodes=3)
+    # AND every episode should be a random game without a seed
+    assert fitness_evaluation.episode_seeds(None, generation=0, episodes=2) == (
+        None,
+        None,
+    )
+
+
+@pytest.mark.parametrize(
+    ("fitness_aggregation", "fitness_exp"),
+    [
+        (enums.FitnessAggregation.MEAN, 2.5),
+        (enums.FitnessAggregation.MIN, 1.0),
+        (enums.FitnessAggregation.QUANTILE, 1.75),
+    ],
+)
+def test_aggregate_fitness(
+    fitness_aggregation: enums.FitnessAggregation, fitness_exp: float
+) -> None:
+    """Test aggregating the fitness of multiple episodes."""
+    # GIVEN training settings with a fitness aggregation
+    training_settings = settings.TrainingSettings(
+        fitness_aggregation=fitness_aggregation, fitness_quantile=0.25
+    )
+    # WHEN the fitness of four episodes is aggregated
+    fitness = fitness_evaluation.aggregate_fitness(
+        [4.0, 1.0, 3.0, 2.0], training_settings
+    )
+    # THEN the fitness should be equal to an expected value
+    assert fitness == pytest.approx(fitness_exp)
+
+
+@pytest.mark.parametrize(
+    ("fitness_aggregation", "fitnesses", "cannot_beat_exp"),
+    [
+        (enums.FitnessAggregation.MIN, [20.0], False),
+        (enums.FitnessAggregation.MIN, [20.0, 5.0], True),
+        (enums.FitnessAggregation.QUANTILE, [5.0], False),
+        (enums.FitnessAggregation.QUANTILE, [5.0, 20.0, 5.0], True),
+        (enums.FitnessAggregation.MEAN, [5.0, 5.0, 5.0], False),
+    ],
+)
+def test_cannot_beat(
+    fitness_aggregation: enums.FitnessAggregation,
+    fitnesses: list[float],
+    cannot_beat_exp: bool,  # noqa: FBT001
+) -> None:
+    """Test detecting genomes that can no longer beat the elite."""
+    # GIVEN training settings with five episodes per genome
+    training_settings = settings.TrainingSettings(
+        episodes=5, fitness_aggregation=fitness_aggregation, fitness_quantile=0.25
+    )
+    # WHEN the fitness of the played episodes is compared with the elite fitness
+    # THEN it should only be decided when no remaining episode can change the outcome
+    assert (
+        fitness_evaluation.cannot_beat(fitnesses, 10.0, training_settings)
+        is cannot_beat_exp
+    )
+
+
+def test_plan_episodes() -> None:
+    """Test that the episodes of a generation are planned without an elite fitness."""
+    # GIVEN training settings that prune episodes
+    training_settings = settings.TrainingSettings(
+        seed=1, episodes=2, prune_episodes=True
+    )
+    # WHEN the episodes of a generation are planned
+    plan = fitness_evaluation.plan_episodes(training_settings, generation=3)
+    # THEN the plan should play the seeds of the generation
+    assert plan.seeds == fitness_evaluation.episode_seeds(
+        seed=1, generation=3, episodes=2
+    )
+    # AND the elite fitness should be left to the evaluation of the elites
+    assert plan.elite_fitness is None
@@ -0,0 +1,79 @@
+"""Tests for the genome index module."""
+
+import pathlib
+import random
+
+import neat
+import pytest
+
+from evolutionary_snake.machine_learning import genome_index
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+def _run_population(
+    neat_config: neat.Config, path_run: pathlib.Path, generations: int
+) -> neat.StatisticsReporter:
+    """Evolve a population with random fitness values, indexing the best genomes."""
+    path_run.mkdir()
+    random.seed(path_run.name)
+    population = neat.Population(neat_config)
+    stats = neat.StatisticsReporter()
+    population.add_reporter(stats)
+    population.add_reporter(
+        genome_index.GenomeIndex(
+            path_index=path_run / genome_index.INDEX_FILENAME, config_hash="hash"
+        )
+    )
+
+    def _evaluate(
+        genomes: list[tuple[int, neat.DefaultGenome]], config: neat.Config
+    ) -> None:
+        del config
+        for _, genome in genomes:
+            genome.fitness = random.random()  # noqa: S311  # nosec
+
+    population.run(_evaluate, n=generations)
+    return stats
+
+
+def test_genome_index(neat_config: neat.Config, tmp_path: pathlib.Path) -> None:
+    """Test that the index holds the best genome of every generation."""
+    # GIVEN a population that indexes its best genomes
+    generations = 3
+    stats = _run_population(neat_config, tmp_path / "run", generations)
+    # WHEN the index is read
+    entries = genome_index.read_index(tmp_path / "run" / genome_index.INDEX_FILENAME)
+    # THEN it should hold an entry for every generation
+    assert [entry.generation for entry in entries] == list(range(generations))
+    assert {entry.config_hash for entry in entries} == {"hash"}
+    # AND the entries should hold the best genome of every generation
+    for entry, genome_exp in zip(entries, stats.most_fit_genomes, strict=True):
+        genome = genome_index.deserialize_genome(entry.genome_key, entry.genome)
+        assert (entry.genome_key, entry.fitness) == (genome_exp.key, genome_exp.fitness)
+        assert genome_index.serialize_genome(genome) == (
+            genome_index.serialize_genome(genome_exp)
+        )
+
+
+def test_top_genomes(neat_config: neat.Config, tmp_path: pathlib.Path) -> None:
+    """Test selecting the best genomes of all training runs in a directory."""
+    # GIVEN a directory with two training runs
+    _run_population(neat_config, tmp_path / "run-0", generations=3)
+    _run_population(neat_config, tmp_path / "run-1", generations=3)
+    entries = genome_index.read_index(tmp_path)
+    # WHEN the best genomes are selected
+    k = 3
+    top = genome_index.top_genomes(tmp_path, k=k)
+    # THEN they should be the genomes with the highest fitness, best first
+    fitnesses = [entry.fitness for entry in top]
+    assert len(top) == k
+    assert fitnesses == sorted(fitnesses, reverse=True)
+    assert fitnesses[0] == max(entry.fitness for entry in entries)
+    # AND every genome should be listed once
+    keys = [(entry.path_index, entry.genome_key) for entry in top]
+    assert len(set(keys)) == k
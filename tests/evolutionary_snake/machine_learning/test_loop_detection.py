@@ -0,0 +1,26 @@
+"""Tests for the loop detection module."""
+
+from evolutionary_snake.machine_learning import loop_detection
+
+
+def test_loop_reporter() -> None:
+    """Test that the reporter adds up the loops of the games of every generation."""
+    # GIVEN a loop reporter
+    reporter = loop_detection.LoopReporter()
+    # WHEN a generation adds a genome with a loop and a genome without one
+    reporter.start_generation(2)
+    report = loop_detection.LoopReport()
+    report.add_game(looped=True, steps_saved=30)
+    report.add_game(looped=False, steps_saved=0)
+    reporter.add(report)
+    report = loop_detection.LoopReport()
+    report.add_game(looped=True, steps_saved=12)
+    reporter.add(report)
+    reporter.post_evaluate(None, {}, None, None)
+    # THEN the generation should be reported with the games of both genomes
+    assert reporter.generation_reports[-1] == loop_detection.LoopReport(
+        games=3, loops=2, steps_saved=42
+    )
+    # AND the next generation should start without loops
+    reporter.start_generation(3)
+    assert reporter.report == loop_detection.LoopReport()
@@ -0,0 +1,45 @@
+"""Tests for the population network module."""
+
+import pathlib
+import random
+
+import neat
+import numpy as np
+import pytest
+
+from evolutionary_snake.machine_learning import compiled_network, population_network
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+def test_population_network(neat_config: neat.Config) -> None:
+    """Test that a population network evaluates every network on its own inputs."""
+    # GIVEN compiled networks with different topologies and depths
+    random.seed(0)
+    networks = [
+        compiled_network.CompiledNetwork.create(neat.DefaultGenome(key=0), neat_config)
+    ]
+    for key in range(1, 6):
+        genome = neat.DefaultGenome(key=key)
+        genome.configure_new(neat_config.genome_config)
+        for _ in range(10 * key):
+            genome.mutate(neat_config.genome_config)
+        genome.nodes[0].activation = "relu"
+        networks.append(compiled_network.CompiledNetwork.create(genome, neat_config))
+    # WHEN they are packed into a population network
+    network = population_network.PopulationNetwork.create(networks)
+    # THEN a single call should give the outputs of every network on its own inputs
+    inputs = np.random.default_rng(0).random((len(networks), 8))
+    outputs = network.activate(inputs)
+    outputs_exp = [
+        single_network.activate(row)
+        for single_network, row in zip(networks, inputs.tolist(), strict=True)
+    ]
+    assert outputs == pytest.approx(np.array(outputs_exp))
+    # AND inputs of the wrong shape should be rejected
+    with pytest.raises(RuntimeError, match="Expected inputs of shape"):
+        network.activate(inputs[:-1])
@@ -0,0 +1,69 @@
+"""Tests for the profiling module."""
+
+import json
+import pathlib
+import time
+
+import pytest
+
+from evolutionary_snake.machine_learning import profiling
+from evolutionary_snake.utils import enums
+
+
+def test_game_profiler_excludes_nested_phases() -> None:
+    """Test that the time of a phase excludes the phases that run within it."""
+    # GIVEN a game profiler
+    profiler = profiling.GameProfiler()
+    # WHEN a step runs a phase within another phase
+    delay = 0.05
+    with profiler.phase(enums.ProfilePhase.GAME_LOGIC):
+        with profiler.phase(enums.ProfilePhase.INPUT_VECTOR):
+            time.sleep(delay)
+        time.sleep(delay / 5)
+    profiler.count_step()
+    # THEN both phases should be timed once
+    report = profiler.report()
+    assert report.counts[enums.ProfilePhase.GAME_LOGIC] == 1
+    assert report.counts[enums.ProfilePhase.INPUT_VECTOR] == 1
+    # AND the outer phase should exclude the time of the inner phase
+    assert report.times[enums.ProfilePhase.INPUT_VECTOR] >= delay
+    assert report.times[enums.ProfilePhase.GAME_LOGIC] < delay
+    assert report.steps_per_second == pytest.approx(1 / report.total_time)
+
+
+def _create_report(steps: int, time_per_step: float) -> profiling.ProfileReport:
+    """Create the report of a game that spent all its time choosing directions."""
+    report = profiling.ProfileReport(games=1, steps=steps)
+    report.times[enums.ProfilePhase.DIRECTION] = steps * time_per_step
+    report.counts[enums.ProfilePhase.DIRECTION] = steps
+    return report
+
+
+@pytest.mark.parametrize("export", [False, True])
+def test_profile_reporter(tmp_path: pathlib.Path, export: bool) -> None:  # noqa: FBT001
+    """Test that the reporter aggregates the profiles per genome and generation."""
+    # GIVEN a profile reporter
+    path_report = tmp_path / profiling.PROFILE_FILENAME
+    reporter = profiling.ProfileReporter(path_report=path_report if export else None)
+    # WHEN a generation adds two games of one genome and a game of another genome
+    generation = 3
+    reporter.start_generation(generation)
+    reporter.add(1, _create_report(steps=10, time_per_step=0.01))
+    reporter.add(1, _create_report(steps=30, time_per_step=0.01))
+    reporter.add(2, _create_report(steps=60, time_per_step=0.02))
+    reporter.post_evaluate(None, {}, None, None)
+    # THEN the generation should be reported with the games of all genomes
+    games_exp, steps_exp = 3, 100
+    report = reporter.generation_reports[-1]
+    assert (report.games, report.steps) == (games_exp, steps_exp)
+    assert report.steps_per_second == pytest.approx(steps_exp / 1.6)
+    # AND the reports should be exported per generation and genome when asked
+    assert path_report.exists() == export
+    if export:
+        line = json.loads(path_report.read_text(encoding="utf-8"))
+        assert line["generation"] == generation
+        assert line["steps"] == steps_exp
+        assert line["genomes"]["1"]["games"] == games_exp - 1
+        assert (
+            line["genomes"]["2"]["counts"]["direction"] == line["genomes"]["2"]["steps"]
+        )
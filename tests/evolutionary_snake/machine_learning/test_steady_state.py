@@ -0,0 +1,105 @@
+"""Tests for the steady state module."""
+
+import pathlib
+import random
+import threading
+
+import neat
+import pytest
+
+from evolutionary_snake.machine_learning import steady_state
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+class _DelayedEvaluator:  # pylint: disable=too-few-public-methods
+    """Evaluate genomes with a random fitness after a random delay."""
+
+    def __init__(self, error_at: int | None = None) -> None:
+        """Initialize the evaluator, the evaluation number error_at fails."""
+        self.error_at = error_at
+        self.elite_fitnesses: list[float | None] = []
+
+    def __call__(
+        self,
+        genome_item: steady_state.GenomeItemType,
+        elite_fitness: float | None,
+        callback: steady_state.ResultCallback,
+    ) -> None:
+        """Start an evaluation that finishes on a timer thread."""
+        del genome_item
+        self.elite_fitnesses.append(elite_fitness)
+        result: float | BaseException = random.random()  # noqa: S311  # nosec
+        if len(self.elite_fitnesses) == self.error_at:
+            result = ValueError("Evaluation failed")
+        delay = random.uniform(0.0, 0.01)  # noqa: S311  # nosec
+        threading.Timer(delay, callback, args=(result,)).start()
+
+
+@pytest.mark.parametrize("prune_episodes", [False, True])
+def test_steady_state_population(
+    neat_config: neat.Config, *, prune_episodes: bool
+) -> None:
+    """Test that results are merged into the population as they come in."""
+    # GIVEN a steady-state population with statistics
+    random.seed(0)
+    neat_config.pop_size = 6
+    population = steady_state.SteadyStatePopulation(
+        neat_config, max_in_flight=3, prune_episodes=prune_episodes
+    )
+    stats = neat.StatisticsReporter()
+    population.add_reporter(stats)
+    evaluator = _DelayedEvaluator()
+    generations = 4
+    # WHEN the population evolves, with evaluations that finish out of order
+    population.run(evaluator, n=generations)
+    # AND it evolves further
+    best = population.run(evaluator, n=1)
+    # THEN every generation should have been reported with a full population
+    assert population.generation == generations + 1
+    assert len(stats.most_fit_genomes) == generations + 1
+    assert len(population.population) == neat_config.pop_size
+    # AND every finished evaluation should count towards a generation
+    assert len(evaluator.elite_fitnesses) == (generations + 1) * neat_config.pop_size
+    # AND the best genome should be the best genome of all generations
+    assert best.fitness == max(genome.fitness for genome in stats.most_fit_genomes)
+    # AND only pruned offspring should have been submitted with the worst fitness
+    assert evaluator.elite_fitnesses[: neat_config.pop_size] == [None] * (
+        neat_config.pop_size
+    )
+    assert (evaluator.elite_fitnesses[-1] is not None) is prune_episodes
+
+
+@pytest.mark.parametrize(("pruned", "merged_exp"), [(False, True), (True, False)])
+def test_steady_state_population_merge_tie(
+    neat_config: neat.Config, *, pruned: bool, merged_exp: bool
+) -> None:
+    """Test that a pruned offspring has to be strictly fitter than the worst genome."""
+    # GIVEN a full population
+    population = steady_state.SteadyStatePopulation(neat_config, max_in_flight=1)
+    for fitness in range(neat_config.pop_size):
+        genome = neat.DefaultGenome(fitness)
+        genome.fitness = float(fitness)
+        population.population[genome.key] = genome
+    # WHEN an offspring as fit as the worst genome is merged
+    offspring = neat.DefaultGenome(neat_config.pop_size)
+    offspring.fitness = 0.0
+    population._merge(offspring, pruned=pruned)  # noqa: SLF001  # pylint: disable=W0212
+    # THEN it should only replace the worst genome when it played all episodes
+    assert (offspring.key in population.population) is merged_exp
+    assert len(population.population) == neat_config.pop_size
+
+
+def test_steady_state_population_raises_error(neat_config: neat.Config) -> None:
+    """Test that an error of an evaluation is raised."""
+    # GIVEN a steady-state population and an evaluation that fails
+    population = steady_state.SteadyStatePopulation(neat_config, max_in_flight=2)
+    evaluator = _DelayedEvaluator(error_at=2)
+    # WHEN the population evolves
+    # THEN the error should be raised
+    with pytest.raises(ValueError, match="Evaluation failed"):
+        population.run(evaluator, n=1)
@@ -0,0 +1,70 @@
+"""Tests for the successive halving module."""
+
+import pytest
+
+from evolutionary_snake.machine_learning import successive_halving
+from evolutionary_snake.settings import TrainingSettings
+
+
+@pytest.mark.parametrize(
+    ("step_limit", "rungs_exp"),
+    [
+        (
+            50,
+            [
+                successive_halving.Rung(n_genomes=10, step_limit=12, episodes=1),
+                successive_halving.Rung(n_genomes=5, step_limit=25, episodes=2),
+                successive_halving.Rung(n_genomes=3, step_limit=50, episodes=4),
+            ],
+        ),
+        (
+            -1,
+            [
+                successive_halving.Rung(n_genomes=10, step_limit=-1, episodes=1),
+                successive_halving.Rung(n_genomes=5, step_limit=-1, episodes=2),
+                successive_halving.Rung(n_genomes=3, step_limit=-1, episodes=4),
+            ],
+        ),
+    ],
+)
+def test_plan_rungs(step_limit: int, rungs_exp: list[successive_halving.Rung]) -> None:
+    """Test that every rung halves the genomes and doubles the budget."""
+    # GIVEN training settings with three rungs that halve the genomes
+    training_settings = TrainingSettings(
+        step_limit=step_limit, episodes=4, halving_rungs=3, halving_eta=2
+    )
+    # WHEN the rungs of ten genomes are planned
+    rungs = successive_halving.plan_rungs(10, training_settings)
+    # THEN the last rung should play the full budget
+    assert rungs == rungs_exp
+
+
+def test_promote() -> None:
+    """Test that the fittest genomes of a rung are promoted."""
+    # GIVEN the fitness of the genomes of a rung
+    fitnesses = {1: 3.0, 2: -1.0, 3: 7.0, 4: 5.0}
+    # WHEN the two fittest genomes are promoted
+    # THEN the genomes with the highest fitness should play the next rung
+    assert successive_halving.promote(fitnesses, 2) == {3, 4}
+
+
+def test_assign_fitness() -> None:
+    """Test that genomes promoted further always rank above the genomes they beat."""
+    # GIVEN the fitness of the genomes on three rungs
+    rung_fitnesses = [
+        {1: 10.0, 2: 20.0, 3: 30.0, 4: 5.0},
+        {2: 60.0, 3: 35.0},
+        {2: 40.0},
+    ]
+    # WHEN the fitness of every genome is assigned
+    fitness = successive_halving.assign_fitness(rung_fitnesses)
+    # THEN the genome of the last rung should keep its fitness
+    # AND the genomes that stopped on a rung should rank below the rungs above
+    assert fitness == {2: 40.0, 3: 35.0, 1: 10.0, 4: 5.0}
+    rung_fitnesses[-1][2] = 8.0
+    assert successive_halving.assign_fitness(rung_fitnesses) == {
+        2: 8.0,
+        3: 7.0,
+        1: 6.0,
+        4: 1.0,
+    }
@@ -0,0 +1,37 @@
+"""Module with grid geometry tests."""
+
+import pickle  # nosec
+
+from evolutionary_snake import settings
+from evolutionary_snake.game_objects import boundaries
+
+
+def test_grid_geometry(game_settings: settings.GameSettings) -> None:
+    """Test that the geometry is computed once and shared between settings."""
+    # GIVEN two settings objects with the same board size
+    game_settings_other = game_settings.model_copy(update={"seed": 1})
+    # WHEN their geometry is requested
+    geometry = game_settings.geometry
+    # THEN both settings should share the same geometry object
+    assert geometry is game_settings_other.geometry
+    # AND the geometry should hold every cell of the board
+    n_cells_exp = 400
+    assert len(geometry.cells) == n_cells_exp
+    assert all(geometry.on_board(x, y) for x, y in geometry.cells)
+    # AND the boundary should enclose the board
+    n_boundary_cells_exp = 84
+    assert len(geometry.boundary) == n_boundary_cells_exp
+    assert not any(geometry.on_board(x, y) for x, y in geometry.boundary)
+    # AND an unpickled geometry should resolve to the cached object
+    assert pickle.loads(pickle.dumps(geometry)) is geometry  # noqa: S301  # nosec
+
+
+def test_hard_boundary_coordinates(game_settings: settings.GameSettings) -> None:
+    """Test that the hard boundary uses the cached boundary geometry."""
+    # GIVEN a hard boundary
+    boundary = boundaries.HardBoundary(game_settings)
+    # WHEN its coordinates are requested
+    # THEN they should be the boundary cells of the cached geometry
+    assert boundary.coordinates is game_settings.geometry.boundary
+    assert (-15, 150) in boundary.coordinates
+    assert (300, 300) in boundary.coordinates
@@ -0,0 +1,257 @@
+"""Tests for the batch game engine module."""
+
+import pathlib
+import random
+
+import neat
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from evolutionary_snake import game_modes, game_objects, settings, simulation
+from evolutionary_snake.machine_learning import feature_names, features
+from evolutionary_snake.utils import enums
+
+
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[2] / "data" / "neat_config"
+
+
+def test_batch_game_engine_init(ai_settings: settings.AiGameSettings) -> None:
+    """Test the initial state of the batch game engine."""
+    # GIVEN AI settings
+    # WHEN a batch game engine is instantiated
+    n_games = 5
+    engine = simulation.BatchGameEngine(game_settings=ai_settings, n_games=n_games)
+    # THEN every snake should start in the center of the board
+    assert engine.coordinates(0) == [(150, 150), (-15, 150), (-15, 150)]
+    center = 10
+    assert engine.head_x.tolist() == [center] * n_games
+    assert engine.head_y.tolist() == [center] * n_games
+    # AND only the head should occupy a cell on the board
+    assert engine.occupancy.sum(axis=(1, 2)).tolist() == [1] * n_games
+    # AND no apple should be placed on top of the snake
+    assert not np.any((engine.apple_x == center) & (engine.apple_y == center))
+    # AND all games should be alive
+    assert engine.alive.all()
+
+
+def test_batch_game_engine_seeds(ai_settings: settings.AiGameSettings) -> None:
+    """Test that games with the same seed start from the same state."""
+    # GIVEN a list of seeds with a repeated seed
+    seeds = [3, 3, 4]
+    # WHEN two batch game engines are instantiated with these seeds
+    engine = simulation.BatchGameEngine(
+        game_settings=ai_settings, n_games=3, seeds=seeds
+    )
+    engine_other = simulation.BatchGameEngine(
+        game_settings=ai_settings, n_games=3, seeds=seeds
+    )
+    # THEN games with the same seed should have the same apple and direction
+    assert engine.apple_x.tolist() == engine_other.apple_x.tolist()
+    assert engine.apple_y.tolist() == engine_other.apple_y.tolist()
+    assert engine.direction.tolist() == engine_other.direction.tolist()
+    assert (engine.apple_x[0], engine.apple_y[0]) == (
+        engine.apple_x[1],
+        engine.apple_y[1],
+    )
+
+
+def test_batch_game_engine_runs_into_hard_boundary(
+    ai_settings: settings.AiGameSettings,
+) -> None:
+    """Test that all snakes of a batch stop when they run into the hard boundary."""
+    # GIVEN a batch game engine with snakes moving to the right
+    engine = simulation.BatchGameEngine(game_settings=ai_settings, n_games=3)
+    engine.direction[:] = enums.Direction.RIGHT.value
+    engine.apple_x[:], engine.apple_y[:] = 8, 12
+    engine.apple_distance = engine.distance_to_apple()
+    # WHEN the games are run with a policy that always wants to move left
+    loss = engine.run(lambda _, alive: np.zeros(alive.shape, dtype=np.int64))
+    # THEN every game should have collided after 10 steps
+    assert not engine.alive.any()
+    assert engine.collided.all()
+    assert engine.steps_total.tolist() == [10] * 3
+    # AND the loss should be equal to an expected value
+    assert loss.tolist() == [-1000.0] * 3
+    # AND stepping finished games should not change them
+    engine.step(np.zeros(3, dtype=np.int64))
+    assert engine.steps_total.tolist() == [10] * 3
+
+
+def test_batch_game_engine_step_limit(ai_settings: settings.AiGameSettings) -> None:
+    """Test that a game without any steps allowed ends immediately."""
+    # GIVEN AI settings with a step limit of zero
+    ai_settings.step_limit = 0
+    # WHEN a batch game engine is instantiated
+    engine = simulation.BatchGameEngine(game_settings=ai_settings, n_games=2)
+    # THEN the games should have ended without colliding
+    assert not engine.alive.any()
+    assert not engine.collided.any()
+
+
+def test_batch_game_engine_full_board(ai_settings: settings.AiGameSettings) -> None:
+    """Test that a game whose snake fills the board keeps its apple."""
+    # GIVEN a batch game engine with a board that is fully occupied
+    engine = simulation.BatchGameEngine(game_settings=ai_settings, n_games=1)
+    engine.occupancy[0] = 1
+    apple_exp = (int(engine.apple_x[0]), int(engine.apple_y[0]))
+    # WHEN a new apple is spawned
+    engine.spawn_apples(np.array([0]))
+    # THEN the apple should stay where it was
+    assert (int(engine.apple_x[0]), int(engine.apple_y[0])) == apple_exp
+
+
+def _play_ai_game(
+    game_settings: settings.AiGameSettings,
+    monkeypatch: pytest.MonkeyPatch,
+    directions: list[enums.Direction],
+    rng: random.Random,
+) -> tuple[
+    game_modes.AiGameMode, enums.Direction, list[tuple[int, int]], list[list[float]]
+]:
+    """Play an AI game that follows the directions.
+
+    Returns the game, its initial direction, its apples and its input vectors.
+    """
+    game = game_modes.AiGameMode(game_settings=game_settings)
+    direction_initial = game.snake.direction
+    apples = [(game.apple.x, game.apple.y)]
+    input_vectors: list[list[float]] = []
+
+    def _get_direction() -> enums.Direction:
+        input_vectors.append(list(game.inputs))
+        return directions[len(input_vectors) - 1]
+
+    def _generate_apple() -> game_objects.Apple:
+        apple = game_objects.Apple(free_cells=game.snake.free_cells, rng=rng)
+        apples.append((apple.x, apple.y))
+        return apple
+
+    monkeypatch.setattr(game, "get_direction", _get_direction)
+    monkeypatch.setattr(game, "generate_apple", _generate_apple)
+    game.run()
+    return game, direction_initial, apples, input_vectors
+
+
+def _get_game_settings(
+    ai_settings: settings.AiGameSettings,
+    neat_config: neat.Config,
+    boundary_type: enums.BoundaryType,
+    seed: int,
+) -> settings.AiGameSettings:
+    """Return headless, seeded settings of a game with a new genome."""
+    genome = neat.DefaultGenome(key=seed)
+    genome.configure_new(neat_config.genome_config)
+    return ai_settings.model_copy(
+        update={
+            "headless": True,
+            "seed": seed,
+            "step_limit": 200,
+            "boundary_type": boundary_type,
+            "neural_net": neat.nn.FeedForwardNetwork.create(genome, neat_config),
+        }
+    )
+
+
+def _create_engine(
+    game_settings: settings.AiGameSettings,
+    monkeypatch: pytest.MonkeyPatch,
+    direction_initial: enums.Direction,
+    apples: list[tuple[int, int]],
+) -> simulation.BatchGameEngine:
+    """Create a batch game engine of one game with the given direction and apples."""
+    engine = simulation.BatchGameEngine(game_settings=game_settings, n_games=1)
+    engine.direction[0] = direction_initial.value
+    engine.apple_x[0] = apples[0][0] // game_settings.step_size
+    engine.apple_y[0] = apples[0][1] // game_settings.step_size
+    engine.apple_distance = engine.distance_to_apple()
+    next_apples = iter(apples[1:])
+
+    def _spawn_apples(games: npt.NDArray[np.int64]) -> None:
+        for game_index in games:
+            apple_x, apple_y = next(next_apples)
+            engine.apple_x[game_index] = apple_x // game_settings.step_size
+            engine.apple_y[game_index] = apple_y // game_settings.step_size
+
+    monkeypatch.setattr(engine, "spawn_apples", _spawn_apples)
+    return engine
+
+
+@pytest.mark.parametrize(
+    "boundary_type",
+    [enums.BoundaryType.HARD_BOUNDARY, enums.BoundaryType.PERIODIC_BOUNDARY],
+)
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_batch_game_engine_matches_ai_game_mode(
+    ai_settings: settings.AiGameSettings,
+    neat_config: neat.Config,
+    monkeypatch: pytest.MonkeyPatch,
+    boundary_type: enums.BoundaryType,
+    seed: int,
+) -> None:
+    """Test that the batch game engine plays the same game as the AI game mode."""
+    # GIVEN a headless AI game mode that follows a random sequence of directions
+    rng = random.Random(seed)  # noqa: S311
+    directions = [rng.choice(list(enums.Direction)) for _ in range(2000)]
+    game_settings = _get_game_settings(ai_settings, neat_config, boundary_type, seed)
+    game, direction_initial, apples, input_vectors = _play_ai_game(
+        game_settings, monkeypatch, directions, rng
+    )
+
+    # AND a batch game engine with the same initial state and apples
+    engine = _create_engine(game_settings, monkeypatch, direction_initial, apples)
+
+    def _policy(
+        engine_input_vectors: npt.NDArray[np.float64], alive: npt.NDArray[np.bool_]
+    ) -> list[int]:
+        del alive
+        step = int(engine.steps_total[0])
+        # THEN the input vectors of every step should be equal
+        assert engine_input_vectors[0].tolist() == input_vectors[step]
+        return [directions[step].value]
+
+    # WHEN the batch game engine is run with the same directions
+    loss = engine.run(_policy)
+    # THEN both games should have ended in the same state
+    assert engine.coordinates(0) == game.snake.coordinates
+    assert engine.steps_total[0] == game.loss_tracker.steps_total
+    assert engine.score[0] == game.score
+    assert bool(engine.collided[0]) == game.collided()
+    assert loss[0] == pytest.approx(game.loss_tracker.loss)
+
+
+@pytest.mark.parametrize(
+    "boundary_type",
+    [enums.BoundaryType.HARD_BOUNDARY, enums.BoundaryType.PERIODIC_BOUNDARY],
+)
+def test_batch_game_engine_input_vectors_follow_default_features(
+    ai_settings: settings.AiGameSettings,
+    neat_config: neat.Config,
+    monkeypatch: pytest.MonkeyPatch,
+    boundary_type: enums.BoundaryType,
+) -> None:
+    """Test that the input vector columns follow the inputs of the default features."""
+    # GIVEN an AI game mode and a batch game engine with the same snake
+    game_settings = _get_game_settings(ai_settings, neat_config, boundary_type, 0)
+    game = game_modes.AiGameMode(game_settings=game_settings)
+    engine = _create_engine(
+        game_settings, monkeypatch, game.snake.direction, [(game.apple.x, game.apple.y)]
+    )
+    # AND the feature pipeline of the default features
+    pipeline = features.FeaturePipeline(feature_names.DEFAULT_FEATURES)
+    step_size = game_settings.step_size
+    head_x, head_y = game.snake.head
+    for d_x, d_y in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        # WHEN the apple lies next to the head
+        game.apple.x, game.apple.y = head_x + d_x * step_size, head_y + d_y * step_size
+        engine.apple_x[0] = game.apple.x // step_size
+        engine.apple_y[0] = game.apple.y // step_size
+        # THEN every column holds the value of the pipeline input of the same name
+        columns = engine.compute_input_vectors()[0].tolist()
+        inputs = pipeline.compute(game.snake, game.apple)
+        assert dict(zip(pipeline.names, columns, strict=True)) == dict(
+            zip(pipeline.names, inputs, strict=True)
+        )
@@ -0,0 +1,29 @@
+"""Tests for the replay module."""
+
+import pathlib
+
+from evolutionary_snake import simulation
+
+
+def test_replays_round_trip(tmp_path: pathlib.Path) -> None:
+    """Test that replays are read back as they were appended."""
+    # GIVEN replays appended to two files in a directory
+    replays = [
+        simulation.Replay(
+            name=f"snake_{index}",
+            game_settings={"seed": index},
+            directions=bytes([0, 1, 2, 3] * (index + 1)),
+            score=index,
+        )
+        for index in range(3)
+    ]
+    path_replays = tmp_path / simulation.REPLAY_DIRNAME
+    simulation.append_replay(path_replays / "replays-0.jsonl", replays[0])
+    simulation.append_replay(path_replays / "replays-0.jsonl", replays[1])
+    simulation.append_replay(path_replays / "replays-1.jsonl", replays[2])
+    # WHEN the replays of a file and of the directory are read
+    # THEN they should equal the appended replays
+    assert simulation.read_replays(path_replays / "replays-0.jsonl") == replays[:2]
+    assert simulation.read_replays(tmp_path) == replays
+    # AND every step should be stored
+    assert [replay.steps for replay in replays] == [4, 8, 12]
@@ -0,0 +1,54 @@
+"""Test module to test the command line interface."""
+
+import functools
+import pathlib
+
+import pytest
+from click import testing
+
+from evolutionary_snake import cli, settings, snake_training
+
+
+def test_start_training_broker_options(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    """Test that the broker options of start_training reach the broker."""
+    # GIVEN training settings with test locations and a broker that stops training
+    monkeypatch.setattr(
+        settings,
+        "TrainingSettings",
+        functools.partial(
+            settings.TrainingSettings,
+            path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+            checkpoint_prefix=tmp_path / "neat-checkpoint-",
+        ),
+    )
+    broker_settings = []
+
+    def _distributed_broker(training_settings: settings.TrainingSettings) -> None:
+        broker_settings.append(training_settings)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(snake_training, "distributed_broker", _distributed_broker)
+    # WHEN the distributed training is started with broker options
+    result = testing.CliRunner().invoke(
+        cli.start_training,
+        [
+            "--training-mode",
+            "distributed",
+            "--broker-host",
+            "0.0.0.0",  # noqa: S104
+            "--broker-port",
+            "6000",
+            "--local-workers",
+            "2",
+        ],
+    )
+    # THEN the broker is created from the options
+    assert result.exit_code == 0
+    assert "Training cancelled by user" in result.output
+    assert len(broker_settings) == 1
+    training_settings = broker_settings[0]
+    assert training_settings.broker_host == "0.0.0.0"  # noqa: S104
+    assert training_settings.broker_port == 6000  # noqa: PLR2004
+    assert training_settings.local_workers == 2  # noqa: PLR2004
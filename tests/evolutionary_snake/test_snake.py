@@ -1,11 +1,18 @@
 """Test module to test the main module."""
 
 import pathlib
+import shutil
 
+import neat
 import pytest
 
-from evolutionary_snake import snake
-from evolutionary_snake.utils import enums
+from evolutionary_snake import game_canvas, simulation, snake
+from evolutionary_snake.machine_learning import (
+    checkpointing,
+    compiled_network,
+    genome_index,
+)
+from evolutionary_snake.utils import enums, utility_functions
 
 
 def test_snake(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -31,3 +38,109 @@ def test_snake_with_checkpoint() -> None:
         / "data"
         / "test-neat-checkpoint-0",
     )
+
+
+def test_get_neural_net_from_compact_checkpoint(tmp_path: pathlib.Path) -> None:
+    """Test creating the neural network of the best genome of a compact checkpoint."""
+    # GIVEN a compact checkpoint next to its neat config
+    path_neat_config = pathlib.Path(__file__).parents[1] / "data" / "neat_config"
+    shutil.copy(path_neat_config, tmp_path / "neat_config")
+    neat_config = utility_functions.get_neat_config(path_neat_config)
+    population = neat.Population(neat_config)
+    genomes = list(population.population.values())
+    genomes[0].fitness, genomes[1].fitness = 1.0, 2.0
+    with checkpointing.Checkpointer(
+        filename_prefix=tmp_path / "checkpoint-"
+    ) as checkpointer:
+        path_checkpoint = checkpointer.save_checkpoint(
+            population.population, population.species, generation=0
+        )
+    # WHEN the neural network is created from the checkpoint
+    get_neural_net = snake._get_neural_net_from_checkpoint  # noqa: SLF001  # pylint: disable=W0212
+    network = get_neural_net(path_checkpoint)
+    # THEN it should be the network of the genome with the highest fitness
+    network_exp = compiled_network.CompiledNetwork.create(genomes[1], neat_config)
+    inputs = [1.0] * network.n_inputs
+    assert network.activate(inputs) == network_exp.activate(inputs)
+
+
+def test_get_neural_net_from_genome_index(tmp_path: pathlib.Path) -> None:
+    """Test creating the neural network of a genome selected from a genome index."""
+    # GIVEN a run directory with a neat config and an index of two genomes
+    path_neat_config = pathlib.Path(__file__).parents[1] / "data" / "neat_config"
+    shutil.copy(path_neat_config, tmp_path / "neat_config")
+    neat_config = utility_functions.get_neat_config(path_neat_config)
+    population = neat.Population(neat_config)
+    genomes = list(population.population.values())
+    index = genome_index.GenomeIndex(
+        path_index=tmp_path / genome_index.INDEX_FILENAME,
+        config_hash=genome_index.get_config_hash(tmp_path / "neat_config"),
+    )
+    for generation, (genome, fitness) in enumerate(
+        zip(genomes, [1.0, 2.0], strict=True)
+    ):
+        genome.fitness = fitness
+        index.start_generation(generation)
+        index.post_evaluate(neat_config, population.population, None, genome)
+    get_neural_net = snake._get_neural_net_from_checkpoint  # noqa: SLF001  # pylint: disable=W0212
+    # WHEN the neural network of the second best genome is created
+    network = get_neural_net(tmp_path, rank=2)
+    # THEN it should be the network of the genome with the lowest fitness
+    network_exp = compiled_network.CompiledNetwork.create(genomes[0], neat_config)
+    inputs = [1.0] * network.n_inputs
+    assert network.activate(inputs) == network_exp.activate(inputs)
+    # AND a rank beyond the number of genomes should raise a ValueError
+    with pytest.raises(ValueError, match="holds fewer than 3 genomes"):
+        get_neural_net(tmp_path / genome_index.INDEX_FILENAME, rank=3)
+    # AND a changed neat config should raise a ValueError
+    with (tmp_path / "neat_config").open("a", encoding="utf-8") as file:
+        file.write("\n")
+    with pytest.raises(ValueError, match="trained with another neat config"):
+        get_neural_net(tmp_path)
+
+
+def test_run_replay(tmp_path: pathlib.Path) -> None:
+    """Test re-simulating a game from a directory of replays."""
+    # GIVEN a directory with the replay of a game
+    steps = 4
+    replay = simulation.Replay(
+        name="snake_01",
+        game_settings={"seed": 1, "boundary_type": "periodic_boundary"},
+        directions=bytes([enums.Direction.UP.value] * steps),
+        score=0,
+    )
+    simulation.append_replay(tmp_path / "replays.jsonl", replay)
+    # WHEN the replay is run headless
+    game = snake.run_replay(tmp_path, headless=True)
+    # THEN every step should have been re-simulated
+    assert game.step == steps
+    # AND a replay that is not there should raise an IndexError
+    with pytest.raises(IndexError, match="holds 1 replays, not replay 1"):
+        snake.run_replay(tmp_path, index=1)
+
+
+def test_run_replay_exports_gif(tmp_path: pathlib.Path) -> None:
+    """Test exporting the frames of a replay to an animated GIF."""
+    # GIVEN a file with the replay of a game
+    steps = 4
+    replay = simulation.Replay(
+        name="snake_01",
+        game_settings={"seed": 1, "boundary_type": "periodic_boundary"},
+        directions=bytes([enums.Direction.UP.value] * steps),
+        score=0,
+    )
+    simulation.append_replay(tmp_path / "replays.jsonl", replay)
+    # WHEN a frame range of the replay is exported headless
+    path_gif = tmp_path / "replay.gif"
+    frames = range(1, 3)
+    game = snake.run_replay(
+        tmp_path / "replays.jsonl",
+        frames=frames,
+        headless=True,
+        path_frames=path_gif,
+    )
+    # THEN the GIF should hold the frames of the range and the final frame
+    assert isinstance(game.canvas, game_canvas.OffscreenCanvas)
+    assert isinstance(game.canvas.writer, game_canvas.GifWriter)
+    assert game.canvas.writer.n_frames == len(frames) + 1
+    assert path_gif.read_bytes().startswith(b"GIF89a")
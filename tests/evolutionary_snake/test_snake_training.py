@@ -1,13 +1,45 @@
 """Module with tests for snake_training module."""
 
+import copy
+import json
 import pathlib
+import queue
+import random
 import shutil
+import typing
 
+import neat
+import pytest
+
+from evolutionary_snake import (
+    game_canvas,
+    game_modes,
+    settings,
+    simulation,
+    snake_training,
+)
+from evolutionary_snake.machine_learning import (
+    feature_names,
+    fitness_caching,
+    fitness_evaluation,
+    loop_detection,
+    profiling,
+)
 from evolutionary_snake.settings import TrainingSettings
-from evolutionary_snake.snake_training import run_snake_training
+from evolutionary_snake.snake_training import (
+    TrainingFunctionsDict,
+    run_snake_training,
+    worker_pool,
+)
 from evolutionary_snake.utils import enums
 
 
+@pytest.fixture(name="path_neat_config")
+def path_neat_config_fixture() -> pathlib.Path:
+    """Path to a test neat config file."""
+    return pathlib.Path(__file__).parents[1] / "data" / "neat_config"
+
+
 def test_run_snake_training_sequential() -> None:
     """Test running the snake_training sequentially."""
     # GIVEN a training settings object with test locations
@@ -24,8 +56,8 @@ def test_run_snake_training_sequential() -> None:
         training_mode=enums.TrainingMode.SEQUENTIAL,
         training_settings=training_settings,
     )
-    # THEN the given locations should contain 2 files
-    n_files_exp = 2
+    # THEN the given locations should contain 3 files
+    n_files_exp = 3
     assert (
         len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
     )
@@ -48,9 +80,798 @@ def test_run_snake_training_parallel() -> None:
         training_mode=enums.TrainingMode.PARALLEL,
         training_settings=training_settings,
     )
-    # THEN the given locations should contain 2 files
-    n_files_exp = 2
+    # THEN the given locations should contain 3 files
+    n_files_exp = 3
+    assert (
+        len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
+    )
+    shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+def test_run_snake_training_vectorized() -> None:
+    """Test running the snake_training on the batch game engine."""
+    # GIVEN a seeded training settings object with test locations
+    training_settings = TrainingSettings(
+        generations=2,
+        seed=0,
+        episodes=2,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=pathlib.Path(__file__).parents[1]
+        / "data"
+        / "temp"
+        / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(
+        training_mode=enums.TrainingMode.VECTORIZED,
+        training_settings=training_settings,
+    )
+    # THEN the given locations should contain 4 files
+    n_files_exp = 4
+    assert (
+        len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
+    )
+    shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+def test_run_snake_training_distributed() -> None:
+    """Test running the snake_training on local distributed workers."""
+    # GIVEN a training settings object with test locations and two local workers
+    training_settings = TrainingSettings(
+        generations=1,
+        broker_port=0,
+        local_workers=2,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=pathlib.Path(__file__).parents[1]
+        / "data"
+        / "temp"
+        / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(
+        training_mode=enums.TrainingMode.DISTRIBUTED,
+        training_settings=training_settings,
+    )
+    # THEN the given locations should contain 3 files
+    n_files_exp = 3
+    assert (
+        len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
+    )
+    shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+def test_run_snake_training_steady_state() -> None:
+    """Test running the snake_training as a steady-state population."""
+    # GIVEN a training settings object with test locations that prunes episodes
+    training_settings = TrainingSettings(
+        generations=2,
+        workers=2,
+        episodes=2,
+        prune_episodes=True,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=pathlib.Path(__file__).parents[1]
+        / "data"
+        / "temp"
+        / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(
+        training_mode=enums.TrainingMode.STEADY_STATE,
+        training_settings=training_settings,
+    )
+    # THEN the given locations should contain 4 files
+    n_files_exp = 4
+    assert (
+        len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
+    )
+    shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+@pytest.mark.parametrize(
+    ("training_mode", "n_files_exp"),
+    [
+        (enums.TrainingMode.SEQUENTIAL, 4),
+        (enums.TrainingMode.PARALLEL, 4),
+        (enums.TrainingMode.VECTORIZED, 3),
+    ],
+)
+def test_run_snake_training_profiled(
+    training_mode: enums.TrainingMode, n_files_exp: int
+) -> None:
+    """Test that a profiled training exports the profile of every generation."""
+    # GIVEN a training settings object with test locations that profiles games
+    training_settings = TrainingSettings(
+        generations=1,
+        workers=2,
+        episodes=2,
+        profile=True,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=pathlib.Path(__file__).parents[1]
+        / "data"
+        / "temp"
+        / "checkpoint-",
+    )
+    path_report = training_settings.checkpoint_prefix.parent / (  # pylint: disable=E1101
+        profiling.PROFILE_FILENAME
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(training_mode=training_mode, training_settings=training_settings)
+    # THEN the given locations should contain the profile when the mode supports it
+    assert (
+        len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
+    )
+    if path_report.exists():
+        # AND the profile should hold the games of all genomes
+        line = json.loads(path_report.read_text(encoding="utf-8"))
+        assert line["games"] == (
+            training_settings.neat_config.pop_size * training_settings.episodes
+        )
+    shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+def test_run_snake_training_records_replays() -> None:
+    """Test that a training records a replay of every game it plays."""
+    # GIVEN a training settings object with test locations that records replays
+    training_settings = TrainingSettings(
+        generations=1,
+        episodes=2,
+        record_replays=True,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=pathlib.Path(__file__).parents[1]
+        / "data"
+        / "temp"
+        / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(
+        training_mode=enums.TrainingMode.SEQUENTIAL,
+        training_settings=training_settings,
+    )
+    # THEN every game of every genome should have been recorded
+    replays = simulation.read_replays(
+        training_settings.checkpoint_prefix.parent / simulation.REPLAY_DIRNAME  # pylint: disable=E1101
+    )
+    assert len(replays) == (
+        training_settings.neat_config.pop_size * training_settings.episodes
+    )
+    # AND every replay should re-simulate to the recorded score
+    for replay in replays:
+        game = game_modes.ReplayGameMode(replay)
+        game.run()
+        assert (game.step, game.score) == (replay.steps, replay.score)
+    shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+def test_eval_genomes_parallel_without_pool(neat_config: neat.Config) -> None:
+    """Test the parallel evaluation function when no worker pool is provided."""
+    # GIVEN a population of genomes without fitness
+    population = neat.Population(neat_config)
+    genomes = list(population.population.items())
+    assert all(genome.fitness is None for _, genome in genomes)
+    # WHEN the parallel evaluation function is called without a worker pool
+    evaluation_function = TrainingFunctionsDict[enums.TrainingMode.PARALLEL]
+    evaluation_function(
+        genomes=genomes,
+        neat_config=neat_config,
+        training_settings=TrainingSettings(workers=2, chunk_size=1),
+    )
+    # THEN every genome should have been assigned a fitness
+    assert all(genome.fitness is not None for _, genome in genomes)
+
+
+def test_worker_pool_terminates_on_error() -> None:
+    """Test that the worker pool is terminated when the training fails."""
+
+    # GIVEN a training run that fails while the worker pool is in use
+    def _failing_training() -> None:
+        with worker_pool(TrainingSettings(workers=1)):
+            msg = "training failed"
+            raise RuntimeError(msg)
+
+    # WHEN the training is run
+    # THEN the error should be propagated after terminating the pool
+    with pytest.raises(RuntimeError, match="training failed"):
+        _failing_training()
+
+
+def test_eval_genomes_distributed_matches_sequential(neat_config: neat.Config) -> None:
+    """Test that distributed workers give the same fitness as sequential evaluation."""
+    # GIVEN mutated genomes and their copies
+    population = neat.Population(neat_config)
+    genomes = list(population.population.items())
+    for _, genome in genomes:
+        for _ in range(10):
+            genome.mutate(neat_config.genome_config)
+    genomes_exp = copy.deepcopy(genomes)
+    # AND seeded training settings with a local worker
+    training_settings = TrainingSettings(
+        seed=3, episodes=2, broker_port=0, local_workers=1
+    )
+    # WHEN the genomes are evaluated sequentially and on the worker
+    TrainingFunctionsDict[enums.TrainingMode.SEQUENTIAL](
+        genomes_exp, neat_config, training_settings
+    )
+    TrainingFunctionsDict[enums.TrainingMode.DISTRIBUTED](
+        genomes, neat_config, training_settings
+    )
+    # THEN the fitness of every genome should be exactly equal
+    assert [genome.fitness for _, genome in genomes] == [
+        genome.fitness for _, genome in genomes_exp
+    ]
+
+
+@pytest.mark.parametrize(
+    "training_mode", [enums.TrainingMode.SEQUENTIAL, enums.TrainingMode.VECTORIZED]
+)
+def test_eval_genomes_common_random_numbers(
+    neat_config: neat.Config, training_mode: enums.TrainingMode
+) -> None:
+    """Test that all genomes are evaluated on the same seeded episodes."""
+    # GIVEN two copies of the same genome
+    population = neat.Population(neat_config)
+    genome = next(iter(population.population.values()))
+    genomes = [(1, genome), (2, copy.deepcopy(genome))]
+    # AND training settings with a seed and three episodes per genome
+    training_settings = TrainingSettings(seed=3, episodes=3)
+    # WHEN the genomes are evaluated twice
+    evaluation_function = TrainingFunctionsDict[training_mode]
+    evaluation_function(genomes, neat_config, training_settings)
+    fitnesses = [genome.fitness for _, genome in genomes]
+    evaluation_function(genomes, neat_config, training_settings)
+    # THEN both copies should have the same fitness
+    assert fitnesses[0] == fitnesses[1]
+    # AND evaluating them again should give the same fitness
+    assert [genome.fitness for _, genome in genomes] == fitnesses
+
+
+def test_eval_genomes_prunes_episodes(
+    neat_config: neat.Config, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that genomes stop playing once they cannot beat the elite."""
+    # GIVEN a population and an elite fitness no genome can reach
+    population = neat.Population(neat_config)
+    genomes = list(population.population.items())
+    elite_fitness = 1e9
+    episode_plan = fitness_evaluation.EpisodePlan(
+        seeds=(1, 2, 3), elite_fitness=elite_fitness
+    )
+    # AND training settings that aggregate the episodes by their minimum
+    training_settings = TrainingSettings(
+        episodes=3, fitness_aggregation=enums.FitnessAggregation.MIN
+    )
+    n_games = 0
+    run_snake = snake_training._run_snake  # noqa: SLF001  # pylint: disable=W0212
+
+    def _run_snake(
+        game_settings: settings.AiGameSettings,
+        profile_report: profiling.ProfileReport | None = None,
+        canvas: game_canvas.GameRenderer | None = None,
+        loop_report: loop_detection.LoopReport | None = None,
+    ) -> float:
+        nonlocal n_games
+        n_games += 1
+        return run_snake(game_settings, profile_report, canvas, loop_report)
+
+    monkeypatch.setattr(snake_training, "_run_snake", _run_snake)
+    # WHEN the genomes are evaluated sequentially
+    evaluation_function = TrainingFunctionsDict[enums.TrainingMode.SEQUENTIAL]
+    evaluation_function(genomes, neat_config, training_settings, episode_plan)
+    # THEN every genome should have played a single episode
+    assert n_games == len(genomes)
+    # AND no genome should have a fitness above the elite
+    assert all(genome.fitness <= elite_fitness for _, genome in genomes)
+
+
+@pytest.mark.parametrize(
+    "training_mode",
+    [
+        enums.TrainingMode.SEQUENTIAL,
+        enums.TrainingMode.PARALLEL,
+        enums.TrainingMode.VECTORIZED,
+    ],
+)
+def test_run_snake_training_mosaic_viewer(training_mode: enums.TrainingMode) -> None:
+    """Test a training that shows its games in the mosaic viewer."""
+    # GIVEN a training settings object with test locations and the mosaic viewer
+    training_settings = TrainingSettings(
+        generations=1,
+        workers=2,
+        mosaic_viewer=True,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=pathlib.Path(__file__).parents[1]
+        / "data"
+        / "temp"
+        / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(training_mode=training_mode, training_settings=training_settings)
+    # THEN the training should have finished and the viewer stopped
+    n_files_exp = 3
+    assert (
+        len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
+    )
+    shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+def test_eval_genomes_sequential_sends_snapshots(neat_config: neat.Config) -> None:
+    """Test that every genome is shown on its own tile of the mosaic viewer."""
+    # GIVEN a population of genomes and a snapshot queue
+    genomes = list(neat.Population(neat_config).population.items())
+    snapshot_queue: queue.Queue[game_canvas.GameSnapshot | None] = queue.Queue()
+    # WHEN the genomes are evaluated sequentially
+    TrainingFunctionsDict[enums.TrainingMode.SEQUENTIAL](
+        genomes=genomes,
+        neat_config=neat_config,
+        training_settings=TrainingSettings(),
+        snapshot_queue=snapshot_queue,
+    )
+    # THEN the final snapshot of every genome should be on its tile
+    snapshots = [snapshot_queue.get_nowait() for _ in range(snapshot_queue.qsize())]
+    assert {
+        snapshot.tile for snapshot in snapshots if snapshot and snapshot.finished
+    } == set(range(len(genomes)))
+
+
+def test_run_snake_training_features(
+    path_neat_config: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Test running the snake_training with all features as network inputs."""
+    # GIVEN a neat config with an input for every value of all features
+    features = tuple(enums.Feature)
+    num_inputs = len(feature_names.input_names(features))
+    path_neat_config_features = tmp_path / "neat_config"
+    path_neat_config_features.write_text(
+        path_neat_config.read_text(encoding="utf-8").replace(
+            "num_inputs              = 8", f"num_inputs = {num_inputs}"
+        ),
+        encoding="utf-8",
+    )
+    # AND training settings with all features
+    training_settings = TrainingSettings(
+        generations=1,
+        features=features,
+        path_neat_config=path_neat_config_features,
+        checkpoint_prefix=tmp_path / "temp" / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(
+        training_mode=enums.TrainingMode.SEQUENTIAL,
+        training_settings=training_settings,
+    )
+    # THEN the given locations should contain 3 files
+    n_files_exp = 3
+    assert (
+        len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
+    )
+    # AND training with the default neat config should fail on its number of inputs
+    with pytest.raises(ValueError, match="num_inputs = 8"):
+        run_snake_training(
+            training_mode=enums.TrainingMode.SEQUENTIAL,
+            training_settings=training_settings.model_copy(
+                update={"path_neat_config": path_neat_config}
+            ),
+        )
+
+
+@pytest.mark.parametrize(
+    ("training_settings_update", "match"),
+    [
+        (
+            {
+                "features": (
+                    *feature_names.DEFAULT_FEATURES,
+                    enums.Feature.TAIL_DIRECTION,
+                )
+            },
+            "default features",
+        ),
+        ({"reachable_area_score": 1.0}, "reachable area"),
+        ({"detect_loops": True}, "detect loops"),
+    ],
+)
+def test_eval_genomes_vectorized_unsupported_settings(
+    neat_config: neat.Config,
+    training_settings_update: dict[str, object],
+    match: str,
+) -> None:
+    """Test that the vectorized evaluation refuses settings it does not support."""
+    # GIVEN training settings with extra features or a reachable area score
+    training_settings = TrainingSettings(**training_settings_update)
+    # WHEN the genomes are evaluated on the batch game engine
+    # THEN a ValueError should be raised
+    with pytest.raises(ValueError, match=match):
+        TrainingFunctionsDict[enums.TrainingMode.VECTORIZED](
+            [], neat_config, training_settings
+        )
+
+
+@pytest.mark.parametrize(
+    "training_mode", [enums.TrainingMode.SEQUENTIAL, enums.TrainingMode.PARALLEL]
+)
+def test_eval_genomes_reports_loops(
+    neat_config: neat.Config, training_mode: enums.TrainingMode
+) -> None:
+    """Test that the evaluation adds the loops of every game to the loop reporter."""
+    # GIVEN a population of genomes
+    population = neat.Population(neat_config)
+    genomes = list(population.population.items())
+    # AND training settings that detect loops in two episodes per genome
+    training_settings = TrainingSettings(
+        seed=0, workers=2, episodes=2, detect_loops=True
+    )
+    loop_reporter = loop_detection.LoopReporter()
+    # WHEN the genomes are evaluated
+    evaluation_function = (
+        snake_training._eval_genomes_sequential  # noqa: SLF001  # pylint: disable=W0212
+        if training_mode == enums.TrainingMode.SEQUENTIAL
+        else snake_training._eval_genomes_parallel  # noqa: SLF001  # pylint: disable=W0212
+    )
+    evaluation_function(
+        genomes, neat_config, training_settings, loop_reporter=loop_reporter
+    )
+    # THEN every game should have been reported
+    assert loop_reporter.report.games == len(genomes) * training_settings.episodes
+
+
+def test_run_snake_training_detect_loops() -> None:
+    """Test running the snake_training with loop detection."""
+    # GIVEN training settings that detect loops with test locations
+    training_settings = TrainingSettings(
+        generations=1,
+        detect_loops=True,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=pathlib.Path(__file__).parents[1]
+        / "data"
+        / "temp"
+        / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(
+        training_mode=enums.TrainingMode.SEQUENTIAL,
+        training_settings=training_settings,
+    )
+    # THEN the given locations should contain 3 files
+    n_files_exp = 3
+    assert (
+        len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
+    )
+    shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+@pytest.mark.parametrize(
+    ("seed", "n_elites", "calls_exp"),
+    [
+        (0, 2, [([0, 1], None), ([2, 3], 3.0)]),
+        (0, 0, [([0, 1, 2, 3], None)]),
+        (0, 4, [([0, 1, 2, 3], None)]),
+        (None, 2, [([0, 1, 2, 3], None)]),
+    ],
+)
+def test_eval_genomes_pruned(
+    neat_config: neat.Config,
+    seed: int | None,
+    n_elites: int,
+    calls_exp: list[tuple[list[int], float | None]],
+) -> None:
+    """Test that the elites are evaluated first and the others pruned on them."""
+    # GIVEN elites that carry a fitness of the previous generation
+    genomes = [(key, neat.DefaultGenome(key)) for key in range(4)]
+    for _, genome in genomes[:n_elites]:
+        genome.fitness = 100.0
+    # AND training settings that prune episodes with or without a seed
+    training_settings = TrainingSettings(seed=seed, prune_episodes=True)
+    calls: list[tuple[list[int], float | None]] = []
+
+    def _evaluate(
+        genomes: snake_training.GenomesType,
+        neat_config: neat.Config,
+        training_settings: settings.TrainingSettings,
+        episode_plan: fitness_evaluation.EpisodePlan | None = None,
+        **evaluation_kwargs: typing.Any,  # noqa: ANN401
+    ) -> None:
+        del neat_config, training_settings, evaluation_kwargs
+        assert episode_plan is not None
+        calls.append(([key for key, _ in genomes], episode_plan.elite_fitness))
+        for key, genome in genomes:
+            genome.fitness = float(key + 2)
+
+    # WHEN the genomes are evaluated with pruned episodes
+    snake_training._eval_genomes_pruned(  # noqa: SLF001  # pylint: disable=W0212
+        genomes, neat_config, training_settings, evaluation_function=_evaluate
+    )
+    # THEN the other genomes should only be pruned on the fitness of the elites on
+    # the episodes of this generation
+    assert calls == calls_exp
+
+
+def test_eval_genomes_successive_halving(neat_config: neat.Config) -> None:
+    """Test that only the fittest genomes play the longer budgets of later rungs."""
+    # GIVEN a population of genomes
+    population = neat.Population(neat_config)
+    genomes = list(population.population.items())
+    # AND seeded training settings that race the genomes through three rungs
+    training_settings = TrainingSettings(
+        seed=0, episodes=4, successive_halving=True, halving_rungs=3
+    )
+    rungs: list[tuple[list[int], int, int]] = []
+    evaluate_sequential = TrainingFunctionsDict[enums.TrainingMode.SEQUENTIAL]
+
+    def _evaluate(
+        genomes: snake_training.GenomesType,
+        neat_config: neat.Config,
+        training_settings: settings.TrainingSettings,
+        episode_plan: fitness_evaluation.EpisodePlan | None = None,
+        **evaluation_kwargs: typing.Any,  # noqa: ANN401
+    ) -> None:
+        assert episode_plan is not None
+        assert len(episode_plan.seeds) == training_settings.episodes
+        rungs.append(
+            (
+                [genome_id for genome_id, _ in genomes],
+                training_settings.step_limit,
+                training_settings.episodes,
+            )
+        )
+        evaluate_sequential(
+            genomes, neat_config, training_settings, episode_plan, **evaluation_kwargs
+        )
+
+    # WHEN the genomes are evaluated with successive halving
+    snake_training._eval_genomes_successive_halving(  # noqa: SLF001  # pylint: disable=W0212
+        genomes, neat_config, training_settings, evaluation_function=_evaluate
+    )
+    # THEN all genomes should play the short budget and one genome the longer ones
+    assert [(len(keys), *budget) for keys, *budget in rungs] == [
+        (len(genomes), 12, 1),
+        (1, 25, 2),
+        (1, 50, 4),
+    ]
+    # AND the genome that played the last rung should be the fittest
+    best_genome_id = rungs[-1][0][0]
+    assert max(genomes, key=lambda item: item[1].fitness)[0] == best_genome_id
+
+
+def test_eval_genomes_pruned_successive_halving(
+    neat_config: neat.Config, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the elites play the full budget and only the others race."""
+    # GIVEN two elites that carry a fitness of the previous generation
+    genomes = [(key, neat.DefaultGenome(key)) for key in range(6)]
+    for _, genome in genomes[:2]:
+        genome.fitness = 100.0
+    # AND seeded training settings that prune episodes and race through two rungs
+    training_settings = TrainingSettings(
+        seed=0,
+        episodes=2,
+        prune_episodes=True,
+        successive_halving=True,
+        halving_rungs=2,
+    )
+    calls: list[tuple[list[int], int, int, float | None]] = []
+
+    def _evaluate(
+        genomes: snake_training.GenomesType,
+        neat_config: neat.Config,
+        training_settings: settings.TrainingSettings,
+        episode_plan: fitness_evaluation.EpisodePlan | None = None,
+        **evaluation_kwargs: typing.Any,  # noqa: ANN401
+    ) -> None:
+        del neat_config, evaluation_kwargs
+        assert episode_plan is not None
+        calls.append(
+            (
+                [key for key, _ in genomes],
+                training_settings.step_limit,
+                training_settings.episodes,
+                episode_plan.elite_fitness,
+            )
+        )
+        for key, genome in genomes:
+            genome.fitness = float(key + training_settings.step_limit)
+
+    monkeypatch.setitem(TrainingFunctionsDict, enums.TrainingMode.SEQUENTIAL, _evaluate)
+    evaluation_function = snake_training._get_evaluation_function(  # noqa: SLF001  # pylint: disable=W0212
+        enums.TrainingMode.SEQUENTIAL, training_settings, None
+    )
+    # WHEN the genomes are evaluated with pruned episodes and successive halving
+    evaluation_function(genomes, neat_config, training_settings)
+    # THEN the elites should play the full budget once, outside the race
+    assert calls[0] == ([0, 1], 50, 2, None)
+    assert [genome.fitness for _, genome in genomes[:2]] == [50.0, 51.0]
+    # AND the others should race, pruned on the best elite on the last rung only
+    assert calls[1:] == [([2, 3, 4, 5], 25, 1, None), ([4, 5], 50, 2, 51.0)]
+
+
+@pytest.mark.parametrize(
+    "training_mode",
+    [
+        enums.TrainingMode.SEQUENTIAL,
+        enums.TrainingMode.VECTORIZED,
+        enums.TrainingMode.STEADY_STATE,
+    ],
+)
+def test_run_snake_training_successive_halving(
+    training_mode: enums.TrainingMode,
+) -> None:
+    """Test running the snake_training with successive halving and pruning."""
+    # GIVEN training settings with successive halving, pruning and test locations
+    training_settings = TrainingSettings(
+        generations=2,
+        workers=2,
+        episodes=2,
+        successive_halving=True,
+        prune_episodes=True,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=pathlib.Path(__file__).parents[1]
+        / "data"
+        / "temp"
+        / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(training_mode=training_mode, training_settings=training_settings)
+    # THEN the given locations should contain 4 files
+    n_files_exp = 4
     assert (
         len(list(training_settings.checkpoint_prefix.parent.iterdir())) == n_files_exp  # pylint: disable=E1101
     )
     shutil.rmtree(training_settings.checkpoint_prefix.parent)  # pylint: disable=E1101
+
+
+@pytest.mark.parametrize(("seed", "n_evaluations_exp"), [(0, [2]), (None, [3, 3])])
+def test_eval_genomes_cached(
+    neat_config: neat.Config, seed: int | None, n_evaluations_exp: list[int]
+) -> None:
+    """Test that identical genomes are only evaluated once on the same episodes."""
+    # GIVEN a population of genomes and a copy of its first genome
+    population = neat.Population(neat_config)
+    genomes = list(population.population.items())
+    genome_copy = copy.deepcopy(genomes[0][1])
+    genome_copy.key = max(population.population) + 1
+    genomes.append((genome_copy.key, genome_copy))
+    # AND training settings with or without a seed
+    training_settings = TrainingSettings(seed=seed)
+    n_evaluations: list[int] = []
+    evaluate_sequential = TrainingFunctionsDict[enums.TrainingMode.SEQUENTIAL]
+
+    def _evaluate(
+        genomes: snake_training.GenomesType,
+        neat_config: neat.Config,
+        training_settings: settings.TrainingSettings,
+        episode_plan: fitness_evaluation.EpisodePlan | None = None,
+        **evaluation_kwargs: typing.Any,  # noqa: ANN401
+    ) -> None:
+        n_evaluations.append(len(genomes))
+        evaluate_sequential(
+            genomes, neat_config, training_settings, episode_plan, **evaluation_kwargs
+        )
+
+    # WHEN the genomes are evaluated twice with a fitness cache
+    fitness_cache = fitness_caching.FitnessCache(max_size=10)
+    fitnesses = []
+    for _ in range(2):
+        snake_training._eval_genomes_cached(  # noqa: SLF001  # pylint: disable=W0212
+            genomes,
+            neat_config,
+            training_settings,
+            evaluation_function=_evaluate,
+            fitness_cache=fitness_cache,
+        )
+        fitnesses.append([genome.fitness for _, genome in genomes])
+    # THEN seeded episodes should only be played once by every distinct network
+    assert n_evaluations == n_evaluations_exp
+    # AND the genomes should keep their fitness when it was cached
+    if seed is not None:
+        assert fitnesses[0] == fitnesses[1]
+        assert fitnesses[0][0] == fitnesses[0][-1]
+
+
+def test_eval_genomes_cached_pruned(neat_config: neat.Config) -> None:
+    """Test that only the fitness of genomes that beat the elite is cached."""
+    # GIVEN genomes with distinct networks and a fitness of their key
+    genomes = list(neat.Population(neat_config).population.items())
+    for _, genome in genomes:
+        next(iter(genome.connections.values())).weight += genome.key
+    evaluated: list[int] = []
+
+    def _evaluate(
+        genomes: snake_training.GenomesType,
+        neat_config: neat.Config,
+        training_settings: settings.TrainingSettings,
+        episode_plan: fitness_evaluation.EpisodePlan | None = None,
+        **evaluation_kwargs: typing.Any,  # noqa: ANN401
+    ) -> None:
+        del neat_config, training_settings, episode_plan, evaluation_kwargs
+        for key, genome in genomes:
+            evaluated.append(key)
+            genome.fitness = float(key)
+
+    # AND an elite fitness between the fitness of the genomes
+    keys = sorted(key for key, _ in genomes)
+    episode_plan = fitness_evaluation.EpisodePlan(seeds=(0,), elite_fitness=keys[0])
+    # WHEN the genomes are evaluated twice with a fitness cache
+    fitness_cache = fitness_caching.FitnessCache(max_size=10)
+    for _ in range(2):
+        snake_training._eval_genomes_cached(  # noqa: SLF001  # pylint: disable=W0212
+            genomes,
+            neat_config,
+            TrainingSettings(prune_episodes=True),
+            episode_plan,
+            evaluation_function=_evaluate,
+            fitness_cache=fitness_cache,
+        )
+    # THEN the genome that may have been pruned should be evaluated again
+    assert sorted(evaluated) == [keys[0], *keys]
+
+
+@pytest.mark.parametrize("fixed_episodes", [False, True])
+def test_run_snake_training_cache_fitness_elites(
+    monkeypatch: pytest.MonkeyPatch,
+    fixed_episodes: bool,  # noqa: FBT001
+) -> None:
+    """Test that the elites hit the fitness cache when the episodes are fixed."""
+    # GIVEN training settings that cache fitness and prune episodes on the elites
+    random.seed(0)
+    path_temp = pathlib.Path(__file__).parents[1] / "data" / "temp"
+    training_settings = TrainingSettings(
+        generations=3,
+        seed=0,
+        episodes=3,
+        fitness_aggregation=enums.FitnessAggregation.MIN,
+        prune_episodes=True,
+        cache_fitness=True,
+        fixed_episodes=fixed_episodes,
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=path_temp / "checkpoint-",
+    )
+    # AND a count of the genomes that are simulated
+    evaluated: list[int] = []
+    evaluate_genome = snake_training._evaluate_genome  # noqa: SLF001  # pylint: disable=W0212
+
+    def _evaluate_genome(
+        genome_item: tuple[int, neat.DefaultGenome],
+        *args: typing.Any,  # noqa: ANN401
+        **kwargs: typing.Any,  # noqa: ANN401
+    ) -> float:
+        evaluated.append(genome_item[0])
+        return evaluate_genome(genome_item, *args, **kwargs)
+
+    monkeypatch.setattr(snake_training, "_evaluate_genome", _evaluate_genome)
+    # WHEN the population, which carries over its elites, is trained
+    run_snake_training(
+        training_mode=enums.TrainingMode.SEQUENTIAL,
+        training_settings=training_settings,
+    )
+    # THEN the elites should only be simulated again when the episodes change
+    assert (len(set(evaluated)) < len(evaluated)) != fixed_episodes
+    shutil.rmtree(path_temp)
+
+
+@pytest.mark.parametrize(
+    ("training_mode", "n_files_exp"),
+    [
+        (enums.TrainingMode.SEQUENTIAL, 5),
+        (enums.TrainingMode.PARALLEL, 5),
+        (enums.TrainingMode.VECTORIZED, 4),
+    ],
+)
+def test_run_snake_training_cache_fitness(
+    training_mode: enums.TrainingMode, n_files_exp: int
+) -> None:
+    """Test running the snake_training with a persisted fitness cache."""
+    # GIVEN training settings with a fitness cache and test locations
+    path_temp = pathlib.Path(__file__).parents[1] / "data" / "temp"
+    training_settings = TrainingSettings(
+        generations=2,
+        workers=2,
+        seed=0,
+        cache_fitness=True,
+        successive_halving=True,
+        path_fitness_cache=path_temp / "fitness_cache.json",
+        path_neat_config=pathlib.Path(__file__).parents[1] / "data" / "neat_config",
+        checkpoint_prefix=path_temp / "checkpoint-",
+    )
+    # WHEN the run_snake_training function is called
+    run_snake_training(training_mode=training_mode, training_settings=training_settings)
+    # THEN the given locations should also contain the cache when it is supported
+    assert len(list(path_temp.iterdir())) == n_files_exp
+    shutil.rmtree(path_temp)